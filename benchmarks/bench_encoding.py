@@ -0,0 +1,66 @@
+"""
+Benchmark of the encoding stage (gzip + base64) of the output pipeline: serial against thread-parallel encoding (see
+:func:`py2df.reading.pipeline.encode_outputs`), for plots with different amounts of lines.
+
+Usage: ``python benchmarks/bench_encoding.py [--lines N [N ...]] [--actions N] [--workers N] [--repeat N]``
+"""
+import argparse
+import os
+import time
+import typing
+
+from py2df import DFReader, Function, Player, PlayerTarget, PlotSizes
+from py2df.reading.pipeline import LineOutput, encode_outputs
+
+
+def build_lines(amount: int, actions: int) -> typing.List[typing.Deque]:
+    """Builds ``amount`` Function lines with ``actions`` Send Message actions each."""
+    player = Player(PlayerTarget.DEFAULT)
+    with DFReader.session(PlotSizes.MASSIVE_PLOT) as reader:
+        for i in range(amount):
+            def body(i=i):
+                for j in range(actions):
+                    player.send_message(f"line {i}, message {j}: " + "lorem ipsum dolor sit amet " * (j % 4))
+
+            Function(f"Fn{i}")(body)
+
+        reader.read()
+        return list(reader.lines)
+
+
+def time_encoding(
+    lines: typing.List[typing.Deque], repeat: int, workers: typing.Optional[int]
+) -> float:
+    """Best time, in seconds, to encode every line (their JSON is written beforehand, and not timed)."""
+    best = float("inf")
+    for _ in range(repeat):
+        outputs = [LineOutput(line) for line in lines]
+        for output in outputs:
+            output.json
+
+        start = time.perf_counter()
+        encode_outputs(outputs, workers=workers)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[10, 50, 300], help="amounts of lines to test")
+    parser.add_argument("--actions", type=int, default=100, help="amount of actions in each line")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="amount of threads")
+    parser.add_argument("--repeat", type=int, default=5, help="amount of runs (the best one is shown)")
+    options = parser.parse_args()
+
+    print(f"{options.actions} actions per line, {options.workers} workers")
+    print(f"{'lines':>6} {'serial (ms)':>12} {'parallel (ms)':>14} {'speedup':>8}")
+    for amount in options.lines:
+        lines = build_lines(amount, options.actions)
+        serial = time_encoding(lines, options.repeat, None)
+        parallel = time_encoding(lines, options.repeat, options.workers)
+        print(f"{amount:>6} {serial * 1e3:>12.2f} {parallel * 1e3:>14.2f} {serial / parallel:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Micro-benchmark of the block tree walk used when serializing code lines: the previous recursive
+``flatten(line, allow_iterables=(BracketedBlock, deque), keep_iterables=(BracketedBlock,))`` against
+:func:`py2df.reading.pipeline.walk_blocks`, on lines of nested If/Repeat blocks.
+
+Usage: ``python benchmarks/bench_flatten.py [--depth N] [--width N] [--number N]``
+"""
+import argparse
+import timeit
+import typing
+from collections import deque
+
+from py2df import DFReader, PlayerEvent, Player, PlayerTarget, IfGame, IfGameType, Repeat, Arguments, DFText, \
+    PlotSizes
+from py2df.classes import BracketedBlock
+from py2df.reading.pipeline import walk_blocks, line_json_data
+
+
+def recursive_flatten(
+    *args: typing.Any, allow_iterables: typing.Iterable[type] = tuple(), keep_iterables: typing.Iterable[type] = tuple(),
+    curr_depth: int = 0
+) -> list:
+    """The previous (recursive) implementation of :func:`py2df.utils.flatten`, restricted to the arguments used when
+    serializing lines, as the reference."""
+    x = []
+    for el in args:
+        do_keep = keep_iterables and isinstance(el, tuple(keep_iterables)) and curr_depth == 0
+
+        if do_keep:
+            x.append(el)
+
+        if not isinstance(el, (list, tuple, *(allow_iterables or []))):
+            el = [el]
+
+        for item in el:
+            if do_keep and item == el:
+                continue
+
+            if isinstance(item, (list, tuple, *(allow_iterables or tuple()))):
+                if keep_iterables and isinstance(item, tuple(keep_iterables)):
+                    x.append(item)
+
+                x.extend(recursive_flatten(
+                    item, allow_iterables=allow_iterables, curr_depth=curr_depth + 1, keep_iterables=keep_iterables
+                ))
+            else:
+                x.append(item)
+
+    return x
+
+
+def build_line(depth: int, width: int) -> deque:
+    """Builds a code line with ``width`` actions at each level of ``depth`` nested If/Repeat blocks."""
+    player = Player(PlayerTarget.DEFAULT)
+
+    def nest(level: int):
+        for i in range(width):
+            player.send_message(f"{level}:{i}")
+
+        if level < depth:
+            if level % 2:
+                with Repeat.n_times(2):
+                    nest(level + 1)
+            else:
+                with IfGame(IfGameType.COMMAND_EQUALS, Arguments([DFText(f"cmd{level}")])):
+                    nest(level + 1)
+
+    with DFReader.session(PlotSizes.MASSIVE_PLOT) as reader:
+        @PlayerEvent.join
+        def on_join():
+            nest(0)
+
+        reader.read()
+        return reader.lines[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--depth", type=int, default=8, help="amount of nested If/Repeat blocks")
+    parser.add_argument("--width", type=int, default=10, help="amount of actions at each level")
+    parser.add_argument("--number", type=int, default=2000, help="amount of runs of each walk")
+    options = parser.parse_args()
+
+    line = build_line(options.depth, options.width)
+    reference = recursive_flatten(line, allow_iterables=(BracketedBlock, deque), keep_iterables=(BracketedBlock,))
+    walked = list(walk_blocks(line))
+    assert len(walked) == len(reference) and all(a is b for a, b in zip(walked, reference)), "different walk order"
+
+    print(f"line: {len(walked)} blocks, {options.depth} nested If/Repeat blocks")
+    old = timeit.timeit(
+        lambda: recursive_flatten(line, allow_iterables=(BracketedBlock, deque), keep_iterables=(BracketedBlock,)),
+        number=options.number
+    )
+    new = timeit.timeit(lambda: list(walk_blocks(line)), number=options.number)
+    per_run = 1e6 / options.number
+    print(f"recursive flatten: {old * per_run:9.2f} us/line")
+    print(f"walk_blocks:       {new * per_run:9.2f} us/line  ({old / new:.2f}x)")
+
+    number = max(options.number // 20, 1)
+    total = timeit.timeit(lambda: line_json_data(line), number=number)
+    print(f"line_json_data:    {total * 1e6 / number:9.2f} us/line")
+
+
+if __name__ == "__main__":
+    main()
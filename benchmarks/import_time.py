@@ -0,0 +1,127 @@
+"""
+Import-time budget: times cold imports of ``py2df`` (each in a new interpreter) and fails if any of them takes longer
+than its budget, or if ``import py2df`` (or ``import py2df.cli``) loads the subpackages it should only load on first
+use. Also fails if the table of names ``py2df`` imports on first use (``py2df._EXPORTS``) misses a name its subpackages
+export, or maps one to a module where it is something else.
+
+Usage: ``python benchmarks/import_time.py [--repeat N] [--scale FACTOR]``
+"""
+import argparse
+import importlib
+import json
+import pkgutil
+import subprocess
+import sys
+import typing
+
+#: The imports timed, with their budget (best time of all runs), in milliseconds. Each budget is a little above the
+#: time measured when it was set, so that a regression fails it (use ``--scale`` on slower machines).
+BUDGETS = {
+    "import py2df": 20,
+    "import py2df.cli": 40,
+    "from py2df import main": 40,
+    "from py2df import DFReader": 200,
+    "from py2df import Player": 220,
+    "from py2df import *": 240,
+}
+
+#: Modules that ``LAZY_IMPORTS`` must not load (they are loaded on first use).
+LAZY_MODULES = ("py2df.utils", "py2df.enums", "py2df.classes", "py2df.reading", "py2df.codeblocks", "nbtlib")
+
+#: The imports checked not to load any of ``LAZY_MODULES`` (the CLI only loads them for the commands that use them).
+LAZY_IMPORTS = ("import py2df", "import py2df.cli")
+
+_CODE = """\
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps(dict(seconds=elapsed, modules=sorted(sys.modules))))
+"""
+
+
+def time_import(statement: str) -> typing.Tuple[float, typing.List[str]]:
+    """Runs ``statement`` in a new interpreter. Returns the time it took, in seconds, and the modules loaded after
+    it."""
+    process = subprocess.run(
+        [sys.executable, "-c", _CODE.format(statement=statement)], check=True, capture_output=True, text=True
+    )
+    result = json.loads(process.stdout.splitlines()[-1])
+    return result["seconds"], result["modules"]
+
+
+def check_exports() -> typing.List[str]:
+    """Checks ``py2df._EXPORTS`` against what ``from py2df import *`` imports. Returns the problems found.
+
+    The names checked are the ones in the ``__all__`` of each py2df module (or, without one, the classes and functions
+    defined in it) that ``from py2df import *`` imports from that module, and every name in the table."""
+    import py2df
+
+    namespace = py2df._import_all()
+    problems = []
+
+    def check(name: str, mapped: typing.Optional[str], origin: str) -> None:
+        if mapped is None:
+            problems.append(f"{name!r} (from {origin}) is missing from py2df._EXPORTS")
+        elif getattr(importlib.import_module(f"py2df.{mapped}"), name, None) is not namespace.get(name):
+            problems.append(f"{name!r} (from {origin}) is mapped to py2df.{mapped}, where it is something else")
+
+    for info in pkgutil.walk_packages(py2df.__path__, "py2df."):
+        if info.name.endswith(".__main__"):
+            continue
+
+        module = importlib.import_module(info.name)
+        names = getattr(module, "__all__", None)
+        if names is None:
+            names = [
+                name for name, value in vars(module).items()
+                if not name.startswith("_") and getattr(value, "__module__", None) == module.__name__
+            ]
+
+        for name in names:
+            if name in namespace and namespace[name] is getattr(module, name, None):
+                check(name, py2df._NAME_TO_MODULE.get(name), info.name)
+
+    for name, mapped in py2df._NAME_TO_MODULE.items():  # (names that are no longer exported, or moved)
+        if name not in namespace:
+            problems.append(f"{name!r} is in py2df._EXPORTS, but no subpackage exports it")
+        else:
+            check(name, mapped, "py2df._EXPORTS")
+
+    return sorted(set(problems))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="amount of runs of each import")
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="factor to multiply the budgets by (for slower machines)"
+    )
+    options = parser.parse_args()
+
+    failed = False
+    for statement, budget in BUDGETS.items():
+        runs = [time_import(statement) for _ in range(options.repeat)]
+        best = min(seconds for seconds, _ in runs) * 1e3
+        limit = budget * options.scale
+        status = "ok" if best <= limit else "OVER BUDGET"
+        failed = failed or best > limit
+        print(f"{statement:<28} best {best:>8.1f} ms   budget {limit:>8.1f} ms   {status}")
+
+    for statement in LAZY_IMPORTS:
+        _, modules = time_import(statement)
+        loaded = [name for name in LAZY_MODULES if name in modules]
+        if loaded:
+            failed = True
+            print(f"{statement!r} loaded modules that should be lazy: {', '.join(loaded)}")
+
+    problems = check_exports()
+    failed = failed or bool(problems)
+    for problem in problems:
+        print(problem)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
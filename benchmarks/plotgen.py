@@ -0,0 +1,133 @@
+"""
+Synthetic plot generator for the benchmarks: registers events and Functions whose code exercises most of the
+compiler (nested If Variable/Repeat blocks, argument-heavy Player/Entity actions, Items with lore and enchantments,
+and long chains of variable operations) in the current reader.
+
+Usage (as a module)::
+
+    from plotgen import PlotSpec, generate_plot
+
+    with DFReader.session(PlotSizes.MASSIVE_PLOT) as reader:
+        generate_plot(PlotSpec(events=20, functions=20))
+        reader.output_snbt()
+"""
+import itertools
+import typing
+
+from py2df import DFReader, PlayerEvent, EntityEvent, Function, Player, Entity, PlayerTarget, EntityTarget, \
+    Repeat, Item, Material, Enchantment, Enchantments, NumberVar, TextVar, DFLocation, PlayerEventType, \
+    EntityEventType, FunctionHolder
+
+#: The most operands added to the variable itself by a single Set Var operation (a chest holds 27 items, minus the
+#: variable being set and the variable as the first operand).
+MAX_CHAIN_OPERANDS = 25
+
+
+class PlotSpec(typing.NamedTuple):
+    """The shape of a synthetic plot (see :func:`generate_plot`)."""
+    events: int = 10  #: Amount of events (alternating between player and entity events).
+    functions: int = 10  #: Amount of Functions.
+    depth: int = 3  #: Amount of nested If Variable/Repeat blocks in each line.
+    actions: int = 4  #: Amount of Player/Entity actions at each nesting level.
+    items: int = 2  #: Amount of Items given at each nesting level.
+    lore: int = 4  #: Amount of lore lines of each Item.
+    chain: int = 60  #: Amount of operands in the variable operation chain of each line.
+
+
+_MATERIALS = (Material.DIAMOND_SWORD, Material.BOW, Material.GOLDEN_APPLE, Material.IRON_CHESTPLATE)
+_ENCHANTMENTS = (Enchantments.SHARPNESS, Enchantments.UNBREAKING, Enchantments.MENDING, Enchantments.PROTECTION)
+
+
+def make_item(seed: int, lore: int = 4) -> Item:
+    """Builds an Item with a name, ``lore`` lore lines and a couple of enchantments."""
+    return Item(
+        _MATERIALS[seed % len(_MATERIALS)], seed % 64 + 1,
+        name=f"&6Item &l#{seed}",
+        lore=[f"&7Lore line {i} of item {seed}" for i in range(lore)],
+        enchantments=[
+            Enchantment(_ENCHANTMENTS[(seed + i) % len(_ENCHANTMENTS)], (seed + i) % 5 + 1) for i in range(2)
+        ]
+    )
+
+
+def var_op_chain(var: NumberVar, operands: int) -> None:
+    """Sets ``var`` through a chain of ``operands`` operands, alternating between additions and products (one Set Var
+    block per :data:`MAX_CHAIN_OPERANDS` operands)."""
+    for block, start in enumerate(range(0, operands, MAX_CHAIN_OPERANDS)):
+        amount = min(MAX_CHAIN_OPERANDS, operands - start)
+        others = [NumberVar(f"n{start + i}") if i % 3 else start + i + 0.5 for i in range(amount)]
+        if block % 2:
+            op = var * others[0]
+            for other in others[1:]:
+                op = op * other
+        else:
+            op = var + others[0]
+            for other in others[1:]:
+                op = op + other
+
+        var.set(op)
+
+
+def line_body(seed: int, spec: PlotSpec) -> typing.Callable[[], None]:
+    """Builds the code of a synthetic line (see :func:`generate_plot`)."""
+    player = Player(PlayerTarget.DEFAULT)
+    entity = Entity(EntityTarget.DEFAULT)
+    counter = NumberVar(f"counter{seed}")
+    name = TextVar(f"name{seed}")
+
+    def level(depth: int) -> None:
+        for i in range(spec.actions):
+            player.send_message("&aHello, ", name, f"&7(line {seed}, level {depth}, action {i})", add_spaces=True)
+            player.action_bar(f"&e{i} points", name)
+            player.teleport(DFLocation(seed, depth, i, pitch=15, yaw=90))
+            entity.damage(counter)
+            entity.launch_forward(i + 0.5, yaw_only=bool(i % 2))
+
+        if spec.items:
+            player.give_items([make_item(seed * 31 + depth * 7 + i, spec.lore) for i in range(spec.items)])
+
+        if depth < spec.depth:
+            if depth % 2:
+                with Repeat.n_times(depth + 2):
+                    level(depth + 1)
+            else:
+                with counter > depth:
+                    level(depth + 1)
+
+    def body() -> None:
+        var_op_chain(counter, spec.chain)
+        level(0)
+
+    return body
+
+
+def generate_plot(spec: PlotSpec = PlotSpec()) -> typing.List[FunctionHolder]:
+    """Registers the events and Functions of a synthetic plot in the current reader (see
+    :meth:`DFReader.current`); call it inside a :meth:`DFReader.session` to keep them isolated.
+
+    Each line sets a variable through a chain of ``spec.chain`` operands, then nests ``spec.depth`` If Variable and
+    Repeat blocks (alternately), each level with ``spec.actions`` groups of Player/Entity actions and
+    ``spec.items`` given Items.
+
+    Returns
+    -------
+    List[:class:`~py2df.classes.abc.FunctionHolder`]
+        The registered function holders.
+    """
+    reader = DFReader.current()
+    player_events = itertools.cycle(PlayerEventType)
+    entity_events = itertools.cycle(EntityEventType)
+    holders = []
+    for i in range(spec.events):
+        if i % 2:
+            event = EntityEvent(next(entity_events), line_body(i, spec))
+        else:
+            event = PlayerEvent(next(player_events), line_body(i, spec))
+
+        reader.append_function(event)
+        holders.append(event)
+
+    for i in range(spec.functions):
+        holders.append(Function(f"Fn{i}")(line_body(spec.events + i, spec)))  # (registered by the decorator)
+
+    return holders
@@ -0,0 +1,269 @@
+"""
+Benchmark suite: times reading a synthetic plot (see :mod:`plotgen`), each stage of the output pipeline, the
+``output_*`` methods of the reader, writing and reading Item SNBT, :func:`~py2df.typings.p_check`, item catalogs,
+decompiling templates, :func:`~py2df.utils.nbt_to_python` and cold imports of ``py2df``. Results are stored as JSON,
+to compare across versions (``--compare``).
+
+Usage: ``python benchmarks/run_benchmarks.py [--events N] [--functions N] [--depth N] [--repeat N] [--output FILE]
+[--compare FILE] [--only NAME [NAME ...]]``
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import typing
+
+import nbtlib
+
+import py2df
+from py2df import DFReader, PlotSizes, DFNumber, TextVar, NumberVar, Item, nbt_to_python, serialize_tag
+from py2df.reading import ItemCatalog, decompile_template, decompile_templates
+from py2df.reading.pipeline import LineOutput
+from py2df.typings import p_check, Numeric, Textable, Listable, ItemParam, Locatable
+
+from import_time import BUDGETS, time_import
+from plotgen import PlotSpec, generate_plot, make_item
+
+Result = typing.Dict[str, typing.Any]  # (best and mean times, in seconds, and the amount of runs)
+
+#: The stages of the output pipeline, in order (see :class:`~py2df.reading.pipeline.LineOutput`).
+STAGES = (
+    ("json_data", lambda output: output.json_data),
+    ("json", lambda output: output.json),
+    ("compress", lambda output: output.compressed),
+    ("encode", lambda output: output.encoded),
+    ("snbt", lambda output: output.snbt()),
+)
+
+
+def measure(
+    func: typing.Callable[[], typing.Any], repeat: int, setup: typing.Optional[typing.Callable[[], typing.Any]] = None,
+    number: int = 1
+) -> Result:
+    """Times ``number`` calls of ``func`` (after calling ``setup``, untimed), ``repeat`` times. Returns the best and
+    mean time per call, in seconds."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+
+        times.append((time.perf_counter() - start) / number)
+
+    return dict(best=min(times), mean=sum(times) / len(times), runs=repeat * number)
+
+
+def bench_reader(spec: PlotSpec, repeat: int) -> typing.Dict[str, Result]:
+    """Benchmarks :meth:`DFReader.read`, each stage of :class:`LineOutput` and the reader's ``output_*`` methods."""
+    results = dict()
+    with DFReader.session(PlotSizes.MASSIVE_PLOT) as reader:
+        generate_plot(spec)
+        results["read"] = measure(reader.read, repeat)
+        lines = list(reader.lines)
+        results["plot"] = dict(
+            lines=len(lines), json_bytes=sum(len(LineOutput(line).json.encode("utf-8")) for line in lines)
+        )
+
+        outputs: typing.List[LineOutput] = []
+        previous_stages = []
+        for name, stage in STAGES:
+            def setup(previous=tuple(previous_stages)):  # new outputs, with the previous stages computed (untimed)
+                outputs[:] = [LineOutput(line) for line in lines]
+                for output in outputs:
+                    for prev_stage in previous:
+                        prev_stage(output)
+
+            results[f"stage.{name}"] = measure(lambda stage=stage: [stage(output) for output in outputs], repeat, setup)
+            previous_stages.append(stage)
+
+        for method in ("output_json_data", "output_json", "output_encoded", "output_snbt"):
+            results[method] = measure(  # (reading discards the previous outputs)
+                lambda method=method: getattr(reader, method)(read=False), repeat, setup=reader.read
+            )
+
+    return results
+
+
+def bench_items(spec: PlotSpec, repeat: int) -> typing.Dict[str, Result]:
+    """Benchmarks :meth:`Item.as_snbt` and :meth:`Item.as_json_data` on Items with lore and enchantments, with and
+    without their cached output, and :meth:`Item.from_snbt_many` on their SNBT; both against nbtlib (see
+    :mod:`snbt_equivalence`)."""
+    items = [make_item(i, spec.lore) for i in range(200)]
+    snbts = [item.as_snbt() for item in items]
+
+    def invalidate():
+        for item in items:
+            item.invalidate()
+
+    return {
+        "item.as_snbt": measure(lambda: [item.as_snbt() for item in items], repeat),
+        "item.as_snbt.uncached": measure(lambda: [item.as_snbt() for item in items], repeat, setup=invalidate),
+        "item.as_snbt.nbtlib": measure(lambda: [serialize_tag(item.as_nbt()) for item in items], repeat),
+        "item.as_json_data": measure(lambda: [item.as_json_data() for item in items], repeat),
+        "item.as_json_data.uncached": measure(
+            lambda: [item.as_json_data() for item in items], repeat, setup=invalidate
+        ),
+        "item.from_snbt_many": measure(lambda: Item.from_snbt_many(snbts), repeat),
+        "item.from_snbt.nbtlib": measure(lambda: [Item.from_nbt(nbtlib.parse_nbt(snbt)) for snbt in snbts], repeat),
+    }
+
+
+def bench_p_check(repeat: int) -> typing.Dict[str, Result]:
+    """Benchmarks :func:`~py2df.typings.p_check` with common parameter types (1000 calls per run)."""
+    item = make_item(0)
+    cases = {
+        "p_check.numeric": (5, Numeric),
+        "p_check.number_var": (NumberVar("n"), Numeric),
+        "p_check.textable": ("text", Textable),
+        "p_check.text_or_list": (TextVar("t"), typing.Union[Textable, Listable]),
+        "p_check.item": (item, ItemParam),
+        "p_check.locatable": (DFNumber(1), typing.Union[Numeric, Locatable]),
+    }
+    results = dict()
+    for name, (obj, typeof) in cases.items():
+        def run(obj=obj, typeof=typeof):
+            for _ in range(1000):
+                p_check(obj, typeof)
+
+        results[name] = measure(run, repeat)
+
+    return results
+
+
+def bench_catalog(spec: PlotSpec, repeat: int, size: int = 10000, used: int = 50) -> typing.Dict[str, Result]:
+    """Benchmarks :class:`~py2df.reading.ItemCatalog` on a catalog of ``size`` items: indexing it, opening it again
+    (with the saved index) and looking up ``used`` of its items, against reading all of them."""
+    snbts = [make_item(i, spec.lore).as_snbt() for i in range(size)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "items.snbt")
+        with open(path, "w", encoding="utf-8") as file:
+            file.writelines(f"item_{i} {snbt}\n" for i, snbt in enumerate(snbts))
+
+        def remove_index():
+            if os.path.exists(path + ".idx"):
+                os.remove(path + ".idx")
+
+        def lookup():
+            with ItemCatalog(path) as catalog:
+                for i in range(0, size, size // used):
+                    catalog[f"item_{i}"]
+
+        return {
+            "catalog.index": measure(lambda: len(ItemCatalog(path)), repeat, setup=remove_index),
+            "catalog.open": measure(lambda: len(ItemCatalog(path)), repeat),
+            "catalog.lookup": measure(lookup, repeat),
+            "catalog.read_all": measure(lambda: Item.from_snbt_many(snbts), repeat),
+        }
+
+
+def bench_decompile(spec: PlotSpec, repeat: int) -> typing.Dict[str, Result]:
+    """Benchmarks :func:`~py2df.reading.decompile_template` on the generated plot's templates (base64 and SNBT),
+    and :func:`~py2df.reading.decompile_templates` (in worker processes) on them."""
+    with DFReader.session(PlotSizes.MASSIVE_PLOT) as reader:
+        generate_plot(spec)
+        encoded = reader.output_encoded_str()
+        snbt = reader.output_snbt(read=False)
+
+    return {
+        "decompile.base64": measure(lambda: [decompile_template(template) for template in encoded], repeat),
+        "decompile.snbt": measure(lambda: [decompile_template(template) for template in snbt], repeat),
+        "decompile.bulk": measure(lambda: decompile_templates(encoded), repeat),
+    }
+
+
+def bench_nbt_to_python(repeat: int) -> typing.Dict[str, Result]:
+    """Benchmarks :func:`~py2df.utils.nbt_to_python` on the NBT of Items, on a deeply nested compound and on large
+    integer arrays."""
+    items = [make_item(i).as_nbt() for i in range(200)]
+    deep = root = nbtlib.Compound()
+    for i in range(500):
+        deep["child"] = nbtlib.Compound(depth=nbtlib.Int(i), tags=nbtlib.List[nbtlib.String]([nbtlib.String("tag")]))
+        deep = deep["child"]
+
+    arrays = nbtlib.Compound(
+        ints=nbtlib.IntArray(range(100000)), longs=nbtlib.LongArray(range(100000)),
+        bytes=nbtlib.ByteArray([i % 128 for i in range(100000)])
+    )
+    return {
+        "nbt_to_python.items": measure(lambda: [nbt_to_python(item) for item in items], repeat),
+        "nbt_to_python.deep": measure(lambda: nbt_to_python(root), repeat),
+        "nbt_to_python.arrays": measure(lambda: nbt_to_python(arrays), repeat),
+    }
+
+
+def bench_import(repeat: int) -> typing.Dict[str, Result]:
+    """Benchmarks cold imports of ``py2df`` (see :mod:`import_time`), in a new interpreter each time."""
+    results = dict()
+    for statement in BUDGETS:
+        times = [time_import(statement)[0] for _ in range(repeat)]
+        results[f"import.{statement.split()[-1]}"] = dict(best=min(times), mean=sum(times) / len(times), runs=repeat)
+
+    return results
+
+
+SUITES = {
+    "reader": lambda options, spec: bench_reader(spec, options.repeat),
+    "items": lambda options, spec: bench_items(spec, options.repeat),
+    "p_check": lambda options, spec: bench_p_check(options.repeat),
+    "catalog": lambda options, spec: bench_catalog(spec, options.repeat),
+    "decompile": lambda options, spec: bench_decompile(spec, options.repeat),
+    "nbt": lambda options, spec: bench_nbt_to_python(options.repeat),
+    "import": lambda options, spec: bench_import(options.repeat),
+}
+
+
+def compare(results: dict, previous: dict) -> None:
+    """Prints the change of each best time against previous results."""
+    print(f"\ncompared to py2df {previous.get('py2df_version')} (python {previous.get('python')}):")
+    for name, result in results["results"].items():
+        old = previous.get("results", dict()).get(name)
+        if "best" not in result or not old or not old.get("best"):
+            continue
+
+        ratio = result["best"] / old["best"]
+        flag = "  <-- slower" if ratio > 1.1 else ""
+        print(f"{name:<24} {old['best'] * 1e3:>11.3f} ms -> {result['best'] * 1e3:>11.3f} ms  ({ratio:.2f}x){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    defaults = PlotSpec()
+    for field in PlotSpec._fields:
+        parser.add_argument(f"--{field}", type=int, default=getattr(defaults, field), help=f"plot spec: {field}")
+
+    parser.add_argument("--repeat", type=int, default=5, help="amount of runs of each benchmark")
+    parser.add_argument("--only", nargs="+", choices=sorted(SUITES), help="suites to run (default: all)")
+    parser.add_argument("--output", help="file to store the results in, as JSON")
+    parser.add_argument("--compare", help="JSON file with previous results to compare to")
+    options = parser.parse_args()
+
+    spec = PlotSpec(**{field: getattr(options, field) for field in PlotSpec._fields})
+    results = dict(
+        py2df_version=py2df.__version__, python=platform.python_version(), platform=platform.platform(),
+        spec=spec._asdict(), repeat=options.repeat, results=dict()
+    )
+    for name in options.only or SUITES:
+        results["results"].update(SUITES[name](options, spec))
+
+    for name, result in results["results"].items():
+        if "best" in result:
+            print(f"{name:<24} best {result['best'] * 1e3:>11.3f} ms   mean {result['mean'] * 1e3:>11.3f} ms")
+        else:
+            print(f"{name:<24} {result}")
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if options.compare:
+        with open(options.compare, encoding="utf-8") as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+SNBT equivalence check: builds random Items (with names and lore full of quotes, backslashes and non-ASCII
+characters, enchantments, flags, entity NBT and extra tags) and fails if the SNBT written directly by
+:meth:`Item.as_snbt` differs from the one nbtlib serializes from :meth:`Item.as_nbt`, or if the Items read directly by
+:meth:`Item.from_snbt` (from that SNBT, and from variations of it) differ from the ones read through nbtlib.
+
+Usage: ``python benchmarks/snbt_equivalence.py [--items N] [--seed SEED]``
+"""
+import argparse
+import random
+import sys
+import time
+import typing
+
+import nbtlib as nbt
+
+from py2df import Item, Material, Enchantment, Enchantments, HideFlags, serialize_tag, snbt_string
+
+#: Characters the random strings are made of (quotes and backslashes included more often, as they are escaped).
+ALPHABET = "abcXYZ 019&§_-:{}[],;=" + "\"'\\" * 4 + "éñ日本\u200b\n\t"
+
+MATERIALS = list(Material)
+ENCHANTMENTS = list(Enchantments)
+LEATHER = [Material.LEATHER_HELMET, Material.LEATHER_CHESTPLATE, Material.LEATHER_LEGGINGS, Material.LEATHER_BOOTS]
+SPAWNING = [Material.ARMOR_STAND, Material.TROPICAL_FISH_BUCKET, Material.PIG_SPAWN_EGG]
+
+
+def random_string(rng: random.Random, max_length: int = 12) -> str:
+    """A random string of up to ``max_length`` characters from :data:`ALPHABET`."""
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length)))
+
+
+def random_item(rng: random.Random) -> Item:
+    """An Item with random attributes; roughly half of them are left as default."""
+    kwargs = dict()
+    material = rng.choice(LEATHER + SPAWNING + MATERIALS[:50])
+    if rng.random() < 0.6:
+        kwargs["name"] = random_string(rng)
+
+    if rng.random() < 0.6:
+        kwargs["lore"] = [random_string(rng) for _ in range(rng.randint(0, 5))]
+
+    if rng.random() < 0.5:
+        kwargs["enchantments"] = [
+            Enchantment(rng.choice(ENCHANTMENTS), rng.randint(1, 255)) for _ in range(rng.randint(1, 3))
+        ]
+
+    if rng.random() < 0.3:
+        kwargs["damage"] = rng.randint(0, 2000)
+
+    if rng.random() < 0.3:
+        kwargs["unbreakable"] = True
+
+    if rng.random() < 0.3:
+        kwargs["hide_flags"] = HideFlags(rng.randint(0, 127))
+
+    if rng.random() < 0.5:
+        kwargs["leather_armor_color"] = rng.randint(0, 0xFFFFFF)
+
+    if rng.random() < 0.5:
+        kwargs["entity_tag"] = f"{{NoAI: 1b, CustomName: {snbt_string(random_string(rng))}, Tags: [\"a\", \"b\"]}}"
+
+    roll = rng.random()
+    if roll < 0.2:
+        kwargs["extra_tags"] = nbt.Compound({
+            "CustomModelData": nbt.Int(rng.randint(0, 10 ** 6)), random_string(rng, 6) or "x": nbt.String("value"),
+            "Weights": nbt.List[nbt.Double]([nbt.Double(rng.random())]), "Pos": nbt.IntArray([1, -2, 3]),
+        })
+    elif roll < 0.3:  # replaces a tag written by the item itself
+        kwargs["extra_tags"] = nbt.Compound(Damage=nbt.Int(7), RepairCost=nbt.Int(rng.randint(0, 40)))
+
+    return Item(material, rng.randint(1, 64), **kwargs)
+
+
+#: Attributes compared between the Items read from SNBT.
+ATTRIBUTES = (
+    "material", "amount", "name", "lore", "enchantments", "damage", "unbreakable", "hide_flags", "leather_armor_color",
+    "entity_tag", "extra_tags",
+)
+
+
+def variations(snbt: str, rng: random.Random) -> typing.List[str]:
+    """The given SNBT, and equivalent (or, sometimes, invalid) ways of writing it."""
+    return [
+        snbt,
+        snbt.replace(": ", ":").replace(", ", ","),
+        snbt.replace(": ", " :  ").replace("{", "{\n "),
+        snbt.replace("Count: ", "Slot: 3b, Count: ").replace("b,", "B,", 1),
+        snbt.replace("Unbreakable: 1b", "Unbreakable: true").replace("Damage: ", "Damage: +"),
+        snbt.replace('id: "minecraft:', "id: minecraft:", 1).replace('"', "'", rng.randint(0, 3)),
+        snbt.replace("tag: {", "tag: {RepairCost: 2b, 'odd key': [I; 1, 2], ", 1),
+        snbt.replace("lvl: ", "lvl: 1.5f, x: ", 1),  # (invalid)
+        snbt[:-rng.randint(1, 5)],  # (invalid)
+    ]
+
+
+def read_error(snbt: str, read: typing.Callable[[str], Item]) -> typing.Union[Item, str]:
+    """The Item read from the SNBT, or the type of the error raised while reading it."""
+    try:
+        item = read(snbt)
+        item.as_snbt()  # (unusual tags are only parsed now)
+        return item
+    except Exception as err:
+        return type(err).__name__
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=5000, help="amount of random items to check")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random items")
+    options = parser.parse_args()
+
+    rng = random.Random(options.seed)
+    items = [random_item(rng) for _ in range(options.items)]
+
+    start = time.perf_counter()
+    expected = [serialize_tag(item.as_nbt()) for item in items]
+    nbtlib_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    written = [item.as_snbt() for item in items]
+    native_time = time.perf_counter() - start
+
+    mismatches = [(item, exp, out) for item, exp, out in zip(items, expected, written) if exp != out]
+    for item, exp, out in mismatches[:10]:
+        print(f"{item!r}\n  nbtlib: {exp}\n  native: {out}")
+
+    for snbt in written[:options.items // 10]:  # (the output must also be valid SNBT, read back as the same NBT)
+        if serialize_tag(nbt.parse_nbt(snbt)) != snbt:
+            mismatches.append(snbt)
+            print(f"Not read back identically: {snbt}")
+
+    print(
+        f"as_snbt: {len(items)} items, {len(mismatches)} mismatch(es); nbtlib {nbtlib_time * 1e3:.1f} ms, "
+        f"native {native_time * 1e3:.1f} ms"
+    )
+
+    start = time.perf_counter()
+    expected_items = [Item.from_nbt(nbt.parse_nbt(snbt)) for snbt in written]
+    nbtlib_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    read_items = Item.from_snbt_many(written)
+    native_time = time.perf_counter() - start
+
+    read_mismatches = 0
+    inputs = written[:options.items // 10]
+    cases = list(zip(written, expected_items, read_items)) + [
+        (snbt, read_error(snbt, lambda data: Item.from_nbt(nbt.parse_nbt(data))), read_error(snbt, Item.from_snbt))
+        for snbt in (variation for snbt in inputs for variation in variations(snbt, rng))
+    ]
+    for snbt, exp, out in cases:
+        same = exp == out if isinstance(exp, str) or isinstance(out, str) else all(
+            getattr(exp, attr) == getattr(out, attr) for attr in ATTRIBUTES
+        ) and exp.as_snbt() == out.as_snbt()
+        if not same:
+            read_mismatches += 1
+            if read_mismatches <= 10:
+                print(f"{snbt}\n  nbtlib: {exp!r}\n  native: {out!r}")
+
+    print(
+        f"from_snbt: {len(cases)} items, {read_mismatches} mismatch(es); nbtlib {nbtlib_time * 1e3:.1f} ms, "
+        f"native {native_time * 1e3:.1f} ms"
+    )
+    sys.exit(1 if mismatches or read_mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
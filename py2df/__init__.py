@@ -1,8 +1,128 @@
+"""
+Py2DF: writes DiamondFire code in Python.
+
+The subpackages (and the names they export) are imported on first use (:pep:`562`), so that ``import py2df`` does not
+load every enum, codeblock and humanized target up front. ``from py2df import *`` imports all of them.
+"""
+import importlib
+import typing
+
 from . import constants
-from .utils import *
-from .schemas import *
-from .enums import *
-from .classes import *
-from .reading import *
-from .typings import *
-from .codeblocks import *
+from .constants import PY2DF_VERSION as __version__
+
+#: The subpackages, in the order their names override each other (the same as their former star imports).
+_SUBMODULES = ("utils", "schemas", "enums", "classes", "reading", "typings", "codeblocks", "cli")
+
+#: The names exported by this package, grouped by the (cheapest) module to import them from.
+_EXPORTS: typing.Dict[str, typing.Tuple[str, ...]] = {
+    "constants": (
+        "BASIC_PLOT_SIZE", "BLOCK_ID", "DEFAULT_AUTHOR", "DEFAULT_COMPRESSION_LEVEL", "DEFAULT_SOUND_PITCH",
+        "DEFAULT_SOUND_VOL", "DEFAULT_VAL", "EMPTY_ARGS", "ITEM_ID_DYNAMIC_VAR", "ITEM_ID_TAG", "LARGE_PLOT_SIZE",
+        "MASSIVE_PLOT_SIZE", "MAX_COMPRESSION_LEVEL", "MAX_ITEM_STACK_SIZE", "MAX_LORE_LINES", "MAX_PITCH_DEGREES",
+        "MAX_YAW_DEGREES", "MIN_COMPRESSION_LEVEL", "MIN_ITEM_STACK_SIZE", "SECTION_SIGN", "SMALL_CHEST_SIZE",
+    ),
+    "errors": (
+        "DFSyntaxError", "LimitReachedError", "LineTooLongError",
+    ),
+    "client": (
+        "compile_remote", "CompileResult", "parse_address",
+    ),
+    "utils": (
+        "all_attr_eq", "AnyNumber", "clamp", "DFSerializer", "Docable", "dumps_json", "FalseLiteral", "flatten",
+        "identity", "ItemType", "iter_flatten", "IterOrSingleDocable", "K", "nbt_to_python", "remove_u200b_from_doc",
+        "select_dict", "serialize_tag", "snake_to_capitalized_words", "snbt_string", "T", "TrueLiteral", "V",
+    ),
+    "schemas": (
+        "ItemAttributeModifierSchema", "ItemDisplaySchema", "ItemEnchantmentSchema", "ItemSchema", "ItemTagSchema",
+    ),
+    "enums": (
+        "ActionType", "AdvancementType", "ALL_HIDE_FLAGS", "ArmorStandPart", "AutoLowerNameEnum", "AutoNameEnum",
+        "AutoSnakeToCapitalizedWordsEnum", "AutoSnakeToPascalCaseNameEnum", "AutoUpperNameEnum", "BlockType",
+        "BossBarColor", "BossBarStyle", "BracketDirection", "BracketType", "CallableAction", "CallableHiddenTag",
+        "CatType", "ChatColor", "CodeblockActionType", "Color", "Colour", "ControlType", "CustomSpawnEggType",
+        "CWaitTag", "EffectParticleMode", "Enchantments", "EntityActionType", "EntityAnimation", "EntityColor",
+        "EntityEventType", "EntityTarget", "EventType", "FoxType", "GameActionType", "GameValueType", "GVAL_ITEM",
+        "GVAL_LISTABLE", "GVAL_LOCATABLE", "GVAL_NUMERIC", "GVAL_TEXTABLE", "Hand", "HideFlags", "HorseColor",
+        "HorseVariant", "IfEntityType", "IfGameType", "IfPlayerType", "IfPOpenInvType", "IfType", "IfVariableType",
+        "IfVVarType", "ItemEqComparisonMode", "keep_upper", "Material", "MooshroomVariant", "PAClearInvMode",
+        "PandaGene", "PARowPos", "ParrotVariant", "ParticleType", "PlayerActionType", "PlayerAnimation",
+        "PlayerEventType", "PlayerTarget", "PlotSizes", "PotionEffect", "RabbitType", "RAdjacentPattern", "RepeatType",
+        "SelectionTarget", "SelectObjectType", "SetVarType", "SoundType", "TagType", "Target", "TimeUnit",
+        "TropicalFishPattern", "UtilityBlockType", "VariableScope", "VillagerBiome", "VillagerProfession",
+    ),
+    "classes": (
+        "ActionBlock", "Arguments", "Block", "BlockDeque", "Bracket", "BracketedBlock", "BuildableJSONData",
+        "CallableBlock", "CallerBlock", "Codeblock", "DFCustomSpawnEgg", "DFGameValue", "DFLocation", "DFNumber",
+        "DFParticle", "DFPotion", "DFSound", "DFText", "DFType", "DFTyping", "DFVariable", "Enchantment", "EventBlock",
+        "FunctionHolder", "Item", "Itemable", "ItemCollection", "ItemVar", "JSONData", "ListVar", "LocationVar", "Lore",
+        "NumberVar", "op_to_expr", "ParticleVar", "PotionVar", "Settable", "SoundVar", "Tag", "TextVar", "UtilityBlock",
+        "VarOp", "VarOperable",
+    ),
+    "typings": (
+        "convert_all", "convert_material", "convert_numeric", "convert_particle", "convert_sound", "convert_text",
+        "count_p_check_calls", "GVAL_TYPES", "ItemParam", "Listable", "Locatable", "Numeric", "p_bool_check", "p_check",
+        "Param", "ParamTypes", "ParticleParam", "Potionable", "SoundParam", "SpawnEggable", "Textable",
+    ),
+    "reading": (
+        "block_json_data", "block_length", "compile_module", "compile_modules", "CompileServer", "CompileStats",
+        "decompile_line", "decompile_template", "decompile_templates", "DecompiledTemplate", "DFReader",
+        "encode_outputs", "EntityEvent", "fingerprint_function", "fingerprint_holder", "Function", "ItemCatalog",
+        "JSONWriter", "line_length", "LineOutput", "LineSplitter", "PlayerEvent", "PlotWatcher", "Process",
+        "register_block_decoder", "register_item_decoder", "TemplateCache", "TemplateChange", "walk_blocks",
+    ),
+    "cli": (
+        "main",
+    ),
+    "codeblocks": (
+        "AnyIf", "BlockMetadata", "BlockParam", "CallFunction", "Control", "Else", "Entity", "EntityAction",
+        "GameAction", "IfBlock", "IfEntity", "IfGame", "IfPlayer", "IfVariable", "Player", "PlayerAction", "Repeat",
+        "SelectObj", "SetVar", "StartProcess",
+    ),
+}
+
+_NAME_TO_MODULE = {name: module for module, names in _EXPORTS.items() for name in names}
+
+
+def _public_names(module) -> typing.List[str]:
+    """The names a star import of the given module would import."""
+    names = getattr(module, "__all__", None)
+    return list(names) if names is not None else [name for name in vars(module) if not name.startswith("_")]
+
+
+def _import_all() -> typing.Dict[str, typing.Any]:
+    """Imports every subpackage, returning the names they export (as importing all of them with ``*`` would)."""
+    namespace = dict()
+    for module_name in _SUBMODULES:
+        module = importlib.import_module(f".{module_name}", __name__)
+        namespace.update((name, getattr(module, name)) for name in _public_names(module))
+
+    namespace.update((module_name, importlib.import_module(f".{module_name}", __name__)) for module_name in _SUBMODULES)
+    return namespace
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in _NAME_TO_MODULE:
+        value = getattr(importlib.import_module(f".{_NAME_TO_MODULE[name]}", __name__), name)
+
+    elif name in _SUBMODULES or name == "errors":
+        value = importlib.import_module(f".{name}", __name__)
+
+    elif name == "__all__":  # (star import)
+        return sorted(_import_all())
+
+    elif not name.startswith("__"):
+        namespace = _import_all()  # (any other name a subpackage happens to export)
+        if name not in namespace:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+        value = namespace[name]
+
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value  # (next lookups skip this function)
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | set(_NAME_TO_MODULE) | set(_SUBMODULES))
@@ -0,0 +1,39 @@
+"""
+Utilities for the documentation of py2df's classes and functions. (Separate from :mod:`py2df.utils`, which needs nbtlib,
+so that lightweight modules such as :mod:`py2df.client` can use them.)
+"""
+import typing
+import collections
+
+Docable = typing.Union[typing.Callable, type]
+IterOrSingleDocable = typing.Union[Docable, typing.Iterable[Docable]]
+
+
+def remove_u200b_from_doc(obj: IterOrSingleDocable, *other_objs: IterOrSingleDocable) -> None:
+    """
+    Remove ``\\u200b`` from a class/method's docstring.
+
+    Parameters
+    ----------
+    obj : Union[Union[Callable, :class:`type`], Iterable[Union[Callable, :class:`type`]]]
+        Can be either a class/method or an iterable of classes/methods from whose documentation ``\\u200b`` will be
+        removed.
+
+    other_objs: Union[Union[Callable, :class:`type`], Iterable[Union[Callable, :class:`type`]]]
+        Any other objects (or iterables thereof) to follow the same procedure.
+
+    Returns
+    -------
+    None
+        None
+    """
+    if isinstance(obj, collections.Iterable) and not isinstance(obj, type):
+        for clz in obj:
+            remove_u200b_from_doc(clz)
+    else:
+        the_doc = obj.__doc__
+        if "\u200b" in the_doc:
+            obj.__doc__ = the_doc.replace("\u200b", "")
+
+    for o in other_objs:
+        remove_u200b_from_doc(o)
@@ -2,6 +2,7 @@
 Generic base classes for the library.
 """
 import abc
+from collections import deque
 
 from .. import constants
 from ..enums import BlockType, CodeblockActionType, ActionType, EventType, IfType, RepeatType, Target, IfEntityType
@@ -220,6 +221,167 @@ class Block(JSONData, metaclass=abc.ABCMeta):
     length: int
 
 
+def _block_length(block: Block) -> int:
+    """Obtains the length of a block, including (for bracketed blocks) its brackets and inner codeblocks."""
+    return getattr(block, "total_length", block.length)
+
+
+class BlockDeque(deque):
+    """A :class:`~collections.deque` of blocks that keeps track of their total length, in blocks. Used as the
+    :attr:`BracketedBlock.codeblocks` of bracketed blocks (and as the code lines of the reader), so that their
+    :attr:`BracketedBlock.total_length` does not have to be recomputed by going through the whole tree of codeblocks.
+
+    Whenever blocks are added or removed, the total length is updated, and so are the total lengths of the deques
+    containing the bracketed block this deque belongs to (the "parent" deques).
+
+    Parameters
+    ----------\u200b
+    iterable : Iterable[:class:`Block`], optional
+        The initial blocks. Defaults to ``()``.
+
+    maxlen : Optional[:class:`int`], optional
+        The maximum length of the deque (see :class:`~collections.deque`). Defaults to ``None``.
+
+    Attributes
+    ----------\u200b
+    total_length : :class:`int`
+        The sum of the lengths of all blocks in this deque (for bracketed blocks, their :attr:`~.total_length`).
+
+    parent : Optional[:class:`BlockDeque`]
+        The deque containing the bracketed block that owns this deque, if any.
+
+    Warnings
+    --------
+    The total length is only updated through this deque's own methods; blocks whose length changes by other means
+    (e.g. a bracketed block whose :attr:`~BracketedBlock.codeblocks` is not a :class:`BlockDeque`) are not tracked.
+    """
+    __slots__ = ("total_length", "parent")
+
+    total_length: int
+    parent: typing.Optional["BlockDeque"]
+
+    def __init__(self, iterable: typing.Iterable[Block] = (), maxlen: typing.Optional[int] = None):
+        super().__init__(iterable, maxlen)
+        self.parent = None
+        self.total_length = sum(map(self._adopt, self))
+
+    def _attach(self, block: Block) -> int:
+        """Sets this deque as the parent of a block's deque (if it is a bracketed block), returning its length."""
+        codeblocks = getattr(block, "codeblocks", None)
+        if isinstance(codeblocks, BlockDeque):
+            codeblocks.parent = self
+
+        return _block_length(block)
+
+    def _adopt(self, block: Block) -> int:
+        """Like :meth:`_attach`, but keeps the block's current parent, if it has one (e.g. when copying a deque)."""
+        codeblocks = getattr(block, "codeblocks", None)
+        if isinstance(codeblocks, BlockDeque) and codeblocks.parent is None:
+            codeblocks.parent = self
+
+        return _block_length(block)
+
+    def _detach(self, block: Block) -> int:
+        """Unsets this deque as the parent of a block's deque (if it is a bracketed block), returning its length."""
+        codeblocks = getattr(block, "codeblocks", None)
+        if isinstance(codeblocks, BlockDeque) and codeblocks.parent is self:
+            codeblocks.parent = None
+
+        return _block_length(block)
+
+    def _add_length(self, delta: int) -> None:
+        """Adds to the total length of this deque and of its parents."""
+        curr = self
+        while curr is not None and delta:
+            curr.total_length += delta
+            curr = curr.parent
+
+    def _recount(self) -> None:
+        """Recomputes the total length from scratch (after operations that may have discarded blocks)."""
+        self._add_length(sum(map(self._attach, self)) - self.total_length)
+
+    def append(self, block: Block) -> None:
+        if self.maxlen is not None and len(self) == self.maxlen:
+            super().append(block)
+            return self._recount()
+
+        super().append(block)
+        self._add_length(self._attach(block))
+
+    def appendleft(self, block: Block) -> None:
+        if self.maxlen is not None and len(self) == self.maxlen:
+            super().appendleft(block)
+            return self._recount()
+
+        super().appendleft(block)
+        self._add_length(self._attach(block))
+
+    def extend(self, blocks: typing.Iterable[Block]) -> None:
+        for block in list(blocks):  # (list: may be extending with itself)
+            self.append(block)
+
+    def extendleft(self, blocks: typing.Iterable[Block]) -> None:
+        for block in list(blocks):
+            self.appendleft(block)
+
+    def insert(self, index: int, block: Block) -> None:
+        super().insert(index, block)
+        self._add_length(self._attach(block))
+
+    def pop(self) -> Block:
+        block = super().pop()
+        self._add_length(-self._detach(block))
+        return block
+
+    def popleft(self) -> Block:
+        block = super().popleft()
+        self._add_length(-self._detach(block))
+        return block
+
+    def remove(self, block: Block) -> None:
+        super().remove(block)
+        self._add_length(-self._detach(block))
+
+    def clear(self) -> None:
+        for block in self:
+            self._detach(block)
+
+        super().clear()
+        self._add_length(-self.total_length)
+
+    def __setitem__(self, index: int, block: Block) -> None:
+        old_length = self._detach(self[index])
+        super().__setitem__(index, block)
+        self._add_length(self._attach(block) - old_length)
+
+    def __delitem__(self, index: int) -> None:
+        old_length = self._detach(self[index])
+        super().__delitem__(index)
+        self._add_length(-old_length)
+
+    def __iadd__(self, blocks: typing.Iterable[Block]) -> "BlockDeque":
+        self.extend(blocks)
+        return self
+
+    def __add__(self, blocks: typing.Iterable[Block]) -> "BlockDeque":
+        result = self.copy()
+        result.extend(blocks)
+        return result
+
+    def __mul__(self, n: int) -> "BlockDeque":
+        result = self.copy()
+        result *= n
+        return result
+
+    def __imul__(self, n: int) -> "BlockDeque":
+        super().__imul__(n)
+        self._recount()
+        return self
+
+    def __reduce__(self):
+        return self.__class__, (list(self), self.maxlen)
+
+
 class Codeblock(Block, metaclass=abc.ABCMeta):
     """An ABC that describes any codeblock - event, action etc.
 
@@ -447,7 +609,7 @@ class BracketedBlock(Codeblock, metaclass=abc.ABCMeta):
     data : ``None``
         (Bracketed blocks do not have extra data.)
 
-    codeblocks : Deque[:class:`Block`]
+    codeblocks : :class:`BlockDeque`
         The blocks (brackets and inner codeblocks) contained within this If.
 
     target : Optional[:class:`~py2df.enums.targets.Target`]
@@ -498,18 +660,19 @@ class BracketedBlock(Codeblock, metaclass=abc.ABCMeta):
     @property
     def total_length(self) -> int:
         """The total length of this Bracketed Block, in blocks. This sums the lengths of all codeblocks inside,
-        including the If itself (1) and the two brackets (1 + 1 = 2).
+        including the If itself (1) and the two brackets (1 + 1 = 2). If :attr:`codeblocks` is a :class:`BlockDeque`
+        (the default), this takes constant time.
 
         Returns
         -------
         :class:`int`
             The length.
         """
+        codeblocks = self.codeblocks
+        if isinstance(codeblocks, BlockDeque):  # kept up to date
+            return self.length + codeblocks.total_length
 
-        def get_length(block: Block):
-            return getattr(block, "total_length", block.length)
-
-        return self.length + sum(map(get_length, self.codeblocks))
+        return self.length + sum(map(_block_length, codeblocks))
 
     def __iter__(self):
         for codeblock in self.codeblocks:
@@ -844,7 +1007,7 @@ class UtilityBlock(Codeblock, metaclass=abc.ABCMeta):
 # endregion:Codeblock
 
 _abc_classes = (
-    Block, Codeblock, EventBlock, BracketedBlock, CallableBlock, ActionBlock, CallerBlock, UtilityBlock,
+    Block, BlockDeque, Codeblock, EventBlock, BracketedBlock, CallableBlock, ActionBlock, CallerBlock, UtilityBlock,
     JSONData, BuildableJSONData, Itemable, Settable, FunctionHolder, DFType
 )
 remove_u200b_from_doc(_abc_classes)
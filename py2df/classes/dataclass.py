@@ -375,10 +375,14 @@ class Bracket(Block, JSONData):
         The type of this bracket, determining where it is used (either used on If's, represented by
         :attr:`~py2df.enums.parameters.BracketType.NORM`, or with a Repeat, represented by
         :attr:`~py2df.enums.parameters.BracketType.REPEAT`).
+
+    length : :class:`int`
+        The length of a Bracket, in blocks. This is always 1.
     """
     __slots__ = ("direction", "bracket_type")
     direction: BracketDirection
     bracket_type: BracketType
+    length: int = 1
 
     def __init__(self, direction: BracketDirection, bracket_type: BracketType):
         """
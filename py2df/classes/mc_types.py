@@ -16,7 +16,9 @@ from ..enums import (
 from .subcollections import Lore
 from .dataclass import Enchantment, Tag
 from .abc import DFType, Itemable
-from ..utils import remove_u200b_from_doc, clamp, select_dict, nbt_to_python, serialize_tag, dumps_json
+from ..utils import (
+    remove_u200b_from_doc, clamp, select_dict, nbt_to_python, serialize_tag, dumps_json, snbt_string, DFSerializer
+)
 from ..schemas import ItemSchema, ItemTagSchema, ItemDisplaySchema, ItemEnchantmentSchema
 from ..constants import (
     DEFAULT_VAL, DEFAULT_SOUND_PITCH, DEFAULT_SOUND_VOL, MAX_PITCH_DEGREES, MAX_YAW_DEGREES,
@@ -108,7 +110,7 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
 
         .. describe:: hash(a)
 
-            Returns an unique hash representing its material, name, damage, unbreakability and which flags are hidden.
+            Returns an unique hash representing its material and NBT tags (every attribute except :attr:`amount`).
 
 
     Attributes
@@ -152,13 +154,23 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
             (For other :class:`Material`s, this attribute should always be None.)
     
         extra_tags : Optional[:class:`nbtlib.Compound`]
-            Extra NBT, representing any extra tags not covered here.
+            Extra NBT, representing any extra tags not covered here. (Items read from SNBT only parse it on the first
+            access to this attribute.)
+
+    Notes
+    -----
+    The item's SNBT and JSON are cached (items are usually constants, serialized once per use). Setting any
+    attribute, or changing :attr:`lore` or :attr:`enchantments` in place, discards the cache; after changing
+    :attr:`entity_tag` or :attr:`extra_tags` in place, call :meth:`invalidate`.
     """
     __slots__ = (
         "material", "_amount", "name", "lore", "enchantments", "damage", "unbreakable", "hide_flags",
-        "leather_armor_color", "entity_tag", "extra_tags"
+        "leather_armor_color", "entity_tag", "_extra_tags", "_extra_tags_snbt", "_tag_snbt", "_snbt", "_json_data",
+        "_cache_state"
     )
 
+    _CACHE_SLOTS = frozenset(("_tag_snbt", "_snbt", "_json_data", "_cache_state"))
+
     def __init__(
         self, material: Material, amount: int = 1,
         *, name: typing.Optional[typing.Union[str, "DFText"]] = None,
@@ -222,9 +234,9 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
         else:
             self.leather_armor_color: typing.Optional[int] = None
 
-        if entity_tag and "SPAWN_EGG" in self.material.value.upper() or self.material in (
+        if entity_tag and ("SPAWN_EGG" in self.material.value.upper() or self.material in (
             Material.ARMOR_STAND, Material.TROPICAL_FISH_BUCKET
-        ):
+        )):
             if isinstance(entity_tag, (str, collections.UserString)):
                 entity_tag = nbt.parse_nbt(str(entity_tag))
 
@@ -244,6 +256,19 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
     def amount(self) -> int:
         return self._amount
 
+    @property
+    def extra_tags(self) -> typing.Optional[nbt.Compound]:
+        if self._extra_tags_snbt is not None:  # (read from SNBT by Item.from_snbt; parsed only now)
+            object.__setattr__(self, "_extra_tags", nbt.Compound(ItemTagSchema(nbt.parse_nbt(self._extra_tags_snbt))))
+            object.__setattr__(self, "_extra_tags_snbt", None)
+
+        return self._extra_tags
+
+    @extra_tags.setter
+    def extra_tags(self, new_tags: typing.Optional[nbt.Compound]) -> None:
+        object.__setattr__(self, "_extra_tags", new_tags)
+        object.__setattr__(self, "_extra_tags_snbt", None)
+
     @amount.setter
     def amount(self, new_amt: int) -> None:
         i_n_amt = int(new_amt)
@@ -255,6 +280,87 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
 
         self._amount = i_n_amt
 
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        super().__setattr__(name, value)
+        if name in Item._CACHE_SLOTS:
+            return
+
+        object.__setattr__(self, "_snbt", None)
+        object.__setattr__(self, "_json_data", None)
+        if name not in ("material", "amount", "_amount"):  # (those are not in the item's tag)
+            object.__setattr__(self, "_tag_snbt", None)
+
+    def invalidate(self) -> None:
+        """Discards the cached SNBT and JSON of this item. This is only needed after changing :attr:`entity_tag` or
+        :attr:`extra_tags` in place; setting any attribute already does this.
+        """
+        object.__setattr__(self, "_tag_snbt", None)
+        object.__setattr__(self, "_snbt", None)
+        object.__setattr__(self, "_json_data", None)
+
+    def _cached_tag_snbt(self) -> str:
+        """The SNBT of this item's tag (everything but its material and amount), from the cache if still valid."""
+        state = (tuple(self.lore.data), tuple((ench.ench_type, ench.level) for ench in self.enchantments))
+        if self._tag_snbt is None or state != self._cache_state:  # (changed in place)
+            self.invalidate()
+            object.__setattr__(self, "_cache_state", state)
+            object.__setattr__(self, "_tag_snbt", self._write_tag_snbt())
+
+        return self._tag_snbt
+
+    def _write_tag_snbt(self) -> str:
+        """Writes the SNBT of this item's tag directly, without building its NBT (the output is the same as
+        ``serialize_tag(self._nbt_tag())``). Entity NBT and extra tags are arbitrary NBT, so they are still serialized
+        by nbtlib; if an extra tag replaces one of the tags written here, the whole tag is."""
+        entries = []
+        if self.damage > 0:
+            entries.append(f"Damage: {int(self.damage)}")
+
+        if self.unbreakable:
+            entries.append("Unbreakable: 1b")
+
+        if self.entity_tag:
+            ent_t = self.entity_tag
+            entries.append("EntityTag: " + serialize_tag(
+                nbt.parse_nbt(str(ent_t)) if isinstance(ent_t, (str, collections.UserString)) else nbt.Compound(ent_t)
+            ))
+
+        if self.enchantments:
+            enchants = ", ".join(
+                f"{{id: {snbt_string('minecraft:' + enchant.ench_type.value)}, lvl: {int(enchant.level)}}}"
+                for enchant in self.enchantments
+            )
+            entries.append(f"Enchantments: [{enchants}]")
+
+        if any([self.leather_armor_color is not None, self.name, self.lore]):
+            display = []
+            if self.name:
+                display.append("Name: " + snbt_string(dumps_json(str(self.name), ensure_ascii=False)))
+
+            if self.lore:
+                display.append(f"Lore: [{', '.join(map(snbt_string, self.lore.as_json_data()))}]")
+
+            if self.leather_armor_color is not None:
+                display.append(f"color: {int(self.leather_armor_color)}")
+
+            entries.append(f"display: {{{', '.join(display)}}}")
+
+        if self.hide_flags and self.hide_flags.value:
+            entries.append(f"HideFlags: {int(typing.cast(int, self.hide_flags.value))}")
+
+        if self.extra_tags:
+            if isinstance(self.extra_tags, (str, collections.UserString)) \
+                    or not ItemTagSchema.schema.keys().isdisjoint(self.extra_tags):
+                return serialize_tag(self._nbt_tag())  # (replaces or converts the tags above)
+
+            serializer = DFSerializer()
+            entries.extend(
+                f"{serializer.stringify_compound_key(key)}: {serializer.serialize(value)}"
+                for key, value in self.extra_tags.items()
+            )
+
+        return f"{{{', '.join(entries)}}}"
+
     def as_nbt(self) -> nbt.Compound:
         """Produces a NBT representation of this Item.
 
@@ -263,6 +369,14 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
         :class:`nbtlib.Compound`
             A NBT Tag_Compound (dictionary-like structure) representing this item.
         """
+        return ItemSchema(
+            id=f"minecraft:{self.material.value}",
+            Count=clamp(int(self.amount), 1, 64),
+            tag=self._nbt_tag()
+        )
+
+    def _nbt_tag(self) -> ItemTagSchema:
+        """Produces the NBT of this item's tag (see :meth:`as_nbt`)."""
         tag = ItemTagSchema()
         if self.damage > 0:
             tag["Damage"] = int(self.damage)
@@ -308,12 +422,7 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
                 ) if isinstance(ext_t, (str, collections.UserString)) else ext_t
             )
 
-        main_nbt = ItemSchema(
-            id=f"minecraft:{self.material.value}",
-            Count=clamp(int(self.amount), 1, 64),
-            tag=tag
-        )
-        return main_nbt
+        return tag
 
     def as_snbt(self) -> str:
         """Returns this item as a NBT string.
@@ -323,7 +432,15 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
         :class:`str`
             SNBT string.
         """
-        return serialize_tag(self.as_nbt())
+        tag_snbt = self._cached_tag_snbt()  # (discards the rest of the cache if the tag changed in place)
+        if self._snbt is None:
+            object.__setattr__(  # same as serialize_tag(self.as_nbt()), but reusing the tag's SNBT
+                self, "_snbt",
+                f"{{id: {snbt_string('minecraft:' + self.material.value)}, Count: {clamp(int(self.amount), 1, 64)}b, "
+                f"tag: {tag_snbt}}}"
+            )
+
+        return self._snbt
 
     @classmethod
     def from_nbt(cls, data: typing.Union[typing.Dict[str, Base], nbt.Compound]) -> "Item":
@@ -351,7 +468,7 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
         count: nbt.Byte = data.get("Count")
 
         if id_:
-            new.material = Material(nbt_to_python(id_).replace("minecraft:", ""))  # remove surrounding quotes; etc
+            new.material = Material(nbt_to_python(id_).replace("minecraft:", ""))
 
         if count:
             new.amount = nbt_to_python(count)
@@ -369,39 +486,28 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
             enchants: nbt.List[ItemEnchantmentSchema] = tag.get("Enchantments")
             display: ItemDisplaySchema = tag.get("display")
             entity_tag: nbt.Compound = tag.get("EntityTag")
-            extra_tags: set = set(tag.keys()) - {
-                "Damage", "Unbreakable", "HideFlags", "Enchantments", "display", "EntityTag"
-            }
+            extra_tags: typing.List[str] = [key for key in tag.keys() if key not in _ITEM_TAG_KEYS]  # (in order)
 
             if hide_flags:
                 i_hide_flags = int(nbt_to_python(hide_flags))
                 new.hide_flags = HideFlags(i_hide_flags)
 
             if enchants:  # convert the Enchantment schemas
-                new.enchantments = [Enchantment(Enchantments(obj["id"]), obj["lvl"]) for obj in nbt_to_python(enchants)]
+                new.enchantments = [
+                    Enchantment(Enchantments(str(obj["id"]).replace("minecraft:", "")), int(obj["lvl"]))
+                    for obj in nbt_to_python(enchants)
+                ]
 
             if display:
                 disp_dict = nbt_to_python(display)
-                for disp_a, item_a in (
-                    ("Name", "name"), ("color", "leather_armor_color")
-                ):
-                    if disp_a in tag:
-                        setattr(new, item_a, disp_dict[disp_a])
+                if "Name" in disp_dict:  # (a JSON text, like each lore line)
+                    new.name = _parse_text_line(str(disp_dict["Name"]))
+
+                if "color" in disp_dict:
+                    new.leather_armor_color = int(disp_dict["color"])
 
                 if "Lore" in disp_dict:
-                    def parse_line(line: str):
-                        try:
-                            parsed = json.loads(line)
-                            if type(parsed) == str:
-                                return parsed or None
-                            elif type(parsed) == dict:
-                                return parsed.get("text") or None
-                            else:
-                                return None
-                        except json.JSONDecodeError:
-                            return line or ""
-
-                    new.lore = Lore(map(parse_line, disp_dict["Lore"]))
+                    new.lore = Lore(map(_parse_text_line, disp_dict["Lore"]))
 
             if entity_tag:
                 new.entity_tag = entity_tag
@@ -425,12 +531,38 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
         :class:`Item`
             The Item instance representing this NBT data.
 
+        Notes
+        -----
+        The SNBT is read directly into the Item, without building its NBT; tags not covered by the Item's attributes
+        are only parsed when :attr:`extra_tags` is first accessed. SNBT that this can't read (unusual, or invalid)
+        goes through :func:`nbtlib.parse_nbt` and :meth:`Item.from_nbt` instead.
+
         See Also
         --------
-        :meth:`Item.from_nbt`
+        :meth:`Item.from_nbt`, :meth:`Item.from_snbt_many`
         """
+        try:
+            return _ItemSNBTReader(data).read_item(cls)
+        except (ValueError, TypeError, KeyError, IndexError):  # (includes nbtlib's InvalidLiteral)
+            return cls.from_nbt(nbt.parse_nbt(data))
 
-        return cls.from_nbt(nbt.parse_nbt(data))
+    @classmethod
+    def from_snbt_many(cls, data: typing.Iterable[str]) -> typing.List["Item"]:
+        """Produces Item instances from many strings of SNBT (see :meth:`Item.from_snbt`), such as the lines of an
+        item catalog.
+
+        Parameters
+        ----------
+        data : Iterable[:class:`str`]
+            The SNBT of each item.
+
+        Returns
+        -------
+        List[:class:`Item`]
+            The Item instances, in the same order.
+        """
+        from_snbt = cls.from_snbt
+        return [from_snbt(snbt) for snbt in data]
 
     def as_json_data(self) -> dict:
         """Returns this item as valid DF json representation (as a serializable :class:`dict`, not as a string).
@@ -438,14 +570,18 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
         Returns
         -------
         :class:`dict`
-            A JSON-serializable dict.
+            A JSON-serializable dict. (Cached: do not modify it.)
         """
-        return dict(
-            id=constants.ITEM_ID_ITEM,
-            data=dict(
-                item=self.as_snbt()  # it seems "DF_NBT = 1976" is just a means of representing version; can be ignored.
-            )
-        )
+        snbt = self.as_snbt()
+        if self._json_data is None:
+            object.__setattr__(self, "_json_data", dict(
+                id=constants.ITEM_ID_ITEM,
+                data=dict(
+                    item=snbt  # it seems "DF_NBT = 1976" is just a means of representing version; can be ignored.
+                )
+            ))
+
+        return self._json_data
 
     @classmethod
     def from_json_data(cls, data: dict) -> "Item":
@@ -485,28 +621,39 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
         """
         return self.copy()  # well... yeah
 
-    def set(self, material: Material = DEFAULT_VAL, *args, **kwargs) -> "Item":
-        """Refer to __init__'s documentation.
-
-        Parameters
-        ----------
-        material : :class:`~py2df.enums.Material`
-             This item's material.
-        *args :
-            
-        **kwargs :
-            
+    def set(
+        self, material: Material = DEFAULT_VAL, amount: int = DEFAULT_VAL,
+        *, name: typing.Optional[typing.Union[str, "DFText"]] = DEFAULT_VAL,
+        lore: typing.Union[Lore, typing.Optional[typing.Iterable[str]]] = DEFAULT_VAL,
+        enchantments: typing.Optional[typing.Iterable[Enchantment]] = DEFAULT_VAL,
+        damage: int = DEFAULT_VAL, unbreakable: bool = DEFAULT_VAL,
+        hide_flags: typing.Optional[typing.Union[HideFlags, int]] = DEFAULT_VAL,
+        leather_armor_color: typing.Optional[int] = DEFAULT_VAL,
+        entity_tag: typing.Optional[typing.Union[dict, str]] = DEFAULT_VAL,
+        extra_tags: typing.Optional[typing.Union[dict, str]] = DEFAULT_VAL
+    ) -> "Item":
+        """Sets the given attributes of this item (see :meth:`__init__` for each parameter). Parameters left as
+        :const:`~py2df.constants.utility_consts.DEFAULT_VAL` (or omitted) are kept unchanged.
 
         Returns
         -------
-        ``Item``
+        :class:`Item`
             self to allow chaining.
-
-        Todo
-        ----
-        Finish this function.
         """
-        pass
+        params = dict(
+            name=name, lore=lore, enchantments=enchantments, damage=damage, unbreakable=unbreakable,
+            hide_flags=hide_flags, leather_armor_color=leather_armor_color, entity_tag=entity_tag, extra_tags=extra_tags
+        )
+        for attr, value in params.items():
+            if value == DEFAULT_VAL:
+                params[attr] = getattr(self, attr)
+
+        Item.__init__(  # (validates and converts the values like on creation; this also discards the cache)
+            self, self.material if material == DEFAULT_VAL else material,
+            self.amount if amount == DEFAULT_VAL else amount,
+            **params
+        )
+        return self
 
     def copy(self) -> "Item":
         """Makes an identical copy of this item stack.
@@ -581,11 +728,8 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
         return f"minecraft:{self.material.value}"
 
     def __eq__(self, other: "Item"):
-        attrs_to_compare = set(self.__class__.__slots__) - {"_amount", }  # compare all except amount
-
-        return type(self) == type(other) and all(
-            getattr(self, attr) == getattr(other, attr) for attr in attrs_to_compare
-        )
+        return type(self) == type(other) and self.material == other.material \
+            and self._cached_tag_snbt() == other._cached_tag_snbt()  # compare all except amount
 
     def __ne__(self, other: "Item"):
         return not self.__eq__(other)
@@ -673,7 +817,227 @@ class Item(DFType, Itemable):  # TODO: Bonus Item classes - WrittenBook, for exa
         return self
 
     def __hash__(self):
-        return hash((self.material, self.name, self.hide_flags, self.damage, self.unbreakable))
+        return hash((self.material, self._cached_tag_snbt()))
+
+
+_ITEM_TAG_KEYS = frozenset(("Damage", "Unbreakable", "HideFlags", "Enchantments", "display", "EntityTag"))
+
+_SNBT_TOKEN = re.compile(r"""\s*("(?:\\.|[^\\"])*"|'(?:\\.|[^\\'])*'|[a-zA-Z0-9._+-]+|\[[BIL];|\S)""", re.DOTALL)
+_SNBT_WORD = re.compile(r"[a-zA-Z0-9._+-]+")
+_SNBT_NUMBER = re.compile(r"[+-]?(?:[0-9]*?\.[0-9]+|[0-9]+\.[0-9]*?|[1-9][0-9]*|0)(?:[eE][+-]?[0-9]+)?[bslfdBSLFD]?")
+_SNBT_INTEGER = re.compile(r"([+-]?(?:[1-9][0-9]*|0))([bslBSL]?)")
+_SNBT_INTEGER_BITS = {"b": 8, "s": 16, "": 32, "l": 64}
+_SNBT_ESCAPE = re.compile(r"\\.")
+_SNBT_ESCAPES = {'\\"': '"', "\\'": "'", "\\\\": "\\"}  # (replaced in this order, like nbtlib does)
+
+
+def _parse_text_line(line: str) -> typing.Optional[str]:
+    """Converts a JSON text (an item's name or lore line) to the text it shows."""
+    try:
+        parsed = json.loads(line)
+        if type(parsed) == str:
+            return parsed or None
+        elif type(parsed) == dict:
+            return parsed.get("text") or None
+        else:
+            return None
+    except json.JSONDecodeError:
+        return line or ""
+
+
+class _ItemSNBTReader:
+    """Reads the SNBT of an item straight into an :class:`Item` (see :meth:`Item.from_snbt`), with the same result as
+    ``Item.from_nbt(nbtlib.parse_nbt(snbt))``. Raises :exc:`ValueError` (or one of the errors caught by
+    :meth:`Item.from_snbt`) at anything it does not handle, so that nbtlib is used instead."""
+    __slots__ = ("tokens", "pos")
+
+    def __init__(self, data: str):
+        self.tokens: typing.List[str] = _SNBT_TOKEN.findall(data)
+        self.pos: int = 0
+
+    def next(self) -> str:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, token: str) -> None:
+        if self.next() != token:
+            raise ValueError(f"Expected {token!r}.")
+
+    def keys(self) -> typing.Iterator[str]:
+        """Reads a compound, yielding each of its keys; the value of each key must be read before the next one."""
+        self.expect("{")
+        if self.tokens[self.pos] == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.next()
+            if key[0] in "\"'":
+                key = self.unquote(key)
+            elif not _SNBT_WORD.fullmatch(key):
+                raise ValueError(f"Invalid compound key {key!r}.")
+
+            self.expect(":")
+            yield key
+
+            token = self.next()
+            if token == "}":
+                return
+
+            if token != ",":
+                raise ValueError("Expected ',' or '}'.")
+
+    def items(self) -> typing.Iterator[None]:
+        """Reads a list, yielding once for each of its items; each item must be read before the next one."""
+        self.expect("[")
+        if self.tokens[self.pos] == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield
+
+            token = self.next()
+            if token == "]":
+                return
+
+            if token != ",":
+                raise ValueError("Expected ',' or ']'.")
+
+    @staticmethod
+    def unquote(token: str) -> str:
+        value = token[1:-1]
+        if "\\" in value:
+            forbidden = "\\'" if token[0] == '"' else '\\"'  # (the other quote can't be escaped)
+            if any(seq == forbidden or seq not in _SNBT_ESCAPES for seq in _SNBT_ESCAPE.findall(value)):
+                raise ValueError("Invalid escape sequence.")
+
+            for seq, sub in _SNBT_ESCAPES.items():
+                value = value.replace(seq, sub)
+
+        return value
+
+    def string(self) -> str:
+        token = self.next()
+        if token[0] in "\"'":
+            return self.unquote(token)
+
+        if not _SNBT_WORD.fullmatch(token) or _SNBT_NUMBER.fullmatch(token) or token.lower() in ("true", "false"):
+            raise ValueError(f"Expected a string, got {token!r}.")
+
+        return token
+
+    def integer(self, bits: int = 32) -> int:
+        """Reads an integer which must fit in a tag of the given size (``Byte``: 8 bits; ``Int``: 32 bits)."""
+        token = self.next()
+        if token.lower() in ("true", "false"):
+            return int(token.lower() == "true")
+
+        match = _SNBT_INTEGER.fullmatch(token)
+        if not match:
+            raise ValueError(f"Expected an integer, got {token!r}.")
+
+        value = int(match[1])
+        limit = 1 << (min(bits, _SNBT_INTEGER_BITS[match[2].lower()]) - 1)
+        if not -limit <= value < limit:
+            raise ValueError(f"Integer {token!r} out of range.")
+
+        return value
+
+    def skip(self) -> str:
+        """Skips a value of any type, returning its SNBT."""
+        start = self.pos
+        depth = 0
+        while True:
+            token = self.next()
+            if token[0] in "{[":
+                depth += 1
+            elif token in ("}", "]"):
+                depth -= 1
+            elif depth == 0 and token in (":", ",", ";"):
+                raise ValueError(f"Unexpected {token!r}.")
+
+            if depth <= 0:
+                if depth < 0:
+                    raise ValueError(f"Unexpected {token!r}.")
+
+                return " ".join(self.tokens[start:self.pos])
+
+    def read_item(self, cls: typing.Type[Item]) -> Item:
+        new = cls(Material.STONE)
+        for key in self.keys():
+            if key == "id":
+                new.material = Material(self.string().replace("minecraft:", ""))
+            elif key == "Count":
+                count = self.integer(8)
+                if count:
+                    new.amount = count
+            elif key == "tag":
+                self.read_tag(new)
+            elif key == "Slot":
+                self.integer(8)
+            else:
+                self.skip()
+
+        if self.pos != len(self.tokens):
+            raise ValueError("Expected end of string.")
+
+        return new
+
+    def read_tag(self, new: Item) -> None:
+        extra_tags = dict()  # the SNBT of each other tag
+        for key in self.keys():
+            if key == "Damage":
+                new.damage = self.integer()
+            elif key == "Unbreakable":
+                new.unbreakable = self.integer(8)
+            elif key == "HideFlags":
+                hide_flags = self.integer()
+                new.hide_flags = HideFlags(hide_flags) if hide_flags else None
+            elif key == "Enchantments":
+                enchantments = []
+                for _ in self.items():
+                    ench_id, level = None, None
+                    for ench_key in self.keys():
+                        if ench_key == "id":
+                            ench_id = self.string()
+                        elif ench_key == "lvl":
+                            level = self.integer()
+                        else:
+                            self.skip()
+
+                    if ench_id is None or level is None:
+                        raise ValueError("Enchantments must have an id and a level.")
+
+                    enchantments.append(Enchantment(Enchantments(ench_id.replace("minecraft:", "")), level))
+
+                new.enchantments = enchantments
+            elif key == "display":
+                for disp_key in self.keys():
+                    if disp_key == "Name":
+                        new.name = _parse_text_line(self.string())
+                    elif disp_key == "color":
+                        new.leather_armor_color = self.integer()
+                    elif disp_key == "Lore":
+                        new.lore = Lore([_parse_text_line(self.string()) for _ in self.items()])
+                    else:
+                        self.skip()
+            elif key == "EntityTag":
+                entity_tag = self.skip()
+                if not entity_tag.startswith("{"):
+                    raise ValueError("EntityTag must be a compound.")
+
+                entity_tag = nbt.parse_nbt(entity_tag)
+                if entity_tag:
+                    new.entity_tag = entity_tag
+            else:
+                extra_tags[key] = self.skip()
+
+        if extra_tags:
+            new.extra_tags = None
+            extra_snbt = ", ".join(f"{snbt_string(key)}: {value}" for key, value in extra_tags.items())
+            object.__setattr__(new, "_extra_tags_snbt", f"{{{extra_snbt}}}")  # (parsed on first access)
 
 
 class DFText(collections.UserString, DFType):
@@ -1549,24 +1913,25 @@ class DFLocation(DFType):
             :class:`DFNumber` instance.
 
         """
-        required_attrs = ("x", "y", "z", "isBlock", "pitch", "yaw", "worldLeast", "worldMost")
+        required_attrs = ("x", "y", "z", "pitch", "yaw")
         if (
                 not isinstance(data, dict)
                 # or "id" not in data
                 or "data" not in data
                 or not isinstance(data["data"], dict)
-                or not all(attr in data["data"] for attr in required_attrs)
+                or not isinstance(data["data"].get("loc"), dict)
+                or not all(attr in data["data"]["loc"] for attr in required_attrs)
         ):
             raise TypeError(
-                f"Malformed DFLocation parsed JSON data! Must be a dict with a 'data' dict including the \
-                following attributes: {', '.join(required_attrs)}."
+                f"Malformed DFLocation parsed JSON data! Must be a dict with a 'data' dict including a 'loc' dict with \
+the following attributes: {', '.join(required_attrs)}."
             )
 
-        d_dict = data["data"]
+        loc = data["data"]["loc"]
 
         return cls(
-            d_dict.x, d_dict.y, d_dict.z, d_dict.pitch, d_dict.yaw,
-            is_block=d_dict.isBlock
+            loc["x"], loc["y"], loc["z"], loc["pitch"], loc["yaw"],
+            is_block=bool(data["data"].get("isBlock", False))
         )
 
     def copy(self) -> "DFLocation":
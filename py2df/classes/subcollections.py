@@ -45,11 +45,11 @@ class Lore(collections.UserList):  # [typing.Optional[str]]
             List of lines as an Iterable. (Optional)
         """
         if type(iter_) == Lore:
-            self.data = iter_.data[:]  # allow easy and efficient use of Lore(Lore(...))
             super().__init__()
+            self.data = iter_.data[:]  # allow easy and efficient use of Lore(Lore(...))
         else:
             if iter_:
-                super().__init__(map(str, iter_))
+                super().__init__("" if line is None else str(line) for line in iter_)  # (None lines are empty)
             else:
                 super().__init__()
 
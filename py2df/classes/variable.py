@@ -1662,7 +1662,7 @@ generated IfVariable block). Example usage::
         _heavy_imports()
 
         if not hasattr(self, "check_type") or not self.check_type:
-            self.check_type = Param
+            self.check_type = _tp.Param
 
         self.name: str = str(name)
 
@@ -1727,11 +1727,11 @@ generated IfVariable block). Example usage::
                 self.has_check_type
                 and (
                     tp_to_check == typing.Union[_tp.Numeric, _tp.Locatable]
-                        and self.check_type not in (Numeric, Locatable)
+                        and self.check_type not in (_tp.Numeric, _tp.Locatable)
                     or tp_to_check == _tp.Numeric and self.check_type != tp_to_check
                 )
             ):
-                raise
+                raise TypeError(f"Cannot set a variable of type {self.check_type} to a {setv_type.name} operation.")
 
             args = Arguments(
                 [self] + [_tp.p_check(o, tp_to_check, "value") for o in value.vars],
@@ -1773,7 +1773,7 @@ generated IfVariable block). Example usage::
 
     @property
     def has_check_type(self) -> bool:
-        return self.check_type and self.check_type != Param
+        return self.check_type and self.check_type != _tp.Param
 
     @classmethod
     def from_json_data(cls, data: dict) -> "_Var":
@@ -1802,7 +1802,7 @@ generated IfVariable block). Example usage::
             or not isinstance(data["data"], dict)
             or "name" not in data["data"]
             or type(data["data"]["name"]) != str
-            or "scope" not in data["scope"]
+            or "scope" not in data["data"]
             or type(data["data"]["scope"]) != str
         ):
             raise TypeError(
@@ -1812,6 +1812,9 @@ generated IfVariable block). Example usage::
 
         return cls(data["data"]["name"], scope=VariableScope(data["data"]["scope"]))
 
+    def __reduce__(self):  # (rebuilt from its name and scope: its check type may hold unpicklable forward refs)
+        return _rebuild_var, (self.__class__, self.name, self.scope)
+
     def __repr__(self):
         return f"<{self.__class__.__name__} name={repr(self.name)} scope={repr(self.scope.value)}>"
 
@@ -1898,6 +1901,11 @@ generated IfVariable block). Example usage::
         return hash((self.name, self.scope))
 
 
+def _rebuild_var(cls: typing.Type[_Var], name: str, scope: VariableScope) -> _Var:
+    """Rebuilds a pickled variable (see :meth:`_Var.__reduce__`)."""
+    return cls(name, scope=scope)
+
+
 class DFVariable(_Var):
     __doc__ = _Var.__doc__
     pass
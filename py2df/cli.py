@@ -0,0 +1,329 @@
+"""
+The ``py2df`` command: compiles plot modules and outputs their code lines. Example usage::
+
+    py2df plots.lobby plots/arena.py -f snbt -f give -o templates/ -j 4
+
+Run ``py2df --help`` (or ``python -m py2df --help``) for every option.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import typing
+
+# (only light modules here, so that compiling in a compile server starts fast: the enums, nbtlib and py2df.reading are
+# imported where they are used)
+from .client import CompileResult, compile_remote
+from .constants import DEFAULT_AUTHOR, MIN_COMPRESSION_LEVEL, MAX_COMPRESSION_LEVEL, DEFAULT_COMPRESSION_LEVEL, \
+    BASIC_PLOT_SIZE, LARGE_PLOT_SIZE, MASSIVE_PLOT_SIZE
+from .errors import CompileServerError
+
+__all__ = ("main",)
+
+#: The output formats, with the extension of their files.
+FORMATS = {"json": "json", "base64": "txt", "snbt": "snbt", "give": "mcfunction"}
+
+#: The plot sizes, with their widths (see :class:`~py2df.enums.parameters.PlotSizes`).
+PLOT_SIZES = {"basic": BASIC_PLOT_SIZE, "large": LARGE_PLOT_SIZE, "massive": MASSIVE_PLOT_SIZE}
+
+
+def give_command(snbt: str, selector: str = "@p") -> str:
+    """Converts the SNBT of a Paste item (see :meth:`~.DFReader.output_snbt`) to a ``/give`` command.
+
+    Parameters
+    ----------
+    snbt : :class:`str`
+        The item's SNBT.
+
+    selector : :class:`str`, optional
+        Who to give the item to. Defaults to ``"@p"``.
+
+    Returns
+    -------
+    :class:`str`
+        The command (without the leading slash, as in ``.mcfunction`` files).
+    """
+    import nbtlib
+    from .utils import serialize_tag
+
+    item = nbtlib.parse_nbt(snbt)
+    return f"give {selector} {item['id']}{serialize_tag(item['tag'])} {int(item.get('Count', 1))}"
+
+
+def _resolve_target(target: str, paths: typing.List[str]) -> str:
+    """Converts a target given as a path to a Python file (``"plots/arena.py"``) to a module name (``"arena"``),
+    adding its directory to ``paths``. Other targets (``"module[:attribute]"``) are returned unchanged."""
+    file_path, sep, attr = target.partition(":")
+    if not file_path.endswith(".py"):
+        return target
+
+    directory, file_name = os.path.split(os.path.abspath(file_path))
+    if directory not in paths:
+        paths.append(directory)
+
+    return file_name[:-len(".py")] + sep + attr
+
+
+def _add_paths(paths: typing.List[str]) -> None:
+    """Makes the modules in the given directories importable (in this process)."""
+    for path in reversed(paths):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def _output_name(target: str) -> str:
+    """The name of the directory where the files of a target are written."""
+    return target.replace(":", "-")
+
+
+def _format_line(
+    json_str: str, encoded_str: str, snbt: str, formats: typing.List[str], selector: str
+) -> typing.Dict[str, str]:
+    """The output of a line in each of the given formats."""
+    output = dict()
+    for fmt in formats:
+        if fmt == "json":
+            output[fmt] = json_str
+        elif fmt == "base64":
+            output[fmt] = encoded_str
+        elif fmt == "snbt":
+            output[fmt] = snbt
+        else:
+            output[fmt] = give_command(snbt, selector)
+
+    return output
+
+
+def _emit_line(
+    target: str, index: int, output: typing.Optional[typing.Dict[str, str]], output_dir: typing.Optional[str],
+    formats: typing.List[str]
+) -> None:
+    """Writes the output of a line to ``<output_dir>/<target>/<index>.<ext>`` (one file per format), or to stdout as
+    a JSON line if there is no output directory. A line without output (``None``) was removed, so are its files."""
+    if output_dir is None:
+        record = dict(target=target, line=index)
+        record.update(output if output is not None else dict(removed=True))
+        sys.stdout.write(json.dumps(record) + "\n")
+        return
+
+    directory = os.path.join(output_dir, _output_name(target))
+    os.makedirs(directory, exist_ok=True)
+    for fmt in formats:
+        path = os.path.join(directory, f"{index}.{FORMATS[fmt]}")  # (each format has its own extension)
+        if output is None:
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(output[fmt] + "\n")
+
+
+def _format_timings(result: CompileResult) -> str:
+    """Describes the time spent compiling a target."""
+    phases = " ".join(
+        f"{phase}={seconds * 1e3:.1f}ms" for phase, seconds in result.timings.items() if phase != "total"
+    )
+    return f"{result.target}: {len(result.json)} line(s) in {result.timings.get('total', 0.0) * 1e3:.1f}ms ({phases})"
+
+
+def _parser() -> argparse.ArgumentParser:
+    """Builds the parser of the command's arguments."""
+    parser = argparse.ArgumentParser(
+        prog="py2df", description="Compiles plot modules to DiamondFire code templates."
+    )
+    parser.add_argument(
+        "targets", nargs="*", metavar="TARGET",
+        help="module to compile: a module name (\"plots.lobby\"), a Python file (\"plots/lobby.py\"), optionally "
+             "followed by \":attribute\" (a function holder or an iterable of them, to compile only those)"
+    )
+    parser.add_argument(
+        "-f", "--format", dest="formats", action="append", choices=sorted(FORMATS),
+        help="output format of each line (may be given more than once); default: snbt"
+    )
+    parser.add_argument(
+        "-o", "--output-dir", help="write each line to a file in this directory (default: JSON lines on stdout)"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="amount of worker processes compiling modules in parallel (default: amount of CPUs; 1 to compile in "
+             "this process)"
+    )
+    parser.add_argument(
+        "-p", "--path", dest="paths", action="append", default=[],
+        help="directory to import the modules from (may be given more than once; the current directory is used too)"
+    )
+    parser.add_argument("--plot-size", choices=list(PLOT_SIZES), default="basic", help="default: basic")
+    parser.add_argument("--author", default=DEFAULT_AUTHOR, help="author written in the templates")
+    parser.add_argument("--auto-split", action="store_true", help="split lines that are too long into Functions")
+    parser.add_argument("--compact-json", action="store_true", help="write the JSON without spaces")
+    parser.add_argument(
+        "--compression-level", type=int, default=DEFAULT_COMPRESSION_LEVEL,
+        choices=range(MIN_COMPRESSION_LEVEL, MAX_COMPRESSION_LEVEL + 1), metavar="LEVEL",
+        help=f"gzip compression level, from {MIN_COMPRESSION_LEVEL} to {MAX_COMPRESSION_LEVEL} "
+             f"(default: {DEFAULT_COMPRESSION_LEVEL})"
+    )
+    parser.add_argument(
+        "--cache", nargs="?", const="", default=None, metavar="DIR",
+        help="reuse unchanged lines from an on-disk cache (optionally, in the given directory)"
+    )
+    parser.add_argument("--selector", default="@p", help="target selector of the give commands (default: @p)")
+    parser.add_argument(
+        "-w", "--watch", action="store_true",
+        help="keep running, recompiling the modules whenever they change, and output only the changed lines"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.2, help="time, in seconds, between checks for changes (default: 0.2)"
+    )
+    parser.add_argument(
+        "--serve", metavar="ADDRESS",
+        help="run a compile server at this address (\"unix:PATH\" or \"[HOST:]PORT\"), keeping the modules imported "
+             "between compilations; the given targets are compiled once, beforehand"
+    )
+    parser.add_argument(
+        "--server", metavar="ADDRESS", help="compile the targets in the compile server running at this address"
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print the timing of each module")
+    return parser
+
+
+def _watch(
+    options: argparse.Namespace, targets: typing.List[str], paths: typing.List[str], formats: typing.List[str]
+) -> int:
+    """Runs the command in watch mode (see :class:`~.PlotWatcher`), until interrupted."""
+    from .enums import PlotSizes
+    from .reading import PlotWatcher
+
+    watcher = PlotWatcher(
+        targets, paths=[path for path in paths if path != os.getcwd()], interval=options.interval,
+        plot_size=PlotSizes(PLOT_SIZES[options.plot_size]), auto_split=options.auto_split, author=options.author,
+        compact_json=options.compact_json, compression_level=options.compression_level
+    )  # (the current directory is not watched as a whole; the targets' directories are)
+    try:
+        while True:
+            start = time.perf_counter()
+            changes = 0
+            for change in watcher.poll():
+                if change.error is not None:
+                    print(f"{change.target}: compilation failed\n{change.error}", file=sys.stderr)
+                    continue
+
+                output = None if change.removed else _format_line(
+                    change.json, change.encoded_str, change.snbt, formats, options.selector
+                )
+                _emit_line(change.target, change.index, output, options.output_dir, formats)
+                sys.stdout.flush()
+                changes += 1
+
+            if changes and not options.quiet:
+                print(f"{changes} line(s) changed in {(time.perf_counter() - start) * 1e3:.1f}ms", file=sys.stderr)
+
+            time.sleep(max(options.interval - (time.perf_counter() - start), 0))
+
+    except KeyboardInterrupt:
+        return 0
+
+
+def _serve(options: argparse.Namespace, targets: typing.List[str], paths: typing.List[str]) -> int:
+    """Runs a compile server (see :class:`~.CompileServer`), until interrupted or shut down."""
+    from .enums import PlotSizes
+    from .reading import CompileServer
+
+    try:
+        server = CompileServer(options.serve, paths=[path for path in paths if path != os.getcwd()])
+    except (OSError, ValueError) as err:
+        print(f"Could not start the compile server: {err}", file=sys.stderr)
+        return 1
+
+    with server:
+        if targets:  # (imports them beforehand)
+            server.compile(
+                targets, plot_size=PlotSizes(PLOT_SIZES[options.plot_size]), auto_split=options.auto_split,
+                author=options.author, compact_json=options.compact_json, compression_level=options.compression_level
+            )
+
+        if not options.quiet:
+            print(f"Compile server listening at {server.address!r}", file=sys.stderr)
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+
+def main(argv: typing.Optional[typing.Sequence[str]] = None) -> int:
+    """Runs the ``py2df`` command.
+
+    Parameters
+    ----------
+    argv : Optional[Sequence[:class:`str`]], optional
+        The command-line arguments. Defaults to ``None`` (:data:`sys.argv`).
+
+    Returns
+    -------
+    :class:`int`
+        The exit code: ``0`` if every module was compiled; ``1`` otherwise.
+    """
+    parser = _parser()
+    options = parser.parse_args(argv)
+    if options.jobs is not None and options.jobs < 1:
+        parser.error("the amount of jobs must be at least 1")
+
+    if not options.targets and not options.serve:
+        parser.error("at least one target is required")
+
+    formats = list(dict.fromkeys(options.formats or ["snbt"]))
+    paths = [os.path.abspath(path) for path in options.paths] + [os.getcwd()]
+    targets = [_resolve_target(target, paths) for target in options.targets]
+    _add_paths(paths)
+
+    if options.watch:
+        return _watch(options, targets, paths, formats)
+
+    if options.serve:
+        return _serve(options, targets, paths)
+
+    settings = dict(
+        plot_size=PLOT_SIZES[options.plot_size], auto_split=options.auto_split, author=options.author,
+        compact_json=options.compact_json, compression_level=options.compression_level
+    )
+    if options.server:
+        try:
+            results = compile_remote(targets, options.server, paths=paths, **settings)
+        except (CompileServerError, ValueError) as err:
+            print(err, file=sys.stderr)
+            return 1
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        from .enums import PlotSizes
+        from .reading import TemplateCache, compile_module, compile_modules
+
+        settings.update(
+            plot_size=PlotSizes(settings["plot_size"]), raise_errors=False,
+            cache=TemplateCache(options.cache or None) if options.cache is not None else None
+        )
+        if options.jobs == 1 or len(targets) == 1:
+            results = [compile_module(target, **settings) for target in targets]
+        else:
+            with ProcessPoolExecutor(max_workers=options.jobs, initializer=_add_paths, initargs=(paths,)) as pool:
+                results = compile_modules(targets, executor=pool, **settings)
+
+    failed = False
+    for result in results:
+        if not result.ok:
+            failed = True
+            print(f"{result.target}: compilation failed\n{result.error}", file=sys.stderr)
+            continue
+
+        for index, line in enumerate(zip(result.json, result.encoded_str, result.snbt)):
+            _emit_line(
+                result.target, index, _format_line(*line, formats, options.selector), options.output_dir, formats
+            )
+
+        if not options.quiet:
+            print(_format_timings(result), file=sys.stderr)
+
+    sys.stdout.flush()
+    return 1 if failed else 0
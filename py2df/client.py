@@ -0,0 +1,209 @@
+"""
+The client of the compile server (see :class:`~py2df.reading.server.CompileServer`), and the results of compilations.
+Only the standard library is needed here (neither the enums nor nbtlib nor :mod:`py2df.reading`), so that compiling
+in a running server (e.g. ``py2df --server ...`` from an editor) does not spend its time importing what the server
+already has.
+"""
+import json
+import os
+import socket
+import types
+import typing
+
+from .constants import DEFAULT_AUTHOR, DEFAULT_COMPRESSION_LEVEL, BASIC_PLOT_SIZE
+from .errors import CompileServerError
+from ._doc_utils import remove_u200b_from_doc
+
+if typing.TYPE_CHECKING:
+    from .enums import PlotSizes
+
+__all__ = ("CompileResult", "compile_remote", "parse_address")
+
+CompileTarget = typing.Union[str, types.ModuleType]
+
+
+class CompileResult:
+    """The result of compiling a plot module (or a group of function holders inside it) with
+    :func:`~.compile_module`, :func:`~.compile_modules` or :func:`compile_remote`.
+
+    Attributes
+    ----------\u200b
+    target : :class:`str`
+        The compiled target, in the form ``"module"`` or ``"module:attribute"``.
+
+    json : List[:class:`str`]
+        The JSON string of each code line (see :meth:`~.DFReader.output_json`).
+
+    encoded_str : List[:class:`str`]
+        The base64 code of each code line (see :meth:`~.DFReader.output_encoded_str`).
+
+    snbt : List[:class:`str`]
+        The SNBT of the Paste item of each code line (see :meth:`~.DFReader.output_snbt`).
+
+    timings : Dict[:class:`str`, :class:`float`]
+        Time spent (in seconds) in each phase of the compilation: ``"import"``, ``"read"``, ``"json"``,
+        ``"encode"``, ``"snbt"`` and ``"total"``.
+
+    error : Optional[:class:`str`]
+        The formatted traceback of the exception raised while compiling, if any (only when the errors are not
+        raised; see :func:`~.compile_module`). In that case, the output lists are empty.
+    """
+    __slots__ = ("target", "json", "encoded_str", "snbt", "timings", "error")
+
+    target: str
+    json: typing.List[str]
+    encoded_str: typing.List[str]
+    snbt: typing.List[str]
+    timings: typing.Dict[str, float]
+    error: typing.Optional[str]
+
+    def __init__(
+        self, target: str, json: typing.Optional[typing.List[str]] = None,
+        encoded_str: typing.Optional[typing.List[str]] = None, snbt: typing.Optional[typing.List[str]] = None,
+        timings: typing.Optional[typing.Dict[str, float]] = None, error: typing.Optional[str] = None
+    ):
+        self.target = str(target)
+        self.json = list(json or [])
+        self.encoded_str = list(encoded_str or [])
+        self.snbt = list(snbt or [])
+        self.timings = dict(timings or {})
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether or not the compilation succeeded."""
+        return self.error is None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} target={repr(self.target)} lines={len(self.json)} \
+total={self.timings.get('total', 0.0):.3f}s{' error' if self.error else ''}>"
+
+
+def _target_name(target: CompileTarget) -> str:
+    """Converts a compilation target (a module or a ``"module[:attribute]"`` string) to its string form."""
+    if isinstance(target, types.ModuleType):
+        return target.__name__
+
+    return str(target)
+
+
+Address = typing.Union[str, typing.Tuple[str, int]]  # a Unix socket path, or a (host, port) pair
+
+
+def parse_address(address: typing.Union[str, int]) -> Address:
+    """Parses the address of a compile server: ``"unix:PATH"`` (or any path with a slash) for a Unix socket, or
+    ``"[HOST:]PORT"`` for TCP (the host defaults to ``"127.0.0.1"``).
+
+    Parameters
+    ----------
+    address : Union[:class:`str`, :class:`int`]
+        The address (or a TCP port).
+
+    Returns
+    -------
+    Union[:class:`str`, Tuple[:class:`str`, :class:`int`]]
+        The socket path, or the host and port.
+
+    Raises
+    ------
+    :exc:`ValueError`
+        If the address is invalid.
+    """
+    if isinstance(address, int):
+        return "127.0.0.1", address
+
+    address = str(address)
+    if address.startswith("unix:"):
+        return address[len("unix:"):]
+
+    if "/" in address or os.sep in address:
+        return address
+
+    host, _, port = address.rpartition(":")
+    try:
+        return host or "127.0.0.1", int(port)
+    except ValueError:
+        raise ValueError(f"Invalid compile server address: {address!r}.") from None
+
+
+def _connect(address: Address, timeout: typing.Optional[float]) -> socket.socket:
+    """Connects to a compile server."""
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(address)
+        except OSError:
+            sock.close()
+            raise
+
+        return sock
+
+    return socket.create_connection(address, timeout=timeout)
+
+
+def compile_remote(
+    targets: typing.Iterable[CompileTarget], address: typing.Union[Address, int], *,
+    plot_size: typing.Union["PlotSizes", int] = BASIC_PLOT_SIZE, auto_split: bool = False,
+    author: str = DEFAULT_AUTHOR, compact_json: bool = False, compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    paths: typing.Iterable[str] = (), timeout: typing.Optional[float] = None
+) -> typing.List[CompileResult]:
+    """Compiles plot modules in a running :class:`~.CompileServer` (see :func:`~.compile_module` for the other
+    parameters). The modules must be importable by the server.
+
+    Parameters
+    ----------
+    targets : Iterable[Union[:class:`str`, :class:`~types.ModuleType`]]
+        The modules to compile.
+
+    address : Union[:class:`str`, Tuple[:class:`str`, :class:`int`], :class:`int`]
+        The server's address (see :func:`parse_address`).
+
+    plot_size : Union[:class:`~py2df.enums.parameters.PlotSizes`, :class:`int`], optional
+        Size of the plot this code is being developed for (or its width). Default is
+        :attr:`~py2df.enums.parameters.PlotSizes.BASIC_PLOT` .
+
+    paths : Iterable[:class:`str`], optional
+        Directories the server should import the targets from (besides its own :data:`sys.path`). Defaults to ``()``.
+
+    timeout : Optional[:class:`float`], optional
+        The maximum time to wait for the server, in seconds. Defaults to ``None`` (no limit).
+
+    Returns
+    -------
+    List[:class:`~.CompileResult`]
+        The result of each target, in the same order.
+
+    Raises
+    ------
+    :exc:`~py2df.errors.CompileServerError`
+        If the server could not be reached, or rejected the request.
+    """
+    if not isinstance(address, tuple):
+        address = parse_address(address)
+
+    request = dict(
+        op="compile", targets=[_target_name(target) for target in targets], settings=dict(
+            plot_size=int(getattr(plot_size, "value", plot_size)), auto_split=auto_split, author=author,
+            compact_json=compact_json, compression_level=compression_level
+        ), paths=[os.path.abspath(path) for path in paths]
+    )
+    try:
+        with _connect(address, timeout) as sock, sock.makefile("rwb") as file:
+            file.write(json.dumps(request).encode("utf-8") + b"\n")
+            file.flush()
+            line = file.readline()
+    except OSError as err:
+        raise CompileServerError(f"Could not reach the compile server at {address!r}: {err}") from err
+
+    if not line:
+        raise CompileServerError("The compile server closed the connection without answering.")
+
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise CompileServerError(f"The compile server rejected the request: {response.get('error')}")
+
+    return [CompileResult(**result) for result in response["results"]]
+
+
+remove_u200b_from_doc(CompileResult)
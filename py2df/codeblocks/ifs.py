@@ -1,6 +1,5 @@
 import collections
 import typing
-from collections import deque
 from abc import abstractmethod
 
 from ..errors import DFSyntaxError
@@ -9,7 +8,7 @@ from ..enums import (
     SelectionTarget,
     BracketDirection, BracketType, IfType, Material, ItemEqComparisonMode)
 from ..classes import JSONData, Arguments, BracketedBlock, Block, Bracket, DFVariable, DFGameValue, Tag, DFText, Item, \
-    ItemCollection
+    ItemCollection, BlockDeque
 from ..utils import remove_u200b_from_doc, flatten
 from ..constants import BLOCK_ID, DEFAULT_VAL
 from ..reading.reader import DFReader
@@ -250,7 +249,7 @@ class IfPlayer(IfBlock):
             target.value if SelectionTarget in (target, type(target)) else target
         ) if target else None
 
-        self.codeblocks = deque(codeblocks) if codeblocks else deque()
+        self.codeblocks = BlockDeque(codeblocks or ())
         self.invert = invert
 
         if append_to_reader:
@@ -368,7 +367,7 @@ class IfEntity(IfBlock):
             target.value if SelectionTarget in (target, type(target)) else target
         ) if target else None
 
-        self.codeblocks = deque(codeblocks) if codeblocks else deque()
+        self.codeblocks = BlockDeque(codeblocks or ())
         self.invert = invert
 
         if append_to_reader:
@@ -476,7 +475,7 @@ class IfGame(IfBlock):
         self.action = IfGameType(action)
         self.args = args
 
-        self.codeblocks = deque(codeblocks) if codeblocks else deque()
+        self.codeblocks = BlockDeque(codeblocks or ())
         self.invert = invert
 
         if append_to_reader:
@@ -1133,7 +1132,7 @@ class IfVariable(IfBlock):
         self.action = IfVariableType(action)
         self.args = args
 
-        self.codeblocks = deque(codeblocks) if codeblocks else deque()
+        self.codeblocks = BlockDeque(codeblocks or ())
         self.invert = invert
 
         if append_to_reader:
@@ -1229,7 +1228,7 @@ class Else(BracketedBlock):
         if append_to_reader:
             self._append_codeblock()
 
-        self.codeblocks: typing.Deque[Block] = deque(codeblocks or [])
+        self.codeblocks: BlockDeque = BlockDeque(codeblocks or ())
 
     def __enter__(self) -> "Else":
         """
@@ -1259,6 +1258,7 @@ class Else(BracketedBlock):
             ``None``
         """
         self.codeblocks.append(Bracket(BracketDirection.CLOSE, BracketType.NORM))
+        DFReader().close_code_loc()
 
     def _append_codeblock(self):
         """Checks if there is an If before this Else in order to allow its placement."""
@@ -1,8 +1,7 @@
 import typing
-from collections import deque
 
 from ..classes import UtilityBlock, JSONData, Arguments, Block, Bracket, BracketedBlock, DFLocation, Tag, DFNumber, \
-    ItemCollection, DFVariable
+    ItemCollection, DFVariable, BlockDeque
 from ..enums import BlockType, IfPlayerType, IfType, BracketDirection, BracketType, IfEntityType, \
     RepeatType, SetVarType, SelectObjectType, RAdjacentPattern
 from ..reading.reader import DFReader
@@ -126,7 +125,7 @@ class Repeat(BracketedBlock, UtilityBlock, JSONData):
         if append_to_reader:
             DFReader().append_codeblock(self)
 
-        self.codeblocks = deque(codeblocks or [])
+        self.codeblocks = BlockDeque(codeblocks or ())
 
         self.sub_action = sub_action if self.action == RepeatType.WHILE_COND else None
 
@@ -19,4 +19,16 @@ MAX_YAW_DEGREES = 180
 DEFAULT_SOUND_PITCH = 1.0
 DEFAULT_SOUND_VOL = 2
 
+BASIC_PLOT_SIZE = 51  # plot widths, in blocks (see PlotSizes)
+LARGE_PLOT_SIZE = 101
+MASSIVE_PLOT_SIZE = 301
+
 SNBT_EXPORT_VERSION = 1
+
+# The format of the cached lines of TemplateCache: part of each entry's key, so it must be increased whenever the JSON,
+# the encoding (e.g. gzip) or the splitting of the lines changes, making the entries written before stale.
+CACHE_FORMAT_VERSION = 1
+
+MIN_COMPRESSION_LEVEL = 0  # no compression
+MAX_COMPRESSION_LEVEL = 9
+DEFAULT_COMPRESSION_LEVEL = MAX_COMPRESSION_LEVEL  # (gzip's default)
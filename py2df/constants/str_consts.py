@@ -15,3 +15,5 @@ BRACKET_ID = "bracket"
 DEFAULT_AUTHOR = "Unknown"
 
 SECTION_SIGN = "\N{SECTION SIGN}"
+
+PY2DF_VERSION = "0.0.1"  # (the only copy of the version: also read by setup.py)
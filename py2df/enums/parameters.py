@@ -3,6 +3,7 @@ Enums for parameters and attributes in classes.
 """
 from enum import auto, unique, Enum
 from .enum_util import AutoLowerNameEnum
+from ..constants import BASIC_PLOT_SIZE, LARGE_PLOT_SIZE, MASSIVE_PLOT_SIZE
 
 
 @unique
@@ -50,6 +51,6 @@ class BracketDirection(AutoLowerNameEnum):
 @unique
 class PlotSizes(Enum):
     """An :class:`Enum` that relates each plot size to its respective width, in blocks. E.g.: Basic Plot is 51x51."""
-    BASIC_PLOT = 51
-    LARGE_PLOT = 101
-    MASSIVE_PLOT = 301
+    BASIC_PLOT = BASIC_PLOT_SIZE
+    LARGE_PLOT = LARGE_PLOT_SIZE
+    MASSIVE_PLOT = MASSIVE_PLOT_SIZE
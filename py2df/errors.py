@@ -13,6 +13,10 @@ Exception Hierarchy
 
             - :exc:`Py2DfCodeblockError`
                 - :exc:`DFSyntaxError`
+                - :exc:`LineTooLongError`
+
+            - :exc:`CompileServerError`
+            - :exc:`DecompileError`
 """
 
 
@@ -40,3 +44,19 @@ class DFSyntaxError(Py2DfCodeblockError):
     """Any error related to DiamondFire block syntax."""
     pass
 
+
+class LineTooLongError(Py2DfCodeblockError):
+    """Indicates that a code line does not fit in the plot (and could not be split, if auto splitting is enabled)."""
+    pass
+
+
+class CompileServerError(Py2DfError):
+    """Indicates that a compile server (see :class:`~py2df.reading.server.CompileServer`) rejected a request, or could
+    not be reached."""
+    pass
+
+
+class DecompileError(Py2DfError):
+    """Indicates that a code template could not be decompiled (see :mod:`~py2df.reading.decompiler`): it is malformed,
+    or has a block or item that no decoder is registered for."""
+    pass
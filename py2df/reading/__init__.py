@@ -1,6 +1,17 @@
 """
 All classes and functions related to reading stay here.
 """
+from .serializer import *
+from .pipeline import *
+from .fingerprint import *
+from .cache import *
+from .stats import *
+from .splitter import *
 from .reader import *
 from .event_decorators import *
 from .callable_decorators import *
+from .batch import *
+from .watcher import *
+from .server import *
+from .decompiler import *
+from .catalog import *
@@ -0,0 +1,211 @@
+"""
+Batch compilation of many plot modules, using a pool of worker processes.
+"""
+import functools
+import importlib
+import sys
+import time
+import traceback
+import typing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+from .reader import DFReader
+from .cache import TemplateCache
+from ..classes import FunctionHolder
+from ..enums import PlotSizes
+from ..constants import DEFAULT_AUTHOR, DEFAULT_COMPRESSION_LEVEL
+from ..client import CompileResult, CompileTarget, _target_name
+
+__all__ = ("CompileResult", "compile_module", "compile_modules")
+
+def _load_target(target: str, reload: bool = False) -> typing.Optional[typing.List[FunctionHolder]]:
+    """Imports the module of a compilation target, in the current compilation session.
+
+    Parameters
+    ----------
+    target : :class:`str`
+        The target, in the form ``"module"`` or ``"module:attribute"``.
+
+    reload : :class:`bool`, optional
+        Whether or not to reload the module if it was already imported, even if an attribute was specified (e.g.
+        because its file changed). Modules of targets without an attribute are always reloaded. Defaults to ``False``.
+
+    Returns
+    -------
+    Optional[List[:class:`~.FunctionHolder`]]
+        The function holders of the given attribute (a function holder or an iterable of them), or ``None`` if no
+        attribute was specified (i.e., every function holder registered while importing the module is used).
+    """
+    module_name, _, attr = target.partition(":")
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+    elif reload or not attr:
+        module = importlib.reload(module)  # already imported (e.g. reused worker): run its decorators again
+
+    if not attr:
+        return None
+
+    holders = functools.reduce(getattr, attr.split("."), module)
+    if isinstance(holders, FunctionHolder):
+        return [holders]
+
+    return list(holders)
+
+
+def compile_module(
+    target: CompileTarget, *, plot_size: PlotSizes = PlotSizes.BASIC_PLOT, auto_split: bool = False,
+    author: str = DEFAULT_AUTHOR, cache: typing.Optional[TemplateCache] = None, compact_json: bool = False,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL, raise_errors: bool = True
+) -> CompileResult:
+    """Compiles a single plot module, in its own compilation session (see :meth:`~.DFReader.session`).
+
+    Parameters
+    ----------
+    target : Union[:class:`str`, :class:`~types.ModuleType`]
+        The module to compile (or its name). It may also be a string in the form ``"module:attribute"``, where
+        ``attribute`` is a :class:`~.FunctionHolder` (or an iterable of them) of that module, in order to compile only
+        that group of function holders.
+
+    plot_size : :class:`~py2df.enums.parameters.PlotSizes`, optional
+        Size of the plot this code is being developed for. Default is
+        :attr:`~py2df.enums.parameters.PlotSizes.BASIC_PLOT` .
+
+    auto_split : :class:`bool`, optional
+        Whether or not to automatically split long code lines into multiple Functions. Defaults to ``False`` .
+
+    author : :class:`str`, optional
+        The author of this code, to be inserted in the NBT. Defaults to ``"Unknown"``.
+
+    cache : Optional[:class:`~py2df.reading.cache.TemplateCache`], optional
+        An on-disk cache of serialized lines, whose unchanged function holders are not read again (see
+        :attr:`DFReader.cache`). Defaults to ``None`` (no cache).
+
+    compact_json : :class:`bool`, optional
+        Whether or not to write the JSON of each line with compact separators. Defaults to ``False`` .
+
+    compression_level : :class:`int`, optional
+        The gzip compression level, from 0 (no compression) to 9 (maximum compression). Defaults to ``9`` .
+
+    raise_errors : :class:`bool`, optional
+        If ``True``, exceptions raised while compiling propagate; otherwise, they are stored in
+        :attr:`CompileResult.error`. Defaults to ``True``.
+
+    Returns
+    -------
+    :class:`CompileResult`
+        The outputs and timings of the compilation.
+
+    Warnings
+    --------
+    If the module was already imported in this process, it is reloaded (so that its decorators run again in the new
+    session), unless a group of function holders was specified.
+    """
+    target = _target_name(target)
+    timings: typing.Dict[str, float] = dict()
+    start = last = time.perf_counter()
+
+    def lap(phase: str) -> None:
+        nonlocal last
+        now = time.perf_counter()
+        timings[phase] = now - last
+        last = now
+
+    try:
+        with DFReader.session(
+            plot_size, auto_split, author, cache=cache, compact_json=compact_json, compression_level=compression_level
+        ) as reader:
+            holders = _load_target(target)
+            if holders is not None:
+                reader.functions = holders
+            lap("import")
+
+            reader.read()
+            lap("read")
+
+            json_strs = reader.output_json(read=False)
+            lap("json")
+
+            encoded_strs = reader.output_encoded_str(read=False)
+            lap("encode")
+
+            snbt = reader.output_snbt(read=False)
+            lap("snbt")
+
+    except Exception:
+        if raise_errors:
+            raise
+
+        timings["total"] = time.perf_counter() - start
+        return CompileResult(target, timings=timings, error=traceback.format_exc())
+
+    timings["total"] = time.perf_counter() - start
+    return CompileResult(target, json_strs, encoded_strs, snbt, timings)
+
+
+def compile_modules(
+    targets: typing.Iterable[CompileTarget], *, max_workers: typing.Optional[int] = None,
+    executor: typing.Optional[Executor] = None, plot_size: PlotSizes = PlotSizes.BASIC_PLOT,
+    auto_split: bool = False, author: str = DEFAULT_AUTHOR, cache: typing.Optional[TemplateCache] = None,
+    compact_json: bool = False, compression_level: int = DEFAULT_COMPRESSION_LEVEL, raise_errors: bool = True
+) -> typing.List[CompileResult]:
+    """Compiles many plot modules in parallel, each in a worker process. Example usage::
+
+        if __name__ == '__main__':
+            for result in compile_modules(["plots.lobby", "plots.arena", "plots.shop:shop_functions"]):
+                print(result.target, result.timings["total"])
+
+    Parameters
+    ----------
+    targets : Iterable[Union[:class:`str`, :class:`~types.ModuleType`]]
+        The modules to compile (see :func:`compile_module` for the accepted formats). Note that module objects are
+        sent to the workers by name, so they are imported again there.
+
+    max_workers : Optional[:class:`int`], optional
+        The maximum amount of worker processes. Defaults to ``None`` (the amount of CPUs).
+
+    executor : Optional[:class:`~concurrent.futures.Executor`], optional
+        An executor to run the compilations in, instead of creating a new
+        :class:`~concurrent.futures.ProcessPoolExecutor`. If given, ``max_workers`` is ignored. Defaults to ``None``.
+
+    plot_size : :class:`~py2df.enums.parameters.PlotSizes`, optional
+        Size of the plot this code is being developed for. Default is
+        :attr:`~py2df.enums.parameters.PlotSizes.BASIC_PLOT` .
+
+    auto_split : :class:`bool`, optional
+        Whether or not to automatically split long code lines into multiple Functions. Defaults to ``False`` .
+
+    author : :class:`str`, optional
+        The author of this code, to be inserted in the NBT. Defaults to ``"Unknown"``.
+
+    cache : Optional[:class:`~py2df.reading.cache.TemplateCache`], optional
+        An on-disk cache of serialized lines, shared by every worker (it is safe for concurrent use). Defaults to
+        ``None`` (no cache).
+
+    compact_json : :class:`bool`, optional
+        Whether or not to write the JSON of each line with compact separators. Defaults to ``False`` .
+
+    compression_level : :class:`int`, optional
+        The gzip compression level, from 0 (no compression) to 9 (maximum compression). Defaults to ``9`` .
+
+    raise_errors : :class:`bool`, optional
+        If ``True``, the first exception raised by a compilation propagates; otherwise, it is stored in the
+        respective :attr:`CompileResult.error`. Defaults to ``True``.
+
+    Returns
+    -------
+    List[:class:`CompileResult`]
+        The results, in the same order as the given targets.
+    """
+    names = [_target_name(target) for target in targets]
+    worker = functools.partial(
+        compile_module, plot_size=plot_size, auto_split=auto_split, author=author, cache=cache,
+        compact_json=compact_json, compression_level=compression_level, raise_errors=raise_errors
+    )
+
+    if executor is not None:
+        return list(executor.map(worker, names))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(worker, names))
+
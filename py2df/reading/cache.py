@@ -0,0 +1,282 @@
+"""
+Persistent (on-disk) cache of the serialized code lines of function holders.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import typing
+
+from .pipeline import LineOutput
+from ..constants import PY2DF_VERSION, CACHE_FORMAT_VERSION
+from ..utils import remove_u200b_from_doc
+
+__all__ = ("TemplateCache",)
+
+DEFAULT_CACHE_MAX_SIZE = 64 * 1024 * 1024  # 64 MiB
+CACHE_ENTRY_SUFFIX = ".json"
+
+
+def default_cache_dir() -> str:
+    """Obtains the default cache directory: ``$PY2DF_CACHE_DIR`` if set, or ``py2df`` inside the user's cache
+    directory (``$XDG_CACHE_HOME``, defaulting to ``~/.cache``)."""
+    path = os.environ.get("PY2DF_CACHE_DIR")
+    if path:
+        return path
+
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "py2df")
+
+
+class TemplateCache:
+    """A directory holding the serialized code lines (JSON and base64 of the gzipped JSON) of function holders, so that
+    unchanged function holders do not have to be read nor serialized again, even by a new process. Give it to a
+    :class:`~.DFReader` in order to use it::
+
+        DFReader(PlotSizes.LARGE_PLOT, cache=TemplateCache())
+
+    Each entry is keyed by the function holder's fingerprint (see :func:`~py2df.reading.fingerprint.fingerprint_holder`)
+    together with the py2df version, the format of the cached lines and the reader's settings (see
+    :meth:`TemplateCache.key`). Entries are written atomically (to a temporary file, which then replaces the entry), so
+    many processes may share the same cache.
+    When the cache grows past its maximum size, the least recently used entries are removed.
+
+    Parameters
+    ----------\u200b
+    path : Optional[:class:`str`], optional
+        The cache directory (created if needed). Defaults to ``None`` (``$PY2DF_CACHE_DIR``, or ``py2df`` inside
+        the user's cache directory).
+
+    max_size : :class:`int`, optional
+        The maximum size of the cache, in bytes. Defaults to 64 MiB.
+
+    Attributes
+    ----------\u200b
+    path : :class:`str`
+        The cache directory.
+
+    max_size : :class:`int`
+        The maximum size of the cache, in bytes.
+    """
+    __slots__ = ("path", "max_size", "_size")
+
+    path: str
+    max_size: int
+    _size: typing.Optional[int]  #: Estimated size of the cache, in bytes (None if not computed yet).
+
+    def __init__(self, path: typing.Optional[str] = None, max_size: int = DEFAULT_CACHE_MAX_SIZE):
+        self.path = os.path.abspath(path or default_cache_dir())
+        self.max_size = int(max_size)
+        self._size = None
+
+    def __getstate__(self):  # (sent to worker processes by path)
+        return self.path, self.max_size
+
+    def __setstate__(self, state):
+        self.path, self.max_size = state
+        self._size = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} path={repr(self.path)} max_size={self.max_size}>"
+
+    @staticmethod
+    def key(fingerprint: str, **settings: typing.Any) -> str:
+        """Builds the key of a cache entry.
+
+        Parameters
+        ----------
+        fingerprint : :class:`str`
+            The function holder's fingerprint (see :func:`~py2df.reading.fingerprint.fingerprint_holder`).
+
+        settings : Any
+            The reader settings that affect the output (e.g. ``plot_size``, ``auto_split``, ``author``). Must be
+            JSON serializable (enums are converted to their values).
+
+        Returns
+        -------
+        :class:`str`
+            The key, as a hex string.
+        """
+        return hashlib.sha256(json.dumps(
+            [PY2DF_VERSION, CACHE_FORMAT_VERSION, fingerprint, settings], sort_keys=True,
+            default=lambda o: getattr(o, "value", repr(o))
+        ).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        """Obtains the file path of the entry with the given key."""
+        return os.path.join(self.path, key[:2], key + CACHE_ENTRY_SUFFIX)
+
+    def get(self, key: str) -> typing.Optional[typing.List[LineOutput]]:
+        """Obtains the code lines cached under the given key, marking the entry as recently used.
+
+        Parameters
+        ----------
+        key : :class:`str`
+            The key (see :meth:`TemplateCache.key`).
+
+        Returns
+        -------
+        Optional[List[:class:`~py2df.reading.pipeline.LineOutput`]]
+            The (released) outputs of each cached line, or ``None`` if there is no valid entry with that key.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as file:
+                entry = json.load(file)
+
+            if entry["format"] != CACHE_FORMAT_VERSION:
+                return None
+
+            outputs = [
+                LineOutput.from_serialized(line["name"], line["json"], line["encoded"]) for line in entry["lines"]
+            ]
+        except (OSError, ValueError, KeyError, TypeError):  # missing, evicted meanwhile or corrupted
+            return None
+
+        try:
+            os.utime(entry_path)  # most recently used
+        except OSError:
+            pass
+
+        return outputs
+
+    def put(self, key: str, outputs: typing.Iterable[LineOutput]) -> None:
+        """Stores code lines under the given key (replacing any previous entry), then evicts the least recently used
+        entries if the cache became too large.
+
+        Parameters
+        ----------
+        key : :class:`str`
+            The key (see :meth:`TemplateCache.key`).
+
+        outputs : Iterable[:class:`~py2df.reading.pipeline.LineOutput`]
+            The outputs of each line (their JSON and base64 are computed if they were not yet).
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        data = json.dumps(dict(
+            version=PY2DF_VERSION, format=CACHE_FORMAT_VERSION,
+            lines=[dict(name=output.name, json=output.json, encoded=output.encoded_str) for output in outputs]
+        )).encode("utf-8")
+
+        entry_path = self._entry_path(key)
+        entry_dir = os.path.dirname(entry_path)
+        os.makedirs(entry_dir, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=entry_dir, prefix=".tmp-", suffix=CACHE_ENTRY_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+
+            try:
+                replaced_size = os.stat(entry_path).st_size  # (an entry replaced does not add to the size)
+            except FileNotFoundError:
+                replaced_size = 0
+
+            os.replace(temp_path, entry_path)  # atomic: readers see either the old or the new entry
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+            raise
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(data) - replaced_size
+
+        if self._size > self.max_size:
+            self.evict()
+
+    def _iter_entries(self) -> typing.Iterator[os.DirEntry]:
+        """Iterates over the entry files of the cache."""
+        try:
+            subdirs = list(os.scandir(self.path))
+        except FileNotFoundError:
+            return
+
+        for subdir in subdirs:
+            if not subdir.is_dir():
+                continue
+
+            try:
+                yield from (
+                    entry for entry in os.scandir(subdir.path)
+                    if entry.name.endswith(CACHE_ENTRY_SUFFIX) and not entry.name.startswith(".")
+                )
+            except FileNotFoundError:
+                continue
+
+    def size(self) -> int:
+        """Computes the total size of the cache entries, in bytes.
+
+        Returns
+        -------
+        :class:`int`
+            The size.
+        """
+        total = 0
+        for entry in self._iter_entries():
+            try:
+                total += entry.stat().st_size
+            except FileNotFoundError:  # removed by another process
+                pass
+
+        return total
+
+    def evict(self, max_size: typing.Optional[int] = None) -> None:
+        """Removes the least recently used entries until the cache is at most 3/4 of the given size.
+
+        Parameters
+        ----------
+        max_size : Optional[:class:`int`], optional
+            The size to fit the cache into, in bytes. Defaults to ``None`` (:attr:`max_size`).
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        max_size = self.max_size if max_size is None else int(max_size)
+        entries = []
+        for entry in self._iter_entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        target = max_size * 3 // 4  # leave some room, so that evicting is not needed on every write
+        if total > max_size:
+            entries.sort()  # oldest first
+            for _, size, path in entries:
+                if total <= target:
+                    break
+
+                try:
+                    os.remove(path)
+                except FileNotFoundError:  # evicted by another process
+                    pass
+
+                total -= size
+
+        self._size = total
+
+    def clear(self) -> None:
+        """Removes every entry of the cache.
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        self.evict(0)
+
+
+remove_u200b_from_doc(TemplateCache)
@@ -0,0 +1,274 @@
+"""
+Catalogs of pre-made items, stored as SNBT (one item per line), which are only read as they are used.
+"""
+import collections
+import collections.abc
+import json
+import mmap
+import os
+import tempfile
+import threading
+import typing
+
+from ..classes import Item
+from ..utils import remove_u200b_from_doc
+
+__all__ = ("ItemCatalog",)
+
+DEFAULT_CATALOG_MAX_ITEMS = 1024
+CATALOG_INDEX_SUFFIX = ".idx"
+CATALOG_INDEX_VERSION = 1
+
+
+class ItemCatalog(collections.abc.Mapping):
+    """A file of pre-made items, read on demand: the file is memory-mapped, and each item is only parsed (with
+    :meth:`Item.from_snbt <py2df.classes.mc_types.Item.from_snbt>`) when it is looked up, so that compiling code which
+    uses a few items of a large catalog does not read all of them. Example usage::
+
+        catalog = ItemCatalog("items.snbt")
+        sword = catalog["sword_of_doom"]  # only this line of the file is parsed
+
+    Each line of the file is an item's SNBT, optionally preceded by its key (``sword_of_doom {id: ...}``); items
+    without a key are keyed by their position among the file's items (``"0"``, ``"1"``, ...). Blank lines and lines
+    starting with ``#`` are ignored.
+
+    On first use, the offset of each item in the file is indexed; the index is saved next to the file (with the
+    ``.idx`` suffix), so that later processes do not have to scan the file again, and rebuilt whenever the file
+    changes. The most recently looked up items are kept, up to ``max_items``; looking them up again returns the same
+    :class:`~py2df.classes.mc_types.Item` (so :meth:`~py2df.classes.mc_types.Item.copy` it before modifying it).
+
+    Parameters
+    ----------\u200b
+    path : :class:`str`
+        The path to the catalog file.
+
+    max_items : :class:`int`, optional
+        The maximum amount of parsed items to keep. Defaults to 1024.
+
+    Attributes
+    ----------\u200b
+    path : :class:`str`
+        The path to the catalog file.
+
+    max_items : :class:`int`
+        The maximum amount of parsed items to keep.
+
+    Raises
+    ------
+    :exc:`ValueError`
+        (When first used.) If the file has two items with the same key.
+
+    Notes
+    -----
+    Catalogs can be sent to other processes, where they are opened again (by path).
+    """
+    __slots__ = ("path", "max_items", "_file", "_map", "_index", "_items", "_lock")
+
+    path: str
+    max_items: int
+    _file: typing.Optional[typing.BinaryIO]
+    _map: typing.Optional[mmap.mmap]  #: The memory-mapped file (None if not opened yet, or if the file is empty).
+    _index: typing.Optional[typing.Dict[str, typing.Tuple[int, int]]]  #: key => (offset, length) of its SNBT.
+    _items: "collections.OrderedDict[str, Item]"  #: Parsed items, least recently used first.
+    _lock: threading.Lock
+
+    def __init__(self, path: str, max_items: int = DEFAULT_CATALOG_MAX_ITEMS):
+        self.path = os.path.abspath(path)
+        self.max_items = int(max_items)
+        self._file = None
+        self._map = None
+        self._index = None
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):  # (sent to worker processes by path)
+        return self.path, self.max_items
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} path={repr(self.path)} max_items={self.max_items}>"
+
+    def __enter__(self) -> "ItemCatalog":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def index_path(self) -> str:
+        """The path of the file where the index of the catalog is saved.
+
+        Returns
+        -------
+        :class:`str`
+            The catalog's path, with the ``.idx`` suffix added.
+        """
+        return self.path + CATALOG_INDEX_SUFFIX
+
+    def _open(self) -> typing.Dict[str, typing.Tuple[int, int]]:
+        """Memory-maps the file and loads (or builds) its index, if not done yet. Returns the index."""
+        if self._index is not None:
+            return self._index
+
+        file = open(self.path, "rb")
+        try:
+            stat = os.fstat(file.fileno())
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else None
+            index = self._load_index(stat)
+            if index is None:
+                index = self._build_index()
+                self._save_index(stat, index)
+        except BaseException:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+            file.close()
+            raise
+
+        self._file = file
+        self._index = index
+        return index
+
+    def close(self) -> None:
+        """Closes the file, and forgets the parsed items. (It is opened again if used after this.)
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+
+            if self._file is not None:
+                self._file.close()
+
+            self._file = self._map = self._index = None
+            self._items.clear()
+
+    def _build_index(self) -> typing.Dict[str, typing.Tuple[int, int]]:
+        """Scans the file for the offset and length of the SNBT of each item."""
+        index = dict()
+        data = self._map
+        size = len(data) if data is not None else 0
+        start = 0
+        line_num = 0
+        while start < size:
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = size
+
+            line_num += 1
+            line = data[start:end]
+            stripped = line.strip()
+            if stripped and not stripped.startswith(b"#"):
+                brace = line.find(b"{")
+                if brace == -1:
+                    raise ValueError(f"Line {line_num} of item catalog {self.path!r} is not an item's SNBT.")
+
+                key = line[:brace].strip().decode("utf-8") or str(len(index))
+                if key in index:
+                    raise ValueError(f"Duplicate key {key!r} (line {line_num}) in item catalog {self.path!r}.")
+
+                index[key] = (start + brace, len(line.rstrip()) - brace)
+
+            start = end + 1
+
+        return index
+
+    def _load_index(self, stat: os.stat_result) -> typing.Optional[typing.Dict[str, typing.Tuple[int, int]]]:
+        """Loads the saved index, if it is valid for the file as it currently is."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                saved = json.load(file)
+
+            if saved["version"] != CATALOG_INDEX_VERSION or saved["size"] != stat.st_size \
+                    or saved["mtime"] != stat.st_mtime_ns:
+                return None  # (the catalog changed since)
+
+            return {key: (offset, length) for key, offset, length in zip(
+                saved["keys"], saved["offsets"], saved["lengths"]
+            )}
+        except (OSError, ValueError, KeyError, TypeError):  # missing or corrupted
+            return None
+
+    def _save_index(self, stat: os.stat_result, index: typing.Dict[str, typing.Tuple[int, int]]) -> None:
+        """Saves the index next to the file (atomically). Does nothing if it can't be written there."""
+        data = json.dumps(dict(
+            version=CATALOG_INDEX_VERSION, size=stat.st_size, mtime=stat.st_mtime_ns, keys=list(index),
+            offsets=[offset for offset, _ in index.values()], lengths=[length for _, length in index.values()]
+        )).encode("utf-8")
+
+        try:
+            fd, temp_path = tempfile.mkstemp(
+                dir=os.path.dirname(self.path), prefix=".tmp-", suffix=CATALOG_INDEX_SUFFIX
+            )
+        except OSError:  # e.g. read-only directory: the index is rebuilt next time
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def snbt(self, key: str) -> str:
+        """Obtains the SNBT of an item, without parsing it.
+
+        Parameters
+        ----------
+        key : :class:`str`
+            The item's key.
+
+        Returns
+        -------
+        :class:`str`
+            The item's SNBT.
+
+        Raises
+        ------
+        :exc:`KeyError`
+            If there is no item with that key.
+        """
+        with self._lock:
+            offset, length = self._open()[key]
+            return self._map[offset:offset + length].decode("utf-8")
+
+    def __getitem__(self, key: str) -> Item:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                return item
+
+        item = Item.from_snbt(self.snbt(key))
+        with self._lock:
+            self._items[key] = item
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+        return item
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._open()
+
+    def __iter__(self) -> typing.Iterator[str]:
+        with self._lock:
+            return iter(list(self._open()))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._open())
+
+
+remove_u200b_from_doc(ItemCatalog)
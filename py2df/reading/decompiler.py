@@ -0,0 +1,469 @@
+"""
+Decompilation of code templates (the base64 code of a line, the SNBT of its Paste item, or its JSON) back into
+codeblock trees, in the same form the reader holds code lines: bracketed blocks (Ifs, Repeats...) contain their brackets
+and inner blocks in their :attr:`~py2df.classes.abc.BracketedBlock.codeblocks`.
+
+Blocks are built by decoders registered per ``block`` (and, optionally, ``action``) field, and arguments by decoders
+registered per item ``id``; see :func:`register_block_decoder` and :func:`register_item_decoder`.
+"""
+import base64
+import binascii
+import functools
+import gzip
+import json
+import os
+import traceback
+import typing
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import nbtlib as nbt
+
+from .. import constants
+from ..classes import Arguments, Block, BlockDeque, Bracket, BracketedBlock, JSONData, Item, Tag, DFText, DFNumber, \
+    DFLocation, DFSound, DFParticle, DFPotion, DFGameValue, DFVariable
+from ..enums import BlockType, BracketDirection, BracketType, IfPlayerType, IfEntityType, IfGameType, IfVariableType
+from ..errors import DecompileError
+from ..utils import remove_u200b_from_doc
+
+__all__ = (
+    "DecompiledTemplate", "decompile_line", "decompile_template", "decompile_templates", "register_block_decoder",
+    "register_item_decoder"
+)
+
+BlockDecoder = typing.Callable[[dict], Block]  #: Builds a codeblock from its JSON dict.
+ItemDecoder = typing.Callable[[dict], JSONData]  #: Builds an argument (item, variable, tag...) from its JSON dict.
+
+_TEMPLATE_DATA_KEY = "hypercube:codetemplatedata"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+#: (block, action) -> decoder; (block, None) is the decoder of every action of that block without its own decoder.
+_block_decoders: typing.Dict[typing.Tuple[str, typing.Optional[str]], BlockDecoder] = dict()
+_defaults_loaded = False  # (the default block decoders need the codeblocks, which are loaded on first use)
+
+
+def _decode_tag(data: dict) -> Tag:
+    """Decodes a block tag. Its option is kept as a string (as are the options of tags in code lines)."""
+    tag_data = data["data"]
+    return Tag(tag_data["tag"], tag_data["option"], tag_data["action"], BlockType(tag_data["block"]))
+
+
+_item_decoders: typing.Dict[str, ItemDecoder] = {  #: item id -> decoder.
+    constants.ITEM_ID_TEXT_VAR: DFText.from_json_data,
+    constants.ITEM_ID_NUMBER_VAR: DFNumber.from_json_data,
+    constants.ITEM_ID_LOCATION: DFLocation.from_json_data,
+    constants.ITEM_ID_ITEM: Item.from_json_data,
+    constants.ITEM_ID_SOUND: DFSound.from_json_data,
+    constants.ITEM_ID_PARTICLE: DFParticle.from_json_data,
+    constants.ITEM_ID_POTION: DFPotion.from_json_data,
+    constants.ITEM_ID_GAME_VALUE: DFGameValue.from_json_data,
+    constants.ITEM_ID_DYNAMIC_VAR: DFVariable.from_json_data,
+    constants.ITEM_ID_TAG: _decode_tag,
+}
+
+
+class DecompiledTemplate:
+    """The result of decompiling a code template with :func:`decompile_template` or :func:`decompile_templates`.
+
+    Attributes
+    ----------\u200b
+    blocks : :class:`~py2df.classes.abc.BlockDeque`
+        The code line: its top-level blocks, where each bracketed block holds its brackets and inner blocks.
+
+    name : Optional[:class:`str`]
+        The name of the template, if it was given as a Paste item or its template data (otherwise ``None``).
+
+    author : Optional[:class:`str`]
+        The author of the template, if it was given as a Paste item or its template data (otherwise ``None``).
+
+    error : Optional[:class:`str`]
+        The formatted traceback of the exception raised while decompiling, if any (only when the errors are not
+        raised). In that case, :attr:`blocks` is empty.
+    """
+    __slots__ = ("blocks", "name", "author", "error")
+
+    blocks: BlockDeque
+    name: typing.Optional[str]
+    author: typing.Optional[str]
+    error: typing.Optional[str]
+
+    def __init__(
+        self, blocks: typing.Optional[typing.Iterable[Block]] = None, name: typing.Optional[str] = None,
+        author: typing.Optional[str] = None, error: typing.Optional[str] = None
+    ):
+        self.blocks = blocks if isinstance(blocks, BlockDeque) else BlockDeque(blocks or ())
+        self.name = name
+        self.author = author
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether or not the decompilation succeeded."""
+        return self.error is None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} name={repr(self.name)} blocks={len(self.blocks)}\
+{' error' if self.error else ''}>"
+
+
+def register_block_decoder(
+    block: typing.Union[str, BlockType], action: typing.Optional[str] = None
+) -> typing.Callable[[BlockDecoder], BlockDecoder]:
+    """Registers the decoder of a codeblock, replacing the previous one (if any). Decorator. Example usage::
+
+        @register_block_decoder(BlockType.PLAYER_ACTION, "SendMessage")
+        def decode_send_message(data: dict) -> Block:
+            ...  # (build the codeblock from its JSON dict)
+
+    Parameters
+    ----------
+    block : Union[:class:`str`, :class:`~py2df.enums.parameters.BlockType`]
+        The ``block`` field of the codeblocks to decode.
+
+    action : Optional[:class:`str`], optional
+        The ``action`` field of the codeblocks to decode, or ``None`` to decode every action of that block that has
+        no decoder of its own. Defaults to ``None``.
+
+    Returns
+    -------
+    Callable[[Callable[[:class:`dict`], :class:`~py2df.classes.abc.Block`]], Callable[[:class:`dict`], \
+:class:`~py2df.classes.abc.Block`]]
+        The decorator, which registers the decoder (a function that receives the block's JSON dict and returns the
+        block) and returns it unchanged.
+
+    Notes
+    -----
+    Bracketed blocks do not need to handle their inner blocks: these are appended to the returned block's
+    :attr:`~py2df.classes.abc.BracketedBlock.codeblocks` afterwards.
+    """
+    key = (getattr(block, "value", str(block)), None if action is None else str(action))
+
+    def decorator(decoder: BlockDecoder) -> BlockDecoder:
+        _block_decoders[key] = decoder
+        return decoder
+
+    return decorator
+
+
+def register_item_decoder(item_id: str) -> typing.Callable[[ItemDecoder], ItemDecoder]:
+    """Registers the decoder of an argument (item, variable, tag...) with a certain ``id`` field, replacing the
+    previous one (if any). Decorator.
+
+    Parameters
+    ----------
+    item_id : :class:`str`
+        The ``id`` field of the arguments to decode (e.g. ``"txt"``).
+
+    Returns
+    -------
+    Callable[[Callable[[:class:`dict`], :class:`~py2df.classes.abc.JSONData`]], Callable[[:class:`dict`], \
+:class:`~py2df.classes.abc.JSONData`]]
+        The decorator, which registers the decoder (a function that receives the argument's JSON dict, with its ``id``
+        and ``data``, and returns the argument) and returns it unchanged.
+    """
+    def decorator(decoder: ItemDecoder) -> ItemDecoder:
+        _item_decoders[str(item_id)] = decoder
+        return decoder
+
+    return decorator
+
+
+def _decode_args(data: dict) -> Arguments:
+    """Decodes the arguments of a codeblock, keeping each item in its slot."""
+    items: typing.List[typing.Optional[JSONData]] = [None] * constants.DEFAULT_ITEM_COLLECTION_MAX_LEN
+    for entry in (data.get("args") or dict()).get("items") or ():
+        item = entry["item"]
+        try:
+            decoder = _item_decoders[item["id"]]
+        except KeyError:
+            raise DecompileError(f"There is no decoder for arguments with id {repr(item.get('id'))}.") from None
+
+        items[entry["slot"]] = decoder(item)
+
+    return Arguments(items)
+
+
+def _decode_sub_action(data: dict) -> typing.Optional[typing.Any]:
+    """Decodes the condition (sub action) of a Repeat or Select Object block, if any."""
+    sub_action = data.get("subAction", data.get("sub_action"))
+    if not sub_action:
+        return None
+
+    if sub_action[0] == "E" and sub_action[1:] in IfEntityType._value2member_map_:  # ENameEquals; EIsNear...
+        return IfEntityType(sub_action[1:])
+
+    for if_type in (IfPlayerType, IfEntityType, IfGameType, IfVariableType):
+        if sub_action in if_type._value2member_map_:
+            return if_type(sub_action)
+
+    raise DecompileError(f"Unknown condition (sub action) {repr(sub_action)}.")
+
+
+def _codeblock_decoder(
+    cls: type, action_type: type, *, target_type: typing.Optional[type] = None, sub_action: bool = False,
+    invert: bool = False
+) -> BlockDecoder:
+    """Creates the decoder of a codeblock class whose constructor takes ``(action, args[, target | sub_action])``
+    (and, if ``invert`` is ``True``, an ``invert`` keyword)."""
+    def decode(data: dict) -> Block:
+        params = [action_type(data["action"]), _decode_args(data)]
+        if target_type is not None:
+            params.append(target_type(data["target"]) if data.get("target") else None)
+        elif sub_action:
+            params.append(_decode_sub_action(data))
+
+        kwargs = dict(invert=data.get("inverted") == "NOT") if invert else dict()
+        return cls(*params, append_to_reader=False, **kwargs)
+
+    return decode
+
+
+def _callable_decoder(cls: type) -> BlockDecoder:
+    """Creates the decoder of a Function or Process, whose icon (if any) is its first item argument."""
+    def decode(data: dict) -> Block:
+        args = _decode_args(data)
+        hidden = any(
+            isinstance(item, Tag) and item.tag == "Is Hidden" and str(item.option) == "True" for item in args.items
+        )
+        icon = next((item for item in args.items if isinstance(item, Item)), None)
+        return cls(data.get("data", ""), hidden=hidden, item_icon=icon)
+
+    return decode
+
+
+def _load_default_decoders() -> None:
+    """Registers the decoders of py2df's codeblocks (except for those already registered by the user)."""
+    global _defaults_loaded
+    from ..codeblocks import PlayerAction, EntityAction, GameAction, Control, IfPlayer, IfEntity, IfGame, \
+        IfVariable, Else, Repeat, SetVar, SelectObj, CallFunction, StartProcess
+    from ..enums import PlayerActionType, EntityActionType, GameActionType, ControlType, RepeatType, SetVarType, \
+        SelectObjectType, PlayerTarget, EntityTarget
+    from .event_decorators import PlayerEvent, EntityEvent
+    from .callable_decorators import Function, Process
+
+    defaults = {
+        BlockType.PLAYER_EVENT: PlayerEvent.from_json_data,
+        BlockType.ENTITY_EVENT: EntityEvent.from_json_data,
+        BlockType.FUNCTION: _callable_decoder(Function),
+        BlockType.PROCESS: _callable_decoder(Process),
+        BlockType.PLAYER_ACTION: _codeblock_decoder(PlayerAction, PlayerActionType, target_type=PlayerTarget),
+        BlockType.ENTITY_ACTION: _codeblock_decoder(EntityAction, EntityActionType, target_type=EntityTarget),
+        BlockType.GAME_ACTION: _codeblock_decoder(GameAction, GameActionType),
+        BlockType.CONTROL: _codeblock_decoder(Control, ControlType),
+        BlockType.SET_VAR: _codeblock_decoder(SetVar, SetVarType),
+        BlockType.SELECT_OBJ: _codeblock_decoder(SelectObj, SelectObjectType, sub_action=True, invert=True),
+        BlockType.REPEAT: _codeblock_decoder(Repeat, RepeatType, sub_action=True, invert=True),
+        BlockType.IF_PLAYER: _codeblock_decoder(IfPlayer, IfPlayerType, target_type=PlayerTarget, invert=True),
+        BlockType.IF_ENTITY: _codeblock_decoder(IfEntity, IfEntityType, target_type=EntityTarget, invert=True),
+        BlockType.IF_GAME: _codeblock_decoder(IfGame, IfGameType, invert=True),
+        BlockType.IF_VAR: _codeblock_decoder(IfVariable, IfVariableType, invert=True),
+        BlockType.ELSE: lambda data: Else(),
+        BlockType.CALL_FUNC: lambda data: CallFunction(data.get("data", ""), append_to_reader=False),
+        BlockType.START_PROCESS: lambda data: StartProcess(data.get("data", ""), append_to_reader=False),
+    }
+    for block_type, decoder in defaults.items():
+        _block_decoders.setdefault((block_type.value, None), decoder)
+
+    _defaults_loaded = True
+
+
+def _decode_block(data: dict) -> Block:
+    """Decodes a codeblock, with the decoder registered for its block and action (or for its block)."""
+    if not _defaults_loaded:
+        _load_default_decoders()
+
+    block = data.get("block")
+    decoder = _block_decoders.get((block, data.get("action"))) or _block_decoders.get((block, None))
+    if decoder is None:
+        raise DecompileError(f"There is no decoder for blocks of type {repr(block)}.")
+
+    return decoder(data)
+
+
+def decompile_line(json_data: dict) -> BlockDeque:
+    """Decompiles the JSON data of a code line (a dict with a ``blocks`` list) into its blocks, nesting the blocks
+    between each pair of brackets inside the bracketed block before them.
+
+    Parameters
+    ----------
+    json_data : :class:`dict`
+        The parsed JSON of the code line.
+
+    Returns
+    -------
+    :class:`~py2df.classes.abc.BlockDeque`
+        The top-level blocks of the line.
+
+    Raises
+    ------
+    :exc:`~py2df.errors.DecompileError`
+        If the data is malformed (e.g. unmatched brackets), or has a block or argument without a decoder.
+    """
+    if not isinstance(json_data, dict) or not isinstance(json_data.get("blocks"), list):
+        raise DecompileError("Malformed code line: must be a dict with a 'blocks' list.")
+
+    line = BlockDeque()
+    levels = [line]  # the deque of each open bracketed block (innermost last)
+    for index, data in enumerate(json_data["blocks"]):
+        try:
+            if data.get("id") != constants.BRACKET_ID:
+                levels[-1].append(_decode_block(data))
+                continue
+
+            bracket = Bracket(BracketDirection(data["direct"]), BracketType(data["type"]))
+            if bracket.direction == BracketDirection.OPEN:
+                owner = levels[-1][-1] if levels[-1] else None
+                if not isinstance(owner, BracketedBlock) or owner.codeblocks:
+                    raise DecompileError("Opening bracket without a bracketed block (If, Repeat...) before it.")
+
+                owner.codeblocks.append(bracket)
+                levels.append(owner.codeblocks)
+            else:
+                if len(levels) == 1:
+                    raise DecompileError("Closing bracket without an opening bracket.")
+
+                if levels[-1][0].bracket_type != bracket.bracket_type:
+                    raise DecompileError("Closing bracket of a different type than the opening bracket.")
+
+                levels.pop().append(bracket)
+
+        except DecompileError as err:
+            raise DecompileError(f"Block {index}: {err}") from None
+
+        except (KeyError, TypeError, ValueError, AttributeError) as err:
+            raise DecompileError(f"Block {index}: malformed block ({err.__class__.__name__}: {err}).") from err
+
+    if len(levels) > 1:
+        raise DecompileError(f"{len(levels) - 1} bracket(s) were not closed.")
+
+    return line
+
+
+def _decode_code(code: str) -> dict:
+    """Decodes the base64 code of a template (gzipped JSON) into its JSON data."""
+    try:
+        raw = base64.b64decode(code.strip(), validate=True)
+        return json.loads(gzip.decompress(raw) if raw[:2] == _GZIP_MAGIC else raw)
+    except (binascii.Error, OSError, EOFError, ValueError) as err:
+        raise DecompileError(f"Malformed template code ({err.__class__.__name__}: {err}).") from err
+
+
+def _decode_template(
+    template: typing.Union[str, bytes]
+) -> typing.Tuple[dict, typing.Optional[str], typing.Optional[str]]:
+    """Decodes a template given in any of the accepted forms (see :func:`decompile_template`) into its line's JSON
+    data, name and author."""
+    if isinstance(template, bytes):
+        template = template.decode("utf-8")
+
+    template = template.strip()
+    if not template.startswith("{"):
+        return _decode_code(template), None, None
+
+    try:
+        data = json.loads(template)
+    except ValueError:  # not JSON: the SNBT of a Paste item
+        try:
+            item = nbt.parse_nbt(template)
+            data = json.loads(str(item["tag"]["PublicBukkitValues"][_TEMPLATE_DATA_KEY]))
+        except (KeyError, TypeError, ValueError) as err:
+            raise DecompileError(f"Malformed template ({err.__class__.__name__}: {err}).") from err
+
+    if "blocks" in data:  # the line's JSON itself
+        return data, None, None
+
+    if not isinstance(data.get("code"), str):
+        raise DecompileError("Malformed template data: must have a 'code' string.")
+
+    return _decode_code(data["code"]), data.get("name"), data.get("author")
+
+
+def decompile_template(template: typing.Union[str, bytes], *, raise_errors: bool = True) -> DecompiledTemplate:
+    """Decompiles a code template. Example usage::
+
+        template = decompile_template(DFReader().output_encoded_str()[0])
+        event, *blocks = template.blocks
+
+    Parameters
+    ----------
+    template : Union[:class:`str`, :class:`bytes`]
+        The template, in any of these forms: its base64 code (see :meth:`~.DFReader.output_encoded_str`); the SNBT
+        of its Paste item (see :meth:`~.DFReader.output_snbt`); its template data (the JSON with ``author``,
+        ``name``, ``version`` and ``code``, i.e. the item's ``hypercube:codetemplatedata``); or the line's JSON
+        (see :meth:`~.DFReader.output_json`).
+
+    raise_errors : :class:`bool`, optional
+        If ``True``, errors propagate; otherwise, they are stored in :attr:`DecompiledTemplate.error`. Defaults to
+        ``True``.
+
+    Returns
+    -------
+    :class:`DecompiledTemplate`
+        The line's blocks (and its name and author, if available).
+
+    Raises
+    ------
+    :exc:`~py2df.errors.DecompileError`
+        If the template is malformed, or has a block or argument without a decoder (and ``raise_errors`` is
+        ``True``).
+    """
+    try:
+        json_data, name, author = _decode_template(template)
+        return DecompiledTemplate(decompile_line(json_data), name, author)
+
+    except Exception:
+        if raise_errors:
+            raise
+
+        return DecompiledTemplate(error=traceback.format_exc())
+
+
+def decompile_templates(
+    templates: typing.Iterable[typing.Union[str, bytes]], *, max_workers: typing.Optional[int] = None,
+    executor: typing.Optional[Executor] = None, chunksize: typing.Optional[int] = None, raise_errors: bool = True
+) -> typing.List[DecompiledTemplate]:
+    """Decompiles many code templates in parallel, in worker processes (e.g. to audit or migrate existing plots).
+    Example usage::
+
+        if __name__ == '__main__':
+            results = decompile_templates(templates, raise_errors=False)
+            broken = [template for template, result in zip(templates, results) if not result.ok]
+
+    Parameters
+    ----------
+    templates : Iterable[Union[:class:`str`, :class:`bytes`]]
+        The templates (see :func:`decompile_template` for the accepted forms).
+
+    max_workers : Optional[:class:`int`], optional
+        The maximum amount of worker processes. Defaults to ``None`` (the amount of CPUs).
+
+    executor : Optional[:class:`~concurrent.futures.Executor`], optional
+        An executor to run the decompilations in, instead of creating a new
+        :class:`~concurrent.futures.ProcessPoolExecutor`. If given, ``max_workers`` is ignored. Defaults to ``None``.
+
+    chunksize : Optional[:class:`int`], optional
+        How many templates are sent to a worker process at once. Defaults to ``None`` (splits the templates in
+        about four chunks per worker).
+
+    raise_errors : :class:`bool`, optional
+        If ``True``, the first error propagates; otherwise, errors are stored in the respective
+        :attr:`DecompiledTemplate.error`. Defaults to ``True``.
+
+    Returns
+    -------
+    List[:class:`DecompiledTemplate`]
+        The results, in the same order as the given templates.
+    """
+    templates = list(templates)
+    worker = functools.partial(decompile_template, raise_errors=raise_errors)
+
+    if executor is not None:
+        return list(executor.map(worker, templates, chunksize=chunksize or 1))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        if chunksize is None:
+            chunksize = max(1, len(templates) // ((max_workers or os.cpu_count() or 1) * 4))
+
+        return list(pool.map(worker, templates, chunksize=chunksize))
+
+
+remove_u200b_from_doc(DecompiledTemplate)
@@ -70,8 +70,9 @@ class PlayerEvent(FunctionHolder, Codeblock, JSONData):
         action : :class:`~py2df.enums.events.PlayerEventType`
             The kind of Player Event this is.
 
-        func : :class:`Callable`
-            The function that contains the code that will be executed when this event is triggered.
+        func : Optional[:class:`Callable`]
+            The function that contains the code that will be executed when this event is triggered, or ``None`` if
+            there is none (e.g. an event built from JSON data; see :meth:`from_json_data`).
 
         append_to_reader : :class:`bool`
             Whether or not should already add this event as one of the :class:`DFReader` singleton's function holders.
@@ -79,7 +80,7 @@ class PlayerEvent(FunctionHolder, Codeblock, JSONData):
         """
         self.action = PlayerEventType(action)
 
-        if not callable(func):
+        if func is not None and not callable(func):  # (None: no code, e.g. a decompiled event)
             raise TypeError("'func' parameter must be a callable (preferably, a function).")
 
         self.function = func
@@ -133,7 +134,7 @@ class PlayerEvent(FunctionHolder, Codeblock, JSONData):
             # or "id" not in data  # not really required
             or "action" not in data
             or not type(data["action"]) == str
-            or not data["action"] in PlayerEventType.__members__
+            or data["action"] not in PlayerEventType._value2member_map_
         ):
             raise TypeError(
                 "Malformed PlayerEvent parsed JSON data! Must be a dict with, at least, an 'action' str value that is a"
@@ -906,8 +907,9 @@ class EntityEvent(FunctionHolder):
         action : :class:`~py2df.enums.events.EntityEventType`
             The kind of Entity Event this is.
 
-        func : :class:`Callable`
-            The function that contains the code that will be executed when this event is triggered.
+        func : Optional[:class:`Callable`]
+            The function that contains the code that will be executed when this event is triggered, or ``None`` if
+            there is none (e.g. an event built from JSON data; see :meth:`from_json_data`).
 
         append_to_reader : :class:`bool`
             Whether or not should already add, on ``__init__``, this event as one of the :class:`DFReader`
@@ -915,7 +917,7 @@ class EntityEvent(FunctionHolder):
         """
         self.action = EntityEventType(action)
 
-        if not callable(func):
+        if func is not None and not callable(func):  # (None: no code, e.g. a decompiled event)
             raise TypeError("'func' parameter must be a callable (preferably, a function).")
 
         self.function = func
@@ -969,7 +971,7 @@ class EntityEvent(FunctionHolder):
                 # or "id" not in data  # not really required
                 or "action" not in data
                 or not type(data["action"]) == str
-                or not data["action"] in EntityEventType.__members__
+                or data["action"] not in EntityEventType._value2member_map_
         ):
             raise TypeError(
                 "Malformed EntityEvent parsed JSON data! Must be a dict with, at least, an 'action' str value that is a"
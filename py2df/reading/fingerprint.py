@@ -0,0 +1,234 @@
+"""
+Fingerprinting of function holders, used to detect which code lines changed between reads.
+"""
+import functools
+import hashlib
+import os
+import sysconfig
+import types
+import typing
+
+from ..classes import FunctionHolder, JSONData
+from ..utils import dumps_json
+
+__all__ = ("fingerprint_function", "fingerprint_holder")
+
+#: Directories of the standard library and of installed packages, whose modules are assumed not to change.
+_LIBRARY_DIRS = tuple(sorted({
+    os.path.join(os.path.abspath(path), "") for path in (
+        sysconfig.get_paths().get(name) for name in ("stdlib", "platstdlib", "purelib", "platlib")
+    ) if path
+}))
+
+
+@functools.lru_cache(maxsize=4096)
+def _code_digest(code: types.CodeType) -> bytes:
+    """Digests a code object (its bytecode, constants and names, recursively), ignoring its file and line numbers,
+    such that editing other functions of the same file does not change it.
+
+    Parameters
+    ----------
+    code : :class:`~types.CodeType`
+        The code object.
+
+    Returns
+    -------
+    :class:`bytes`
+        The digest.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):  # nested function, lambda, comprehension etc.
+            hasher.update(b"c" + _code_digest(const))
+        elif isinstance(const, frozenset):  # (e.g. "x in {...}"; its order depends on the hash seed)
+            hasher.update(b"s" + repr(sorted(map(repr, const))).encode("utf-8", "backslashreplace"))
+        else:
+            hasher.update(b"k" + repr((type(const).__name__, const)).encode("utf-8", "backslashreplace"))
+
+    hasher.update(repr((code.co_names, code.co_varnames, code.co_freevars, code.co_cellvars)).encode("utf-8"))
+    return hasher.digest()
+
+
+def _code_global_names(code: types.CodeType) -> typing.Set[str]:
+    """Obtains every name that a code object (including its nested code objects) may look up in the globals."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names.update(_code_global_names(const))
+
+    return names
+
+
+def _is_library_module(module: types.ModuleType) -> bool:
+    """Whether a module is part of py2df, of the standard library or of an installed package (or is built in)."""
+    name = module.__name__
+    if name == "py2df" or name.startswith("py2df."):
+        return True
+
+    file = getattr(module, "__file__", None)
+    return not file or os.path.abspath(file).startswith(_LIBRARY_DIRS)
+
+
+def _value_repr(value: typing.Any, seen: typing.Set[int], names: typing.Collection[str] = ()) -> str:
+    """Obtains a string representing a value that is used by a function (a global or closure variable). Functions
+    are represented by their own fingerprint; JSON data (items, locations, variables...), by their JSON; modules of
+    the project (e.g. helpers), by the attributes the function may use from them.
+
+    Parameters
+    ----------
+    value : Any
+        The value.
+
+    seen : Set[:class:`int`]
+        Ids of the functions and containers already visited, in order to stop on recursion.
+
+    names : Collection[:class:`str`], optional
+        The names the function uses (see :func:`_code_global_names`), which are looked up in modules. Defaults to
+        ``()``.
+
+    Returns
+    -------
+    :class:`str`
+        The representation.
+    """
+    if isinstance(value, types.FunctionType):
+        if id(value) in seen:
+            return f"<recursive {value.__qualname__}>"
+
+        return "function:" + _function_digest(value, seen).hex()
+
+    if isinstance(value, types.ModuleType):
+        if _is_library_module(value):  # (assumed not to change)
+            return "module:" + value.__name__
+
+        if id(value) in seen:
+            return f"<recursive module {value.__name__}>"
+
+        seen.add(id(value))
+        attrs = vars(value)  # (not getattr: lazy attributes are not loaded)
+        try:
+            return f"module:{value.__name__}{{" + ", ".join(
+                f"{name}={_value_repr(attrs[name], seen, names)}" for name in sorted(names) if name in attrs
+            ) + "}"
+        finally:
+            seen.discard(id(value))  # (only stops cycles: other functions may use other attributes of it)
+
+    if isinstance(value, type):
+        return f"class:{value.__module__}.{value.__qualname__}"
+
+    if isinstance(value, (list, tuple, set, frozenset, dict)):
+        if id(value) in seen:
+            return "<recursive container>"
+
+        seen.add(id(value))
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(map(repr, value)) if isinstance(value, (set, frozenset)) else value
+        return f"{type(value).__name__}[" + ", ".join(_value_repr(v, seen) for v in items) + "]"
+
+    if isinstance(value, dict):
+        return "dict{" + ", ".join(f"{k!r}: {_value_repr(v, seen)}" for k, v in value.items()) + "}"
+
+    if isinstance(value, JSONData):
+        try:
+            return type(value).__name__ + dumps_json(value.as_json_data(), sort_keys=True, default=repr)
+        except Exception:  # incomplete data: fall back to repr
+            pass
+
+    value_type = type(value)
+    if value_type.__repr__ is object.__repr__:  # default repr has the memory address: use the object's state instead
+        if id(value) in seen:
+            return "<recursive object>"
+
+        seen.add(id(value))
+        return f"{value_type.__module__}.{value_type.__qualname__}(" + ", ".join(
+            f"{attr}={_value_repr(attr_value, seen)}" for attr, attr_value in _object_state(value)
+        ) + ")"
+
+    try:
+        value_repr = repr(value)
+    except Exception:
+        value_repr = f"<id {id(value)}>"  # can only be matched by the very same object
+
+    return f"{value_type.__module__}.{value_type.__qualname__}:{value_repr}"
+
+
+def _object_state(obj: typing.Any) -> typing.List[typing.Tuple[str, typing.Any]]:
+    """Obtains the attributes of an object (from its ``__dict__`` and its classes' ``__slots__``), sorted by name."""
+    state = dict(getattr(obj, "__dict__", None) or {})
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        for attr in ((slots,) if isinstance(slots, str) else slots):
+            if attr not in ("__dict__", "__weakref__") and hasattr(obj, attr):
+                state[attr] = getattr(obj, attr)
+
+    return sorted(state.items())
+
+
+def _function_digest(func: types.FunctionType, seen: typing.Set[int]) -> bytes:
+    """Digests a function: its code, closure variables and referenced globals (see :func:`fingerprint_function`)."""
+    seen.add(id(func))
+
+    code = func.__code__
+    hasher = hashlib.sha256(_code_digest(code))
+    hasher.update(repr(func.__defaults__).encode("utf-8", "backslashreplace"))
+
+    names = _code_global_names(code)  # (also the attributes it may look up, e.g. in modules)
+    for cell in (func.__closure__ or ()):
+        try:
+            contents = cell.cell_contents
+        except ValueError:  # empty cell
+            contents = "<empty cell>"
+
+        hasher.update(b"f" + _value_repr(contents, seen, names).encode("utf-8", "backslashreplace"))
+
+    func_globals = func.__globals__
+    for name in sorted(names):
+        if name in func_globals:
+            hasher.update(f"g{name}=".encode("utf-8") + _value_repr(func_globals[name], seen, names).encode(
+                "utf-8", "backslashreplace"
+            ))
+
+    return hasher.digest()
+
+
+def fingerprint_function(func: typing.Callable) -> str:
+    """Fingerprints a function, by its code object (bytecode, constants, names), its closure variables and the
+    globals it references (functions it calls are fingerprinted recursively, including the ones it calls through
+    modules of the project, such as ``helpers.build()``; modules of py2df, of the standard library and of installed
+    packages are only identified by name). Unlike the code object's own hash, this does not depend on line numbers.
+
+    Parameters
+    ----------
+    func : Callable
+        The function.
+
+    Returns
+    -------
+    :class:`str`
+        The fingerprint, as a hex string. If it did not change, the function (most likely) produces the same code.
+    """
+    if not isinstance(func, types.FunctionType):  # builtin, partial, callable object...
+        return hashlib.sha256(_value_repr(func, set()).encode("utf-8", "backslashreplace")).hexdigest()
+
+    return _function_digest(func, set()).hex()
+
+
+def fingerprint_holder(fn_holder: FunctionHolder) -> str:
+    """Fingerprints a function holder (e.g. a :class:`~.PlayerEvent` or :class:`~.Function`): its function (see
+    :func:`fingerprint_function`) and, if it is a codeblock, its own JSON data (event type, function name etc.).
+
+    Parameters
+    ----------
+    fn_holder : :class:`~.FunctionHolder`
+        The function holder.
+
+    Returns
+    -------
+    :class:`str`
+        The fingerprint, as a hex string.
+    """
+    hasher = hashlib.sha256(fingerprint_function(fn_holder.function).encode("utf-8"))
+    hasher.update(_value_repr(fn_holder, set()).encode("utf-8", "backslashreplace"))
+    return hasher.hexdigest()
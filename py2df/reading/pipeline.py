@@ -0,0 +1,534 @@
+"""
+The per-line output pipeline of :class:`~py2df.reading.reader.DFReader` (dict -> JSON -> gzip -> base64 -> SNBT).
+"""
+import base64
+import json
+import struct
+import typing
+import zlib
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+import nbtlib as nbt
+
+from ..classes import Codeblock, Material, BracketedBlock, Block
+from ..constants import DEFAULT_AUTHOR, SNBT_EXPORT_VERSION, DEFAULT_COMPRESSION_LEVEL, MIN_COMPRESSION_LEVEL, \
+    MAX_COMPRESSION_LEVEL
+from ..enums import Color
+from ..schemas import ItemSchema, ItemTagSchema
+from ..utils import remove_u200b_from_doc, serialize_tag, dumps_json
+from .serializer import JSONWriter, block_json_data
+
+__all__ = ("LineOutput", "walk_blocks", "encode_outputs")
+
+_JSON_WRITERS = (JSONWriter(), JSONWriter(compact=True))  #: The writers of normal and compact JSON (shared caches).
+
+_GZIP_HEADER_START = b"\x1f\x8b\x08\x00" + b"\x00" * 4  # magic number, deflate, no flags; modification time 0
+_GZIP_OS_UNKNOWN = b"\xff"
+_gzip_compressors: typing.Dict[int, typing.Tuple[typing.Any, bytes]] = dict()  #: level -> prototype, header
+
+_BRACKETED = 1  # walk_blocks: yield the block, then the blocks inside it
+_NESTED = 2  # walk_blocks: only yield the blocks inside it (a plain deque/list of blocks)
+_LEAF = 0
+_NESTED_TYPES = (deque, list, tuple)
+_walk_kinds: typing.Dict[type, int] = {}  # type -> one of the above (computed once per type)
+
+
+def _walk_kind(block_type: type) -> int:
+    """Determines (and caches) how :func:`walk_blocks` should treat objects of the given type."""
+    if issubclass(block_type, BracketedBlock):
+        kind = _BRACKETED
+    elif issubclass(block_type, _NESTED_TYPES):
+        kind = _NESTED
+    else:
+        kind = _LEAF
+
+    _walk_kinds[block_type] = kind
+    return kind
+
+
+def walk_blocks(blocks: typing.Iterable[Block]) -> typing.Iterator[Block]:
+    """Lazily walks a tree of blocks in the order they are placed: each bracketed block (If, Repeat...) is followed by
+    the blocks inside it (brackets included), recursively. Example::
+
+        list(walk_blocks([if_block, action]))  # =>
+        # [if_block, open_bracket, inner_action, close_bracket, action]
+
+    Parameters
+    ----------
+    blocks : Iterable[:class:`~py2df.classes.abc.Block`]
+        The blocks (e.g. a code line). Plain deques/lists found among them are walked into as well.
+
+    Yields
+    ------
+    :class:`~py2df.classes.abc.Block`
+        Each block.
+
+    Notes
+    -----
+    This is the same as ``flatten(blocks, allow_iterables=(BracketedBlock, deque), keep_iterables=(BracketedBlock,))``,
+    but uses an explicit stack instead of recursion and does not build intermediate lists.
+    """
+    kinds = _walk_kinds
+    stack = [iter(blocks)]
+    end = object()  # sentinel
+    while stack:
+        block = next(stack[-1], end)
+        if block is end:
+            stack.pop()
+            continue
+
+        kind = kinds.get(type(block))
+        if kind is None:
+            kind = _walk_kind(type(block))
+
+        if kind == _BRACKETED:
+            yield block
+            stack.append(iter(block.codeblocks))
+        elif kind == _NESTED:
+            stack.append(iter(block))
+        else:
+            yield block
+
+
+def line_json_data(line: typing.Deque[Block]) -> dict:
+    """Obtains the JSON serializable :class:`dict` representing a code line.
+
+    Parameters
+    ----------
+    line : Deque[:class:`~py2df.classes.abc.Block`]
+        The code line.
+
+    Returns
+    -------
+    :class:`dict`
+        The line's dict.
+    """
+    return dict(blocks=[block_json_data(block) for block in walk_blocks(line)])  # walk in order to include If code
+
+
+def line_name(line: typing.Deque[Block]) -> str:
+    """Obtains the name of a code line, shown in its Paste item.
+
+    Parameters
+    ----------
+    line : Deque[:class:`~py2df.classes.abc.Block`]
+        The code line.
+
+    Returns
+    -------
+    :class:`str`
+        The name.
+    """
+    first_codeblock = line[0]
+    if isinstance(first_codeblock, Codeblock):
+        return "No name"  # TODO: Name
+    else:
+        return Color.GOLD + Color.BOLD + "Code line"
+
+
+def _gzip_compressor(level: int) -> typing.Tuple[typing.Any, bytes]:
+    """Obtains the (cached) prototype compressor of a compression level, and the gzip header to use with it.
+
+    Parameters
+    ----------
+    level : :class:`int`
+        The compression level (0-9).
+
+    Returns
+    -------
+    Tuple[``zlib.Compress``, :class:`bytes`]
+        The raw deflate compressor (to be copied, never used directly) and the header.
+
+    Raises
+    ------
+    :exc:`ValueError`
+        If the level is invalid.
+    """
+    try:
+        return _gzip_compressors[level]
+    except KeyError:
+        if type(level) != int or not MIN_COMPRESSION_LEVEL <= level <= MAX_COMPRESSION_LEVEL:
+            raise ValueError(
+                f"Compression level must be an integer from {MIN_COMPRESSION_LEVEL} to {MAX_COMPRESSION_LEVEL}."
+            ) from None
+
+        prototype = zlib.compressobj(
+            level, zlib.DEFLATED, -zlib.MAX_WBITS,  # raw deflate: the gzip header and trailer are written here
+            9 if level == MAX_COMPRESSION_LEVEL else zlib.DEF_MEM_LEVEL  # (max memory level for max compression)
+        )
+        extra_flags = b"\x02" if level == MAX_COMPRESSION_LEVEL else b"\x04" if level == 1 else b"\x00"
+        header = _GZIP_HEADER_START + extra_flags + _GZIP_OS_UNKNOWN
+        compressor = _gzip_compressors[level] = (prototype, header)
+        return compressor
+
+
+def compress_json(json_str: str, level: int = DEFAULT_COMPRESSION_LEVEL) -> bytes:
+    """Compresses a line's JSON (with a trailing newline) with gzip, deterministically: the gzip header has no
+    modification time and a fixed OS byte, so the same JSON always results in the same bytes (on any machine).
+
+    Parameters
+    ----------
+    json_str : :class:`str`
+        The line's JSON.
+
+    level : :class:`int`, optional
+        The compression level, from 0 (no compression; fastest) to 9 (maximum compression; slowest). Defaults to 9.
+
+    Returns
+    -------
+    :class:`bytes`
+        The compressed JSON.
+
+    Raises
+    ------
+    :exc:`ValueError`
+        If the compression level is invalid.
+    """
+    data = (json_str + "\n").encode("utf-8")
+    prototype, header = _gzip_compressor(level)
+    compressor = prototype.copy()  # (cheaper than configuring a new one)
+    return b"".join((
+        header,
+        compressor.compress(data),
+        compressor.flush(),
+        struct.pack("<LL", zlib.crc32(data), len(data) & 0xFFFFFFFF)
+    ))
+
+
+def encode_json(json_str: str, level: int = DEFAULT_COMPRESSION_LEVEL) -> bytes:
+    """Compresses a line's JSON (see :func:`compress_json`) and encodes it in base 64. This is the costly part of the
+    pipeline, and it releases the GIL while compressing, so it may run in parallel threads (see
+    :func:`encode_outputs`).
+
+    Parameters
+    ----------
+    json_str : :class:`str`
+        The line's JSON.
+
+    level : :class:`int`, optional
+        The compression level (see :func:`compress_json`). Defaults to 9.
+
+    Returns
+    -------
+    :class:`bytes`
+        The base64-formatted compressed JSON.
+    """
+    return base64.b64encode(compress_json(json_str, level))
+
+
+def make_snbt(encoded_str: str, name: str, author: str) -> str:
+    """Builds the SNBT of a line's Paste item (an Ender Chest).
+
+    Parameters
+    ----------
+    encoded_str : :class:`str`
+        The line's stringified base64-formatted code.
+
+    name : :class:`str`
+        The line's name.
+
+    author : :class:`str`
+        The author of the code.
+
+    Returns
+    -------
+    :class:`str`
+        The SNBT.
+    """
+    return serialize_tag(
+        ItemSchema(
+            id=str(Material.ENDER_CHEST.value),
+            Count=1,
+            tag=ItemTagSchema(
+                PublicBukkitValues=nbt.Compound({
+                    "hypercube:codetemplatedata": nbt.String(dumps_json(dict(
+                        author=str(author or DEFAULT_AUTHOR),
+                        name=name,
+                        version=SNBT_EXPORT_VERSION,
+                        code=encoded_str
+                    )))
+                }),
+                display=dict(
+                    Name=dumps_json(name)
+                )
+            )
+        )
+    )
+
+
+class LineOutput:
+    """The outputs of a single code line. Each stage of the pipeline (dict -> JSON -> gzip -> base64 -> SNBT) is
+    computed from the previous one only once, when first requested, and then cached; therefore, requesting several
+    formats of the same line costs a single serialization.
+
+    Parameters
+    ----------
+    line : Deque[:class:`~py2df.classes.abc.Block`]
+        The code line.
+
+    compact : :class:`bool`, optional
+        Whether or not to use compact separators in the JSON (see :class:`~py2df.reading.serializer.JSONWriter`).
+        Defaults to ``False``.
+
+    compression_level : :class:`int`, optional
+        The gzip compression level (see :func:`compress_json`). Defaults to 9.
+
+    Attributes
+    ----------
+    line : Optional[Deque[:class:`~py2df.classes.abc.Block`]]
+        The code line, or ``None`` if it was released (see :meth:`release`).
+
+    name : :class:`str`
+        The name of the code line, shown in its Paste item.
+
+    compact : :class:`bool`
+        Whether or not the JSON uses compact separators.
+
+    compression_level : :class:`int`
+        The gzip compression level.
+
+    Warnings
+    --------
+    The cached outputs are not updated if the line is modified after they are computed; a new :class:`LineOutput`
+    has to be created (which :meth:`~.DFReader.read` does for every line it reads).
+    """
+    __slots__ = (
+        "line", "name", "compact", "compression_level", "_json_data", "_json", "_compressed", "_encoded", "_snbt",
+        "_snbt_author"
+    )
+
+    line: typing.Optional[typing.Deque[Block]]
+    name: str
+    compact: bool
+    compression_level: int
+    _json_data: typing.Optional[dict]
+    _json: typing.Optional[str]
+    _compressed: typing.Optional[bytes]
+    _encoded: typing.Optional[bytes]
+    _snbt: typing.Optional[str]
+    _snbt_author: typing.Optional[str]  #: The author the cached SNBT was built with.
+
+    def __init__(
+        self, line: typing.Deque[Block], compact: bool = False, compression_level: int = DEFAULT_COMPRESSION_LEVEL
+    ):
+        self.line = line
+        self.name = line_name(line)
+        self.compact = bool(compact)
+        self.compression_level = compression_level
+        self._json_data = None
+        self._json = None
+        self._compressed = None
+        self._encoded = None
+        self._snbt = None
+        self._snbt_author = None
+
+    @classmethod
+    def from_serialized(cls, name: str, json_str: str, encoded_str: str) -> "LineOutput":
+        """Creates the outputs of a line that was already serialized (e.g. loaded from a
+        :class:`~py2df.reading.cache.TemplateCache`), without its codeblocks.
+
+        Parameters
+        ----------
+        name : :class:`str`
+            The name of the code line.
+
+        json_str : :class:`str`
+            The JSON string representing the line.
+
+        encoded_str : :class:`str`
+            The base64-formatted gzipped JSON of the line.
+
+        Returns
+        -------
+        :class:`LineOutput`
+            The outputs, as if the line had been released (see :meth:`release`) after being serialized.
+        """
+        output = cls.__new__(cls)
+        output.line = None
+        output.name = str(name)
+        output.compact = False  # (irrelevant: its JSON and encoded bytes are already known)
+        output.compression_level = DEFAULT_COMPRESSION_LEVEL
+        output._json_data = None
+        output._json = str(json_str)
+        output._compressed = None
+        output._encoded = str(encoded_str).encode("utf-8")
+        output._snbt = None
+        output._snbt_author = None
+        return output
+
+    @property
+    def json_data(self) -> dict:
+        """The JSON serializable :class:`dict` representing the line.
+
+        Raises
+        ------
+        :exc:`ValueError`
+            If the line was released before its dict (or JSON) was needed.
+        """
+        if self._json_data is None:
+            if self.line is None and self._json is not None:  # released, but its JSON is known
+                self._json_data = json.loads(self._json)
+            elif self.line is None:
+                raise ValueError(
+                    "This code line was released after being output; read() must be called again to output it."
+                )
+            else:
+                self._json_data = line_json_data(self.line)
+
+        return self._json_data
+
+    @property
+    def json(self) -> str:
+        """The JSON string representing the line."""
+        if self._json is None:
+            if self._json_data is None and self.line is not None:  # write it directly, without building its dict
+                self._json = _JSON_WRITERS[self.compact].dumps_line(walk_blocks(self.line))
+            else:
+                self._json = dumps_json(self.json_data, separators=(",", ":") if self.compact else None)
+
+        return self._json
+
+    @property
+    def compressed(self) -> bytes:
+        """The gzip-compressed JSON of the line."""
+        if self._compressed is None and self._encoded is not None:
+            self._compressed = base64.b64decode(self._encoded)
+        elif self._compressed is None:
+            self._compressed = compress_json(self.json, self.compression_level)
+
+        return self._compressed
+
+    @property
+    def encoded(self) -> bytes:
+        """The base64-formatted encoded bytes of the line's compressed JSON."""
+        if self._encoded is None:
+            self._encoded = base64.b64encode(self.compressed)
+
+        return self._encoded
+
+    @property
+    def encoded_str(self) -> str:
+        """The stringified :attr:`encoded` bytes."""
+        return self.encoded.decode("utf-8")
+
+    def snbt(self, author: str = DEFAULT_AUTHOR) -> str:
+        """The SNBT of the line's Paste item.
+
+        Parameters
+        ----------
+        author : :class:`str`, optional
+            The author of the code. Defaults to ``"Unknown"``.
+
+        Returns
+        -------
+        :class:`str`
+            The SNBT.
+        """
+        if self._snbt is None or self._snbt_author != author:
+            self._snbt = make_snbt(self.encoded_str, self.name, author)
+            self._snbt_author = author
+
+        return self._snbt
+
+    @property
+    def payload_sizes(self) -> typing.Dict[str, int]:
+        """The sizes, in bytes, of the stages computed so far (nothing is computed by this): ``"json"`` (the UTF-8
+        encoded JSON), ``"compressed"`` (the gzipped JSON) and ``"encoded"`` (its base 64)."""
+        sizes = dict()
+        if self._json is not None:
+            sizes["json"] = len(self._json.encode("utf-8"))
+
+        if self._compressed is not None:
+            sizes["compressed"] = len(self._compressed)
+        elif self._encoded is not None:  # (3 bytes per 4 base 64 characters, minus the padding)
+            sizes["compressed"] = len(self._encoded) * 3 // 4 - self._encoded[-2:].count(b"=")
+
+        if self._encoded is not None:
+            sizes["encoded"] = len(self._encoded)
+
+        return sizes
+
+    @property
+    def available(self) -> bool:
+        """Whether or not every output can still be obtained (i.e., the line was not released, or its JSON had already
+        been computed when it was)."""
+        return self.line is not None or self._json is not None
+
+    def release(self) -> None:
+        """Releases the line's codeblocks and dict, keeping only the (already computed) serialized outputs.
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        self.line = None
+        self._json_data = None
+
+
+def encode_outputs(
+    outputs: typing.Iterable[LineOutput], workers: typing.Optional[int] = None,
+    executor: typing.Optional[Executor] = None
+) -> typing.List[LineOutput]:
+    """Computes the encoded (gzip + base64) stage of many lines' outputs, optionally in parallel, so that later stages
+    (:attr:`LineOutput.encoded`, :attr:`LineOutput.encoded_str`, :meth:`LineOutput.snbt`) are already cached.
+    Example usage::
+
+        outputs = encode_outputs(outputs, workers=4)
+        encoded = [output.encoded for output in outputs]
+
+    The JSON of each line is written first, in the calling thread (it is pure Python, so it would not run in
+    parallel anyway); then, every JSON is compressed and encoded by the workers. Outputs that were already encoded
+    are skipped.
+
+    Parameters
+    ----------
+    outputs : Iterable[:class:`LineOutput`]
+        The outputs to encode.
+
+    workers : Optional[:class:`int`], optional
+        The amount of threads to encode the lines with. Defaults to ``None`` (encode them one after another, in the
+        calling thread).
+
+    executor : Optional[:class:`~concurrent.futures.Executor`], optional
+        An executor to encode the lines with, instead of creating a thread pool (e.g. one that is reused across calls;
+        a :class:`~concurrent.futures.ProcessPoolExecutor` also works, since only the JSON strings are sent to it). If
+        given, ``workers`` is ignored. Defaults to ``None``.
+
+    Returns
+    -------
+    List[:class:`LineOutput`]
+        The outputs, in the given order.
+
+    Raises
+    ------
+    :exc:`ValueError`
+        If ``workers`` is less than 1.
+    """
+    outputs = list(outputs)
+    if workers is not None and workers < 1:
+        raise ValueError("The amount of workers must be at least 1.")
+
+    pending = [output for output in outputs if output._encoded is None]
+    if executor is None and (workers is None or workers == 1 or len(pending) <= 1):
+        for output in pending:
+            output._encoded = encode_json(output.json, output.compression_level)
+
+        return outputs
+
+    json_strs = [output.json for output in pending]
+    levels = [output.compression_level for output in pending]
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            encoded = list(pool.map(encode_json, json_strs, levels))  # (in order)
+    else:
+        encoded = list(executor.map(encode_json, json_strs, levels))
+
+    for output, encoded_bytes in zip(pending, encoded):
+        output._encoded = encoded_bytes
+
+    return outputs
+
+
+remove_u200b_from_doc(LineOutput)
@@ -2,23 +2,45 @@
 The reader class, and related classes.
 """
 import typing
-import json
-import base64
-import gzip
-import functools
-import nbtlib as nbt
-from collections import deque
-from .. import constants
-from ..schemas import ItemSchema, ItemTagSchema
-from ..utils import remove_u200b_from_doc, flatten, serialize_tag, dumps_json
-from ..enums import PlotSizes, IfEntityType, Color
-from ..constants import DEFAULT_VAL, DEFAULT_AUTHOR, SNBT_EXPORT_VERSION
-from ..classes import Codeblock, FunctionHolder, JSONData, Arguments, Material, BracketedBlock, Block
+import contextlib
+import contextvars
+import time
+from concurrent.futures import Executor
+from operator import attrgetter
+from ..utils import remove_u200b_from_doc
+from ..enums import PlotSizes
+from ..constants import DEFAULT_VAL, DEFAULT_AUTHOR, DEFAULT_COMPRESSION_LEVEL, MIN_COMPRESSION_LEVEL, \
+    MAX_COMPRESSION_LEVEL
+from ..classes import Codeblock, FunctionHolder, BracketedBlock, Block, BlockDeque
+from .pipeline import LineOutput, encode_outputs
+from .fingerprint import fingerprint_holder
+from .cache import TemplateCache
+from .splitter import LineSplitter, line_length
+from .stats import CompileStats
+from ..typings import count_p_check_calls
+from ..errors import LineTooLongError
+
+_T = typing.TypeVar("_T")
+
+_session_reader: "contextvars.ContextVar[typing.Optional[DFReader]]" = contextvars.ContextVar(
+    "py2df_session_reader", default=None
+)  #: The reader of the compilation session active in the current context (thread/task), if any.
+
+
+def _compression_level(level: int) -> int:
+    """Validates a compression level (see :attr:`DFReader.compression_level`)."""
+    if isinstance(level, bool) or not isinstance(level, int) \
+            or not MIN_COMPRESSION_LEVEL <= level <= MAX_COMPRESSION_LEVEL:
+        raise ValueError(
+            f"Compression level must be an integer from {MIN_COMPRESSION_LEVEL} to {MAX_COMPRESSION_LEVEL}."
+        )
+
+    return level
 
 
 class DFReader:
     """
-    Reader; runs the functions and manages all actions. **Singleton.**
+    Reader; runs the functions and manages all actions. **Singleton** (per compilation session).
 
     Change its attributes (configuration) by instantiating it. For example::
 
@@ -28,6 +50,10 @@ class DFReader:
 
     To output the Paste item NBT, use :meth:`DFReader.output_snbt` .
 
+    To compile independent plots at the same time (e.g. in different threads or asyncio tasks), use an isolated
+    compilation session (see :meth:`DFReader.session`); while it is active, ``DFReader()`` (and, therefore, every
+    codeblock) resolves to the session's own reader, instead of the process-wide one.
+
     Attributes
     ----------\u200b
         plot_size : :class:`~py2df.enums.parameters.PlotSizes`
@@ -43,16 +69,44 @@ class DFReader:
             The author of this code, to be inserted in the NBT returned by :meth:`DFReader.output_snbt`. Default:
              ``"Unknown"``.
 
-        lines : List[Deque[:class:`~py2df.classes.abc.Codeblock`]]
-            List of all lines of codeblocks. (Each line is a :class:`deque` , for performance reasons.)
+        incremental : :class:`bool`
+            If True, :meth:`DFReader.read` fingerprints each function holder (see
+            :func:`~py2df.reading.fingerprint.fingerprint_holder`) and, if it did not change since the previous read,
+            reuses its previously read code line (and its serialized outputs) instead of running its function again
+            (even if the function holder was recreated, e.g. by reloading its module). Default: ``False``.
+
+        cache : Optional[:class:`~py2df.reading.cache.TemplateCache`]
+            If set, :meth:`DFReader.read` looks up each function holder (by its fingerprint and this reader's settings)
+            in this on-disk cache, reusing its serialized line without running its function; the lines that are read
+            are serialized and stored in it. Default: ``None``.
+
+        compact_json : :class:`bool`
+            If True, the JSON of each line is written with compact separators (``","`` and ``":"``), which makes
+            templates smaller. Default: ``False``.
+
+        compression_level : :class:`int`
+            The gzip compression level of the lines' encoded outputs, from 0 (no compression; fastest) to 9 (maximum
+            compression; slowest; for templates close to DiamondFire's size limits). Compression is deterministic, so
+            the same code always results in the same templates. Default: ``9``.
+
+        stats : Optional[:class:`~py2df.reading.stats.CompileStats`]
+            If set, the reader records timings and counters of each phase of the compilation in it (see
+            :class:`~py2df.reading.stats.CompileStats`). Default: ``None`` (no statistics are collected).
+
+        lines : List[Optional[Deque[:class:`~py2df.classes.abc.Codeblock`]]]
+            List of all lines of codeblocks. (Each line is a :class:`deque` , for performance reasons; read lines are
+            :class:`~py2df.classes.abc.BlockDeque` instances, which keep track of their length.) Lines released
+            by an ``iter_*`` method (with ``release=True``) are ``None`` until the next :meth:`DFReader.read`.
 
         functions : Tuple[FunctionHolder]
             A read-only copy of the internal function holder :class:`list` .
     """
     __slots__ = (
-        "lines", "plot_size", "auto_split", "author", "_functions", "_curr_line", "_curr_loc", "_prev_curr_locs"
+        "lines", "plot_size", "auto_split", "author", "_functions", "_curr_line", "_curr_loc", "_prev_curr_locs",
+        "_outputs", "incremental", "cache", "compact_json", "compression_level",
+        "stats", "_compiled"
     )
-    lines: typing.List[typing.Deque[Codeblock]]
+    lines: typing.List[typing.Optional[typing.Deque[Codeblock]]]
 
     plot_size: PlotSizes
 
@@ -60,6 +114,16 @@ class DFReader:
 
     author: str
 
+    incremental: bool
+
+    cache: typing.Optional[TemplateCache]
+
+    compact_json: bool
+
+    compression_level: int
+
+    stats: typing.Optional[CompileStats]
+
     _functions: typing.List[FunctionHolder]  #: List of FunctionHolder instances that hold the code lines.
 
     _curr_line: int  #: Current line being read (index in the :attr:`lines` list).
@@ -68,17 +132,22 @@ class DFReader:
 
     _prev_curr_locs: typing.List[typing.Optional[BracketedBlock]]  #: The previous bracket levels, for bracket closes.
 
+    _outputs: typing.List[typing.Optional[LineOutput]]  #: The cached outputs of each line (same indexes as `lines`).
+
+    #: The line outputs of each function holder read (when incremental), by its fingerprint.
+    _compiled: typing.Dict[str, typing.List[LineOutput]]
+
     _singleton: "DFReader" = None  #: The singleton instance of :class:`DFReader`.
 
     def __new__(cls, *args, **kwargs):
-        if cls._singleton:
+        reader = _session_reader.get() or cls._singleton
+        if reader is not None:
             if args or kwargs:  # there was an update in settings!
-                cls._singleton.set(*args, **kwargs)
+                reader.set(*args, **kwargs)
 
-            return cls._singleton
+            return reader
 
-        new_obj = object.__new__(cls)
-        new_obj.__init__(*args, **kwargs)
+        new_obj = cls._new_reader(*args, **kwargs)
 
         cls._singleton = new_obj
 
@@ -86,7 +155,9 @@ class DFReader:
 
     def __init__(
         self, plot_size: PlotSizes = PlotSizes.BASIC_PLOT, auto_split: bool = False,
-        author: str = DEFAULT_AUTHOR
+        author: str = DEFAULT_AUTHOR, incremental: bool = False, cache: typing.Optional[TemplateCache] = None,
+        compact_json: bool = False, compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+        stats: typing.Optional[CompileStats] = None
     ):
         """
         Inits this :class:`Reader`.
@@ -103,22 +174,152 @@ class DFReader:
         author : :class:`str`, optional
             The author of this code, to be inserted in the NBT returned by :meth:`DFReader.output_snbt`. Defaults
             to ``"Unknown"``.
+
+        incremental : :class:`bool`, optional
+            Whether or not to reuse the code lines of function holders that did not change between reads. Defaults to
+            ``False`` .
+
+        cache : Optional[:class:`~py2df.reading.cache.TemplateCache`], optional
+            An on-disk cache of serialized lines, shared between processes. Defaults to ``None`` (no cache).
+
+        compact_json : :class:`bool`, optional
+            Whether or not to write the JSON of each line with compact separators. Defaults to ``False`` .
+
+        compression_level : :class:`int`, optional
+            The gzip compression level, from 0 (no compression) to 9 (maximum compression). Defaults to ``9`` .
+
+        stats : Optional[:class:`~py2df.reading.stats.CompileStats`], optional
+            Where to record compilation statistics. Defaults to ``None`` (no statistics are collected).
         """
-        if self.__class__._singleton:
-            return
+        pass  # the instance is initialized by __new__ (through _new_reader), as it may be an already existing one.
+
+    @classmethod
+    def _new_reader(
+        cls, plot_size: PlotSizes = PlotSizes.BASIC_PLOT, auto_split: bool = False,
+        author: str = DEFAULT_AUTHOR, incremental: bool = False, cache: typing.Optional[TemplateCache] = None,
+        compact_json: bool = False, compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+        stats: typing.Optional[CompileStats] = None
+    ) -> "DFReader":
+        """Creates and initializes a new reader, bypassing the singleton. See :meth:`DFReader.__init__` for the
+        parameters."""
+        new_obj = object.__new__(cls)
+        new_obj.plot_size = PlotSizes(plot_size)
+        new_obj.auto_split = bool(auto_split)
+        new_obj.lines = []
+        new_obj.author = str(author)
+        new_obj._functions = []
+        new_obj._curr_line = 0
+        new_obj._curr_loc = None
+        new_obj._prev_curr_locs = []
+        new_obj._outputs = []
+        new_obj.incremental = bool(incremental)
+        new_obj.cache = cache
+        new_obj.compact_json = bool(compact_json)
+        new_obj.compression_level = _compression_level(compression_level)
+        new_obj.stats = stats
+        new_obj._compiled = dict()
 
-        self.plot_size: PlotSizes = PlotSizes(plot_size)
-        self.auto_split: bool = bool(auto_split)
-        self.lines: typing.List[typing.Deque[Codeblock]] = []
-        self.author = str(author)
-        self._functions: typing.List[FunctionHolder] = []
-        self._curr_line = 0
-        self._curr_loc = None
-        self._prev_curr_locs = []
+        return new_obj
+
+    @classmethod
+    def current(cls) -> "DFReader":
+        """Obtains the reader that codeblocks are currently sent to: the reader of the active compilation session (see
+        :meth:`DFReader.session`), if there is one in the current context, or the process-wide singleton otherwise.
+
+        Returns
+        -------
+        :class:`DFReader`
+            The current reader.
+        """
+        return _session_reader.get() or cls()
+
+    @classmethod
+    @contextlib.contextmanager
+    def session(
+        cls, plot_size: PlotSizes = PlotSizes.BASIC_PLOT, auto_split: bool = False,
+        author: str = DEFAULT_AUTHOR, incremental: bool = False, cache: typing.Optional[TemplateCache] = None,
+        compact_json: bool = False, compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+        stats: typing.Optional[CompileStats] = None, *,
+        functions: typing.Optional[typing.Iterable[FunctionHolder]] = None
+    ) -> typing.Iterator["DFReader"]:
+        """Starts an isolated compilation session, with its own reader (its own lines, function holders and bracket
+        levels), for the current context. Context manager. Example usage::
+
+            with DFReader.session(PlotSizes.LARGE_PLOT) as reader:
+                import my_plot  # decorators register their function holders in this session's reader
+                templates = reader.output_snbt()
+
+        Sessions are backed by :mod:`contextvars`, so each thread (and each asyncio task) sees only its own
+        session, which allows compiling independent plots in parallel.
+
+        Parameters
+        ----------
+        plot_size : :class:`~py2df.enums.parameters.PlotSizes`, optional
+            Size of the plot this code is being developed for. Default is
+            :attr:`~py2df.enums.parameters.PlotSizes.BASIC_PLOT` .
+
+        auto_split : :class:`bool`, optional
+            Whether or not to automatically split long code lines into multiple Functions. Defaults to ``False`` .
+
+        author : :class:`str`, optional
+            The author of this code, to be inserted in the NBT returned by :meth:`DFReader.output_snbt`. Defaults
+            to ``"Unknown"``.
+
+        incremental : :class:`bool`, optional
+            Whether or not to reuse the code lines of function holders that did not change between reads. Defaults to
+            ``False`` .
+
+        cache : Optional[:class:`~py2df.reading.cache.TemplateCache`], optional
+            An on-disk cache of serialized lines, shared between processes. Defaults to ``None`` (no cache).
+
+        compact_json : :class:`bool`, optional
+            Whether or not to write the JSON of each line with compact separators. Defaults to ``False`` .
+
+        compression_level : :class:`int`, optional
+            The gzip compression level, from 0 (no compression) to 9 (maximum compression). Defaults to ``9`` .
+
+        stats : Optional[:class:`~py2df.reading.stats.CompileStats`], optional
+            Where to record compilation statistics. Defaults to ``None`` (no statistics are collected).
+
+        functions : Optional[Iterable[:class:`~py2df.classes.abc.FunctionHolder`]], optional
+            Function holders to be read by this session's reader (for example, those of an already imported module).
+            Defaults to ``None`` (starts with no function holders).
+
+        Yields
+        ------
+        :class:`DFReader`
+            The session's reader.
+        """
+        reader = cls._new_reader(
+            plot_size, auto_split, author, incremental, cache, compact_json, compression_level, stats
+        )
+        if functions is not None:
+            reader.functions = functions
+
+        with reader.activated():
+            yield reader
+
+    @contextlib.contextmanager
+    def activated(self) -> typing.Iterator["DFReader"]:
+        """Makes this reader the current one (see :meth:`DFReader.current`) in the current context, such as the reader
+        of a session that is resumed later (e.g. to import a module again, for the same reader). Context manager.
+
+        Yields
+        ------
+        :class:`DFReader`
+            This reader.
+        """
+        token = _session_reader.set(self)
+        try:
+            yield self
+        finally:
+            _session_reader.reset(token)
 
     def set(
         self, plot_size: PlotSizes = DEFAULT_VAL, auto_split: bool = DEFAULT_VAL,
-        author: str = DEFAULT_VAL
+        author: str = DEFAULT_VAL, incremental: bool = DEFAULT_VAL,
+        cache: typing.Optional[TemplateCache] = DEFAULT_VAL, compact_json: bool = DEFAULT_VAL,
+        compression_level: int = DEFAULT_VAL, stats: typing.Optional[CompileStats] = DEFAULT_VAL
     ) -> "DFReader":
         """
         Configures this Reader.
@@ -135,16 +336,58 @@ class DFReader:
             The author of this code, to be inserted in the NBT returned by :meth:`DFReader.output_snbt`. Defaults
             to ``"Unknown"``.
 
+        incremental : :class:`bool`, optional
+            Whether or not to reuse the code lines of function holders that did not change between reads. Default is
+            ``False`` .
+
+        cache : Optional[:class:`~py2df.reading.cache.TemplateCache`], optional
+            An on-disk cache of serialized lines, shared between processes (``None`` to disable it).
+
+        compact_json : :class:`bool`, optional
+            Whether or not to write the JSON of each line with compact separators. Default is ``False`` .
+
+        compression_level : :class:`int`, optional
+            The gzip compression level, from 0 (no compression) to 9 (maximum compression). Default is ``9`` .
+
+        stats : Optional[:class:`~py2df.reading.stats.CompileStats`], optional
+            Where to record compilation statistics (``None`` to stop collecting them).
+
         Returns
         -------
         :class:`DFReader`
             self to allow chaining
         """
-        if plot_size != DEFAULT_VAL:
+        if plot_size != DEFAULT_VAL and plot_size != self.plot_size:
             self.plot_size = PlotSizes(plot_size)
+            self._compiled.clear()  # the lines depend on the plot size (when split)
 
-        if auto_split != DEFAULT_VAL:
+        if auto_split != DEFAULT_VAL and auto_split != self.auto_split:
             self.auto_split = bool(auto_split)
+            self._compiled.clear()
+
+        if author != DEFAULT_VAL:
+            self.author = str(author)
+
+        if incremental != DEFAULT_VAL:
+            self.incremental = bool(incremental)
+            if not self.incremental:
+                self._compiled.clear()
+
+        if cache is not DEFAULT_VAL:
+            self.cache = cache
+
+        if compact_json != DEFAULT_VAL and compact_json != self.compact_json:
+            self.compact_json = bool(compact_json)
+            self._compiled.clear()
+            self._outputs = []  # (already serialized with the previous separators)
+
+        if compression_level != DEFAULT_VAL and compression_level != self.compression_level:
+            self.compression_level = _compression_level(compression_level)
+            self._compiled.clear()
+            self._outputs = []
+
+        if stats is not DEFAULT_VAL:
+            self.stats = stats
 
         return self
 
@@ -317,30 +560,468 @@ class DFReader:
         Reads the code of every given function, and stores it. Note that running this will **erase any previously
         generated data**.
 
+        If :attr:`incremental` is ``True``, function holders whose fingerprint did not change since the previous read
+        are not run again; their previous code lines (and serialized outputs) are reused, so only the changed ("dirty")
+        lines are serialized again. Likewise, if :attr:`cache` is set, function holders found in it are not run, and
+        the others are serialized and stored in it as soon as they are read.
+
         Returns
         -------
         ``None``
             ``None``
 
+        Raises
+        ------
+        :exc:`~py2df.errors.LineTooLongError`
+            If a line does not fit in the plot (see :attr:`plot_size`) and could not be split (see :attr:`auto_split`).
+
         Warnings
         --------
         Every function given will be run, meaning that any function with "side effects" (i.e., changes something on the
         system and whatnot) may be dangerous if running :meth:`~DFReader.read` more than once, so it is recommended to
         **only run this method once.**
         """
+        for _ in self._iter_read():
+            pass
+
+    def _iter_read(self) -> typing.Iterator[int]:
+        """Reads the code of every given function, one at a time (see :meth:`DFReader.read`).
+
+        Yields
+        ------
+        :class:`int`
+            The index (in :attr:`lines`) of each line, as soon as it is read.
+        """
         self._curr_line = -1  # first index will, then, be 0
+        self._curr_loc = None
+        self._prev_curr_locs = []
+        compiled = self._compiled if self.incremental else None
+        cache = self.cache
+        stats = self.stats
+        new_compiled: typing.Dict[str, typing.List[LineOutput]] = dict()
         for fn_holder in self._functions:
             self._curr_line += 1
-            line = deque()
-            if len(self.lines) <= self._curr_line:  # if there is no corresponding deque for this function holder
+            index = self._curr_line
+            fingerprint = cache_key = None
+            if stats is not None:
+                holder_start = time.perf_counter()
+
+            if compiled is not None or cache is not None:
+                fingerprint = fingerprint_holder(fn_holder)  # (before running it, as it may change its globals)
+                if stats is not None:
+                    stats.add_time("fingerprint", time.perf_counter() - holder_start)
+
+                # (by fingerprint, so that holders recreated by reloading their module are reused as well)
+                cached = compiled.get(fingerprint) if compiled is not None else None
+                if cached is not None and fingerprint not in new_compiled and all(o.available for o in cached):
+                    outputs = cached  # unchanged => reuse its lines
+                else:
+                    outputs = None
+                    if cache is not None:
+                        cache_key = self._cache_key(fingerprint)
+                        if stats is not None:
+                            start = time.perf_counter()
+                            outputs = cache.get(cache_key)
+                            stats.add_time("cache", time.perf_counter() - start)
+                        else:
+                            outputs = cache.get(cache_key)
+
+                if outputs:
+                    if compiled is not None:
+                        new_compiled[fingerprint] = outputs
+
+                    if stats is not None:
+                        stats.add_holder(fn_holder, index, time.perf_counter() - holder_start, reused=True)
+
+                    for output in outputs:
+                        self._reuse_line(self._curr_line, output)
+                        yield self._curr_line
+                        self._curr_line += 1
+
+                    self._curr_line -= 1
+                    continue
+
+            line = BlockDeque()
+            if len(self.lines) <= index:  # if there is no corresponding deque for this function holder
                 self.lines.append(line)
             else:
-                self.lines[self._curr_line] = line  # clear
+                self.lines[index] = line  # clear
+
+            token = _session_reader.set(self)  # codeblocks created by the function are sent to this reader.
+            try:
+                if stats is not None:
+                    start = time.perf_counter()
+                    with count_p_check_calls(stats.p_check_calls):
+                        fn_holder.function()
+
+                    stats.add_time("run", time.perf_counter() - start)
+                else:
+                    fn_holder.function()
+            finally:
+                _session_reader.reset(token)
 
-            fn_holder.function()
             if isinstance(fn_holder, Codeblock):  # event/function/process
                 line.appendleft(fn_holder)
 
+            if stats is not None:
+                stats.count_blocks(line)
+                start = time.perf_counter()
+                split_lines = self._split_line(fn_holder, line)
+                stats.add_time("split", time.perf_counter() - start)
+            else:
+                split_lines = self._split_line(fn_holder, line)
+
+            outputs = []
+            for line in split_lines:  # may be more than one, if it had to be split
+                self._reuse_line(self._curr_line, None)
+                self.lines[self._curr_line] = line
+                outputs.append(self._line_output(self._curr_line))  # new line => new (empty) output cache
+                self._curr_line += 1
+
+            self._curr_line -= 1
+            if compiled is not None:
+                new_compiled[fingerprint] = outputs
+
+            if cache_key is not None:
+                if stats is not None:
+                    for i, output in enumerate(outputs, start=index):
+                        stats.measure_output(i, output, ("json", "compress", "encode"))
+
+                    start = time.perf_counter()
+                    cache.put(cache_key, outputs)
+                    stats.add_time("cache", time.perf_counter() - start)
+                else:
+                    cache.put(cache_key, outputs)  # (serializes the lines)
+
+            if stats is not None:
+                stats.add_holder(fn_holder, index, time.perf_counter() - holder_start)
+
+            yield from range(index, self._curr_line + 1)
+
+        del self.lines[self._curr_line + 1:]  # lines of function holders that were removed since the last read
+        del self._outputs[self._curr_line + 1:]
+        if compiled is not None:
+            self._compiled = new_compiled  # (drops removed function holders)
+
+    def _split_line(self, fn_holder: FunctionHolder, line: typing.Deque[Codeblock]) -> typing.List[typing.Deque[Block]]:
+        """Checks if a read line fits in the plot, splitting it into multiple lines if it does not and
+        :attr:`auto_split` is ``True``.
+
+        Parameters
+        ----------
+        fn_holder : :class:`~py2df.classes.abc.FunctionHolder`
+            The function holder the line was read from.
+
+        line : Deque[:class:`~py2df.classes.abc.Codeblock`]
+            The line.
+
+        Returns
+        -------
+        List[Deque[:class:`~py2df.classes.abc.Block`]]
+            The line, or the lines it was split into.
+
+        Raises
+        ------
+        :exc:`~py2df.errors.LineTooLongError`
+            If the line does not fit in the plot, and either :attr:`auto_split` is ``False`` or it cannot be split.
+        """
+        length = line_length(line)
+        if length <= self.plot_size.value:
+            return [line]
+
+        if not self.auto_split:
+            raise LineTooLongError(
+                f"The code line of {fn_holder!r} is {length} blocks long, which exceeds the plot's limit of \
+{self.plot_size.value} blocks. (Set auto_split to True in order to split it into multiple Functions.)"
+            )
+
+        base_name = getattr(fn_holder, "data", None) or getattr(getattr(fn_holder, "action", None), "value", "Line")
+        return LineSplitter(self.plot_size, str(base_name)).split(line)
+
+    def _cache_key(self, fingerprint: str) -> str:
+        """Builds the :attr:`cache` key of a function holder's lines, from its fingerprint and this reader's settings.
+
+        Parameters
+        ----------
+        fingerprint : :class:`str`
+            The function holder's fingerprint (see :func:`~py2df.reading.fingerprint.fingerprint_holder`).
+
+        Returns
+        -------
+        :class:`str`
+            The key.
+        """
+        return TemplateCache.key(
+            fingerprint, plot_size=self.plot_size, auto_split=self.auto_split, author=self.author,
+            compact_json=self.compact_json, compression_level=self.compression_level
+        )
+
+    def _reuse_line(self, index: int, output: typing.Optional[LineOutput]) -> None:
+        """Places a previously read line (and its outputs) at the given index of :attr:`lines`.
+
+        Parameters
+        ----------
+        index : :class:`int`
+            The index of the line in :attr:`lines`.
+
+        output : Optional[:class:`~py2df.reading.pipeline.LineOutput`]
+            The line's outputs (its line is ``None`` if it was released; the serialized outputs are kept), or ``None``
+            to only make room for a new line at that index.
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        lines = self.lines
+        outputs = self._outputs
+        while len(lines) <= index:
+            lines.append(None)
+
+        while len(outputs) <= index:
+            outputs.append(None)
+
+        if output is not None:
+            lines[index] = output.line
+            outputs[index] = output
+
+    def _iter_line_indexes(self, read: bool) -> typing.Iterator[int]:
+        """Iterates over the index of every code line to be output, reading them first if ``read`` is ``True``.
+
+        Raises
+        ------
+        :exc:`ValueError`
+            If there is no code line to output.
+        """
+        if not (self._functions if read else any(line is None or line for line in self.lines)):  # (None: released)
+            raise ValueError("No code lines were generated, so JSON data cannot be exported.")
+
+        if read:
+            yield from self._iter_read()
+        else:
+            yield from range(len(self.lines))
+
+    def _line_output(self, index: int) -> LineOutput:
+        """Obtains the (cached) outputs of a read line, creating them if the line is new or was replaced.
+
+        Parameters
+        ----------
+        index : :class:`int`
+            The index of the line in :attr:`lines`.
+
+        Returns
+        -------
+        :class:`~py2df.reading.pipeline.LineOutput`
+            The line's outputs.
+        """
+        outputs = self._outputs
+        line = self.lines[index]
+        while len(outputs) <= index:
+            outputs.append(None)
+
+        output = outputs[index]
+        if output is None or output.line is not line:  # (a released line keeps its cached outputs.)
+            if line is None:
+                raise ValueError(
+                    f"Code line {index} was released after being output; read() must be called again to output it."
+                )
+
+            output = outputs[index] = LineOutput(
+                line, compact=self.compact_json, compression_level=self.compression_level
+            )
+
+        return output
+
+    def _iter_outputs(
+        self, read: bool, release: bool, stage: typing.Callable[[LineOutput], _T], phases: typing.Tuple[str, ...]
+    ) -> typing.Iterator[_T]:
+        """Runs the output pipeline of each line (see :class:`~py2df.reading.pipeline.LineOutput`) up to the given
+        stage, one line at a time.
+
+        Parameters
+        ----------
+        read : :class:`bool`
+            Whether or not the lines should be read first.
+
+        release : :class:`bool`
+            Whether or not to release each line's codeblocks after it is output.
+
+        stage : Callable[[:class:`~py2df.reading.pipeline.LineOutput`], Any]
+            Function that obtains the desired output from the line's outputs.
+
+        phases : Tuple[:class:`str`, ...]
+            The stages of the pipeline that ``stage`` runs, to be timed if :attr:`stats` is set (see
+            :meth:`~py2df.reading.stats.CompileStats.measure_output`).
+
+        Yields
+        ------
+        Any
+            The output of each line.
+        """
+        for i in self._iter_line_indexes(read):
+            output = self._line_output(i)
+            stats = self.stats
+            if stats is not None:
+                stats.measure_output(i, output, phases, self.author)
+
+            result = stage(output)
+            if release:
+                output.release()
+                self.lines[i] = None
+
+            yield result
+
+    def _encoded_outputs(
+        self, read: bool, workers: typing.Optional[int], executor: typing.Optional[Executor]
+    ) -> typing.List[LineOutput]:
+        """Obtains the outputs of every line, with their encoded stage computed (see
+        :func:`~py2df.reading.pipeline.encode_outputs`).
+
+        Parameters
+        ----------
+        read : :class:`bool`
+            Whether or not the lines should be read first.
+
+        workers : Optional[:class:`int`]
+            The amount of threads to encode the lines with (``None`` to encode them one after another).
+
+        executor : Optional[:class:`~concurrent.futures.Executor`]
+            An executor to encode the lines with, instead of creating a thread pool.
+
+        Returns
+        -------
+        List[:class:`~py2df.reading.pipeline.LineOutput`]
+            The outputs of each line.
+        """
+        stats = self.stats
+        if stats is None:
+            return encode_outputs(
+                (self._line_output(i) for i in self._iter_line_indexes(read)), workers=workers, executor=executor
+            )
+
+        outputs = [self._line_output(i) for i in self._iter_line_indexes(read)]
+        if executor is None and workers is None:
+            for i, output in enumerate(outputs):
+                stats.measure_output(i, output, ("json", "compress", "encode"))
+
+            return outputs
+
+        for i, output in enumerate(outputs):
+            stats.measure_output(i, output, ("json",))
+
+        start = time.perf_counter()
+        encode_outputs(outputs, workers=workers, executor=executor)
+        stats.add_time("encode", time.perf_counter() - start)  # (compression included)
+        for i, output in enumerate(outputs):
+            stats.record_payload(i, output)
+
+        return outputs
+
+    def iter_json_data(self, read: bool = True, *, release: bool = False) -> typing.Iterator[dict]:
+        """
+        Lazily outputs a JSON serializable :class:`dict` representing each code line. Unlike
+        :meth:`~DFReader.output_json_data`, each line is read (if ``read`` is ``True``) and converted only when
+        the next dict is requested.
+
+        Parameters
+        ----------
+        read : :class:`bool`, optional
+            Whether or not :meth:`~DFReader.read` should be called when running this function. Defaults to ``True`` .
+
+        release : :class:`bool`, optional
+            Whether or not to release each line's codeblocks (replacing it by ``None`` in :attr:`lines`) as soon as it
+            is output, in order to reduce memory usage. Released lines can only be output again after another
+            :meth:`~DFReader.read`. Defaults to ``False`` .
+
+        Yields
+        ------
+        :class:`dict`
+            The dict of each code line.
+
+        Warnings
+        --------
+        If ``read`` is ``True``, this method runs :meth:`~DFReader.read`, so make sure to take a look at its
+        documentation and warnings.
+
+        See Also
+        --------
+        :meth:`DFReader.output_json_data`
+        """
+        return self._iter_outputs(read, release, attrgetter("json_data"), ("json_data",))
+
+    def iter_json(self, read: bool = True, *, release: bool = False) -> typing.Iterator[str]:
+        """
+        Lazily outputs the JSON string representing each code line (see :meth:`~DFReader.iter_json_data`).
+
+        Parameters
+        ----------
+        read : :class:`bool`, optional
+            Whether or not :meth:`~DFReader.read` should be called when running this function. Defaults to ``True`` .
+
+        release : :class:`bool`, optional
+            Whether or not to release each line's codeblocks as soon as it is output. Defaults to ``False`` .
+
+        Yields
+        ------
+        :class:`str`
+            The JSON string of each code line.
+
+        See Also
+        --------
+        :meth:`DFReader.output_json`
+        """
+        return self._iter_outputs(read, release, attrgetter("json"), ("json",))
+
+    def iter_encoded(self, read: bool = True, *, release: bool = False) -> typing.Iterator[bytes]:
+        """
+        Lazily outputs the base64-formatted encoded bytes representing each code line's JSON format (see
+        :meth:`~DFReader.iter_json_data`).
+
+        Parameters
+        ----------
+        read : :class:`bool`, optional
+            Whether or not :meth:`~DFReader.read` should be called when running this function. Defaults to ``True`` .
+
+        release : :class:`bool`, optional
+            Whether or not to release each line's codeblocks as soon as it is output. Defaults to ``False`` .
+
+        Yields
+        ------
+        :class:`bytes`
+            The base 64-formatted bytes (encoded in UTF-8) of each code line.
+
+        See Also
+        --------
+        :meth:`DFReader.output_encoded`
+        """
+        return self._iter_outputs(read, release, attrgetter("encoded"), ("json", "compress", "encode"))
+
+    def iter_snbt(self, read: bool = True, *, release: bool = False) -> typing.Iterator[str]:
+        """
+        Lazily outputs the SNBT format of the Paste item of each code line (see :meth:`~DFReader.iter_json_data`
+        and :meth:`~DFReader.output_snbt`).
+
+        Parameters
+        ----------
+        read : :class:`bool`, optional
+            Whether or not :meth:`~DFReader.read` should be called when running this function. Defaults to ``True`` .
+
+        release : :class:`bool`, optional
+            Whether or not to release each line's codeblocks as soon as it is output. Defaults to ``False`` .
+
+        Yields
+        ------
+        :class:`str`
+            The SNBT string of each code line.
+
+        See Also
+        --------
+        :meth:`DFReader.output_snbt`
+        """
+        return self._iter_outputs(
+            read, release, lambda output: output.snbt(self.author), ("json", "compress", "encode", "snbt")
+        )
+
     def output_json_data(self, read: bool = True) -> typing.List[dict]:
         """
         Outputs a JSON serializable :class:`dict` representing each code line.
@@ -362,55 +1043,9 @@ class DFReader:
 
         See Also
         --------
-        :meth:`DFReader.read`
+        :meth:`DFReader.read`, :meth:`DFReader.iter_json_data`
         """
-        if read:
-            self.read()  # obtain data
-
-        lines = self.lines
-
-        if not lines or not any(lines):
-            raise ValueError("No code lines were generated, so JSON data cannot be exported.")
-
-        return [
-            dict(blocks=[
-                block.as_json_data() if isinstance(block, JSONData) else dict(
-                    id=constants.BLOCK_ID,
-                    block=block.block.value,
-                    **(
-                        dict(
-                            args=block.args.as_json_data()
-                        ) if block.args and isinstance(block.args, Arguments) else dict()
-                    ),
-                    **(
-                        dict(
-                            action=str(block.action.value)
-                        ) if block.action and hasattr(block.action, "value") else dict()
-                    ),
-                    **(
-                        dict(
-                            sub_action=(
-                                "E" if block.sub_action in (
-                                    IfEntityType.NAME_EQUALS, IfEntityType.IS_NEAR, IfEntityType.STANDING_ON
-                                ) else ""  # ENameEquals; EIsNear; EStandingOn => separate from IfPlayer's.
-                            ) + str(block.sub_action.value)
-                        ) if block.sub_action and hasattr(block.sub_action, "value") else dict()
-                    ),
-                    **(
-                        dict(
-                            data=str(block.data)
-                        ) if block.data else dict()
-                    ),
-                    **(
-                        dict(
-                            target=str(block.target.value)
-                        ) if block.target and hasattr(block.target, "value") else dict()
-                    )
-                ) for block in flatten(
-                    line, allow_iterables=(BracketedBlock, deque), keep_iterables=(BracketedBlock,)
-                )  # flatten in order to include If code
-            ]) for line in lines
-        ]
+        return list(self.iter_json_data(read))
 
     def output_json(self, read: bool = True) -> typing.List[str]:
         """
@@ -433,11 +1068,13 @@ class DFReader:
 
         See Also
         --------
-        :meth:`DFReader.output_json_data`
+        :meth:`DFReader.output_json_data`, :meth:`DFReader.iter_json`
         """
-        return [dumps_json(obj) for obj in self.output_json_data(read)]
+        return list(self.iter_json(read))
 
-    def output_encoded(self, read: bool = True) -> typing.List[bytes]:
+    def output_encoded(
+        self, read: bool = True, *, workers: typing.Optional[int] = None, executor: typing.Optional[Executor] = None
+    ) -> typing.List[bytes]:
         """
         Outputs the base64-formatted encoded bytes representing each code line's JSON format.
 
@@ -446,6 +1083,14 @@ class DFReader:
         read : :class:`bool`, optional
             Whether or not :meth:`~DFReader.read` should be called when running this function. Defaults to ``True`` .
 
+        workers : Optional[:class:`int`], optional
+            The amount of threads to compress and encode the lines with, in parallel (the output order is kept).
+            Defaults to ``None`` (one line after another).
+
+        executor : Optional[:class:`~concurrent.futures.Executor`], optional
+            An executor to compress and encode the lines with, instead of creating a thread pool (see
+            :func:`~py2df.reading.pipeline.encode_outputs`). Defaults to ``None``.
+
         Returns
         -------
         List[:class:`bytes`]
@@ -459,13 +1104,13 @@ class DFReader:
 
         See Also
         --------
-        :meth:`DFReader.output_json`
+        :meth:`DFReader.output_json`, :meth:`DFReader.iter_encoded`
         """
-        return [
-            base64.b64encode(gzip.compress((json_str + "\n").encode("utf-8"))) for json_str in self.output_json(read)
-        ]
+        return [output.encoded for output in self._encoded_outputs(read, workers, executor)]
 
-    def output_encoded_str(self, read: bool = True) -> typing.List[str]:
+    def output_encoded_str(
+        self, read: bool = True, *, workers: typing.Optional[int] = None, executor: typing.Optional[Executor] = None
+    ) -> typing.List[str]:
         """
         Outputs the **stringified** base64-formatted encoded bytes representing each code line's JSON format.
 
@@ -474,6 +1119,14 @@ class DFReader:
         read : :class:`bool`, optional
             Whether or not :meth:`~DFReader.read` should be called when running this function. Defaults to ``True`` .
 
+        workers : Optional[:class:`int`], optional
+            The amount of threads to compress and encode the lines with, in parallel (the output order is kept).
+            Defaults to ``None`` (one line after another).
+
+        executor : Optional[:class:`~concurrent.futures.Executor`], optional
+            An executor to compress and encode the lines with, instead of creating a thread pool (see
+            :func:`~py2df.reading.pipeline.encode_outputs`). Defaults to ``None``.
+
         Returns
         -------
         List[:class:`str`]
@@ -489,9 +1142,11 @@ class DFReader:
         --------
         :meth:`DFReader.output_encoded`
         """
-        return [btes.decode("utf-8") for btes in self.output_encoded(read)]
+        return [output.encoded_str for output in self._encoded_outputs(read, workers, executor)]
 
-    def output_snbt(self, read: bool = True) -> typing.List[str]:
+    def output_snbt(
+        self, read: bool = True, *, workers: typing.Optional[int] = None, executor: typing.Optional[Executor] = None
+    ) -> typing.List[str]:
         """
         Outputs the SNBT format of the Paste item of each read line. It consists of the SNBT of an Ender Chest
         appropriately named as the first block in the code line.
@@ -501,6 +1156,14 @@ class DFReader:
         read : :class:`bool`, optional
             Whether or not :meth:`~DFReader.read` should be called when running this function. Defaults to ``True`` .
 
+        workers : Optional[:class:`int`], optional
+            The amount of threads to compress and encode the lines with, in parallel (the output order is kept).
+            Defaults to ``None`` (one line after another).
+
+        executor : Optional[:class:`~concurrent.futures.Executor`], optional
+            An executor to compress and encode the lines with, instead of creating a thread pool (see
+            :func:`~py2df.reading.pipeline.encode_outputs`). Defaults to ``None``.
+
         Returns
         -------
         List[:class:`str`]
@@ -514,41 +1177,16 @@ class DFReader:
 
         See Also
         --------
-        :meth:`DFReader.output_encoded_str`
+        :meth:`DFReader.output_encoded_str`, :meth:`DFReader.iter_snbt`
         """
-        encoded_strs = self.output_encoded_str(read)
-        lines = self.lines
-
-        def get_line_name(line: typing.Deque[Block]) -> str:
-            first_codeblock = line[0]
-            if isinstance(first_codeblock, Codeblock):
-                return "No name"  # TODO: Name
-            else:
-                return Color.GOLD + Color.BOLD + "Code line"
-
-        line_names = list(map(get_line_name, lines))
-
-        return [
-            serialize_tag(
-                ItemSchema(
-                    id=str(Material.ENDER_CHEST.value),
-                    Count=1,
-                    tag=ItemTagSchema(
-                        PublicBukkitValues=nbt.Compound({
-                            "hypercube:codetemplatedata": nbt.String(dumps_json(dict(
-                                author=str(self.author or DEFAULT_AUTHOR),
-                                name=line_names[i],
-                                version=SNBT_EXPORT_VERSION,
-                                code=encoded
-                            )))
-                        }),
-                        display=dict(
-                            Name=dumps_json(line_names[i])
-                        )
-                    )
-                )
-            ) for i, encoded in enumerate(encoded_strs)
-        ]
+        author = self.author
+        outputs = self._encoded_outputs(read, workers, executor)
+        stats = self.stats
+        if stats is not None:
+            for i, output in enumerate(outputs):
+                stats.measure_output(i, output, ("snbt",), author)
+
+        return [output.snbt(author) for output in outputs]
 
 
 remove_u200b_from_doc(DFReader)
@@ -0,0 +1,519 @@
+"""
+Direct JSON writing of code lines: each codeblock class gets its own specialized writer, which writes the block's JSON
+straight to a buffer (without building its dict first).
+"""
+import json
+import typing
+
+from .. import constants
+from ..classes import Arguments, Block, Bracket, Codeblock, ItemCollection, JSONData, Tag
+from ..enums import IfEntityType
+from ..utils import remove_u200b_from_doc
+
+__all__ = ("JSONWriter", "block_json_data")
+
+DEFAULT_JSON_MAX_MEMBERS = 4096
+
+BlockWriter = typing.Callable[[Block, typing.Callable[[str], typing.Any]], None]  #: Writes a block to a buffer.
+
+_ENTITY_SUB_ACTIONS = (IfEntityType.NAME_EQUALS, IfEntityType.IS_NEAR, IfEntityType.STANDING_ON)
+
+_writer_factories: typing.Optional[
+    typing.Dict[typing.Callable, typing.Callable[["JSONWriter", type], BlockWriter]]
+] = None  #: as_json_data method -> function that builds a writer equivalent to it (loaded on first use).
+
+
+def _sub_action_str(sub_action: typing.Any) -> str:
+    """Converts a sub action to its JSON value."""
+    return (
+        "E" if sub_action in _ENTITY_SUB_ACTIONS else ""  # ENameEquals; EIsNear; EStandingOn => not IfPlayer's.
+    ) + str(sub_action.value)
+
+
+def block_json_data(block: Block) -> dict:
+    """Obtains the JSON serializable :class:`dict` representing a block of a code line.
+
+    Parameters
+    ----------
+    block : :class:`~py2df.classes.abc.Block`
+        The block. If it is not :class:`~py2df.classes.abc.JSONData`, its dict is built from its codeblock attributes.
+
+    Returns
+    -------
+    :class:`dict`
+        The block's dict.
+    """
+    if isinstance(block, JSONData):
+        return block.as_json_data()
+
+    return dict(
+        id=constants.BLOCK_ID,
+        block=block.block.value,
+        **(
+            dict(
+                args=block.args.as_json_data()
+            ) if block.args and isinstance(block.args, Arguments) else dict()
+        ),
+        **(
+            dict(
+                action=str(block.action.value)
+            ) if block.action and hasattr(block.action, "value") else dict()
+        ),
+        **(
+            dict(
+                sub_action=_sub_action_str(block.sub_action)
+            ) if block.sub_action and hasattr(block.sub_action, "value") else dict()
+        ),
+        **(
+            dict(
+                data=str(block.data)
+            ) if block.data else dict()
+        ),
+        **(
+            dict(
+                target=str(block.target.value)
+            ) if block.target and hasattr(block.target, "value") else dict()
+        )
+    )
+
+
+class JSONWriter:
+    """Writes code lines as JSON, byte-identical to ``dumps_json(line_json_data(line))`` (or with compact separators,
+    if ``compact`` is ``True``). Example usage::
+
+        json_str = JSONWriter().dumps_line(line)
+
+    Instead of building each block's dict (see :meth:`~py2df.classes.abc.JSONData.as_json_data`) and then encoding
+    it, each codeblock class gets a writer (generated once, on first use) that writes the block's JSON directly,
+    with its constant parts (``id``, ``block``, ``action``...) encoded only once and cached. Blocks of classes
+    without a specialized writer (e.g. with a custom ``as_json_data``) are encoded from their dicts, as usual.
+
+    Parameters
+    ----------\u200b
+    compact : :class:`bool`, optional
+        Whether or not to use compact separators (``","`` and ``":"``, instead of ``", "`` and ``": "``), which makes
+        templates smaller. Defaults to ``False``.
+
+    max_members : :class:`int`, optional
+        The maximum amount of dict members (``"key": value``, such as actions or data) and tags whose JSON is kept
+        cached; the oldest are dropped past it. Defaults to ``4096``.
+
+    Attributes
+    ----------\u200b
+    compact : :class:`bool`
+        Whether or not compact separators are used.
+
+    max_members : :class:`int`
+        The maximum amount of dict members and tags whose JSON is kept cached.
+    """
+    __slots__ = ("compact", "max_members", "_item_sep", "_key_sep", "_encode", "_writers", "_members", "_values")
+
+    compact: bool
+    max_members: int
+    _item_sep: str
+    _key_sep: str
+    _encode: typing.Callable[[typing.Any], str]  #: Encodes a value as JSON (with this writer's separators).
+    _writers: typing.Dict[type, BlockWriter]  #: The writer of each block class.
+    _members: typing.Dict[typing.Tuple[str, typing.Any], typing.Any]  #: Cached JSON fragments of fixed parts.
+
+    #: Cached JSON fragments of dict members and tags (which depend on the code), oldest first.
+    _values: typing.Dict[typing.Tuple[str, typing.Any], str]
+
+    def __init__(self, compact: bool = False, max_members: int = DEFAULT_JSON_MAX_MEMBERS):
+        self.compact = bool(compact)
+        self.max_members = int(max_members)
+        self._item_sep, self._key_sep = (",", ":") if self.compact else (", ", ": ")
+        self._encode = json.JSONEncoder(ensure_ascii=False, separators=(self._item_sep, self._key_sep)).encode
+        self._writers = dict()
+        self._members = dict()
+        self._values = dict()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} compact={self.compact} max_members={self.max_members}>"
+
+    def dumps_line(self, line: typing.Iterable[Block]) -> str:
+        """Writes a code line as JSON.
+
+        Parameters
+        ----------
+        line : Iterable[:class:`~py2df.classes.abc.Block`]
+            The code line, with its blocks in order (bracketed blocks followed by their inner blocks; see
+            :func:`~py2df.reading.pipeline.walk_blocks`).
+
+        Returns
+        -------
+        :class:`str`
+            The JSON string representing the line.
+        """
+        buffer: typing.List[str] = []
+        self.write_line(line, buffer.append)
+        return "".join(buffer)
+
+    def dumps_block(self, block: Block) -> str:
+        """Writes a single block as JSON.
+
+        Parameters
+        ----------
+        block : :class:`~py2df.classes.abc.Block`
+            The block.
+
+        Returns
+        -------
+        :class:`str`
+            The JSON string representing the block.
+        """
+        buffer: typing.List[str] = []
+        self.writer_for(type(block))(block, buffer.append)
+        return "".join(buffer)
+
+    def write_line(self, line: typing.Iterable[Block], write: typing.Callable[[str], typing.Any]) -> None:
+        """Writes a code line as JSON to a buffer.
+
+        Parameters
+        ----------
+        line : Iterable[:class:`~py2df.classes.abc.Block`]
+            The code line, with its blocks in order.
+
+        write : Callable[[:class:`str`], Any]
+            Function called with each piece of the JSON, in order (e.g. ``list.append`` or ``StringIO.write``).
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        writers = self._writers
+        item_sep = self._item_sep
+        write("{" + self._encode("blocks") + self._key_sep + "[")
+        first = True
+        for block in line:
+            if first:
+                first = False
+            else:
+                write(item_sep)
+
+            writer = writers.get(type(block))
+            if writer is None:
+                writer = self.writer_for(type(block))
+
+            writer(block, write)
+
+        write("]}")
+
+    def writer_for(self, block_type: type) -> BlockWriter:
+        """Obtains the writer of a block class, generating it if needed.
+
+        Parameters
+        ----------
+        block_type : :class:`type`
+            The block class.
+
+        Returns
+        -------
+        Callable[[:class:`~py2df.classes.abc.Block`, Callable[[:class:`str`], Any]], ``None``]
+            The writer, which writes a block of that class to a buffer (see :meth:`write_line`).
+        """
+        writer = self._writers.get(block_type)
+        if writer is not None:
+            return writer
+
+        factories = _load_writer_factories()
+        factory = factories.get(getattr(block_type, "as_json_data", None)) if issubclass(block_type, JSONData) else None
+        if factory is None:  # unknown serialization: encode its dict
+            encode = self._encode
+
+            def writer(block: Block, write: typing.Callable[[str], typing.Any]) -> None:
+                write(encode(block_json_data(block)))
+        else:
+            writer = factory(self, block_type)
+
+        self._writers[block_type] = writer
+        return writer
+
+    def _cache_value(self, key: typing.Tuple[str, typing.Any], fragment: str) -> str:
+        """Caches a fragment in :attr:`_values`, dropping the oldest ones past :attr:`max_members` (rather than the
+        least recently used, so that cache hits, which are most lookups, cost no more than a dict lookup). Returns the
+        fragment."""
+        values = self._values
+        values[key] = fragment
+        try:
+            while len(values) > self.max_members:
+                del values[next(iter(values))]
+        except (KeyError, RuntimeError, StopIteration):  # (changed by another thread)
+            pass
+
+        return fragment
+
+    def _member(self, key: str, value: typing.Any) -> str:
+        """Obtains the (cached) JSON fragment of a dict member, preceded by the item separator: ``, "key": value``."""
+        try:
+            return self._values[(key, value)]
+        except KeyError:
+            return self._cache_value(
+                (key, value), self._item_sep + self._encode(key) + self._key_sep + self._encode(value)
+            )
+        except TypeError:  # unhashable
+            return self._item_sep + self._encode(key) + self._key_sep + self._encode(value)
+
+    def _head(self, id_: str, block: str) -> str:
+        """Obtains the (cached) beginning of a codeblock's JSON, up to its ``args`` key: ``{"id": ..., "block": ...,
+        "args": ``."""
+        try:
+            return self._members[("{", (id_, block))]
+        except KeyError:
+            fragment = self._members[("{", (id_, block))] = (
+                "{" + self._member("id", id_)[len(self._item_sep):] + self._member("block", block) + self._item_sep
+                + self._encode("args") + self._key_sep
+            )
+            return fragment
+
+    def _args(self, args: typing.Any) -> str:
+        """Encodes a codeblock's arguments (see :meth:`~py2df.classes.collections.Arguments.as_json_data`)."""
+        if type(args) is not Arguments:
+            return self._encode(args.as_json_data())
+
+        items = args.items
+        if not items:
+            return self._empty_args()
+
+        if type(items) is not ItemCollection:
+            return self._encode(args.as_json_data())
+
+        item_json = self._item_json
+        slot_head, slot_key = self._slot_fragments()
+        return self._items_head() + self._item_sep.join(
+            slot_head + item_json(item) + slot_key + str(slot) + "}"
+            for slot, item in enumerate(items.data) if item is not None
+        ) + "]}"
+
+    def _item_json(self, item: JSONData) -> str:
+        """Encodes an item of a codeblock's arguments (the JSON of tags is cached, as there are few distinct ones)."""
+        if type(item) is not Tag:
+            return self._encode(item.as_json_data())
+
+        key = ("#tag", (item.tag, item.option, item.action, item.block))
+        try:
+            return self._values[key]
+        except KeyError:
+            return self._cache_value(key, self._encode(item.as_json_data()))
+        except TypeError:  # unhashable
+            return self._encode(item.as_json_data())
+
+    def _items_head(self) -> str:
+        """Obtains the (cached) beginning of non-empty arguments' JSON: ``{"items": [``."""
+        try:
+            return self._members[("#items", None)]
+        except KeyError:
+            fragment = self._members[("#items", None)] = "{" + self._encode("items") + self._key_sep + "["
+            return fragment
+
+    def _slot_fragments(self) -> typing.Tuple[str, str]:
+        """Obtains the (cached) fragments around an item of the arguments: ``{"item": `` and ``, "slot": ``."""
+        try:
+            return self._members[("#slot", None)]
+        except KeyError:
+            fragments = self._members[("#slot", None)] = (
+                "{" + self._encode("item") + self._key_sep, self._item_sep + self._encode("slot") + self._key_sep
+            )
+            return fragments
+
+    def _empty_args(self) -> str:
+        """Obtains the (cached) JSON of empty arguments."""
+        try:
+            return self._members[("args", None)]
+        except KeyError:
+            fragment = self._members[("args", None)] = self._encode(Arguments().as_json_data())
+            return fragment
+
+
+# region:writers
+# Each function below builds a writer that is equivalent to one as_json_data method (same keys, in the same order).
+
+def _codeblock_writer(json_writer: JSONWriter, block_type: type) -> BlockWriter:
+    """Writer equivalent to :meth:`Codeblock.as_json_data <py2df.classes.abc.Codeblock.as_json_data>`."""
+    member, head, args_json, empty_args = json_writer._member, json_writer._head, json_writer._args, \
+        json_writer._empty_args
+    block_id = constants.BLOCK_ID
+    max_data_len = constants.MAX_FUNC_NAME_LEN
+
+    def writer(block: Codeblock, write: typing.Callable[[str], typing.Any]) -> None:
+        args = block.args
+        write(head(block_id, block.block.value))
+        write(args_json(args) if args and isinstance(args, JSONData) else empty_args())
+        action = block.action
+        if action and hasattr(action, "value"):
+            write(member("action", str(action.value)))
+
+        sub_action = block.sub_action
+        if sub_action and hasattr(sub_action, "value"):
+            write(member("subAction", _sub_action_str(sub_action)))
+
+        data = block.data
+        if data:
+            write(member("data", str(data)[:max_data_len]))
+
+        target = block.target
+        if target:
+            write(member("target", str(target.value if hasattr(target, "value") else target)))
+
+        write("}")
+
+    return writer
+
+
+def _action_writer(block_class: type, has_target: bool) -> typing.Callable[[JSONWriter, type], BlockWriter]:
+    """Writer equivalent to the ``as_json_data`` of actions (``block`` is always that of ``block_class``)."""
+    def factory(json_writer: JSONWriter, block_type: type) -> BlockWriter:
+        member, args_json = json_writer._member, json_writer._args
+        head = json_writer._head(constants.BLOCK_ID, block_class.block.value)
+
+        def writer(block: Codeblock, write: typing.Callable[[str], typing.Any]) -> None:
+            write(head)
+            write(args_json(block.args))
+            write(member("action", block.action.value))
+            if has_target and block.target:
+                write(member("target", block.target.value))
+
+            write("}")
+
+        return writer
+
+    return factory
+
+
+def _event_writer(block_class: type) -> typing.Callable[[JSONWriter, type], BlockWriter]:
+    """Writer equivalent to the ``as_json_data`` of events (which have no arguments)."""
+    def factory(json_writer: JSONWriter, block_type: type) -> BlockWriter:
+        member = json_writer._member
+        head = json_writer._head(constants.BLOCK_ID, block_class.block.value) + json_writer._encode(
+            constants.EMPTY_ARGS
+        )
+
+        def writer(block: Codeblock, write: typing.Callable[[str], typing.Any]) -> None:
+            write(head)
+            write(member("action", block.action.value))
+            write("}")
+
+        return writer
+
+    return factory
+
+
+def _simple_writer(json_writer: JSONWriter, block_type: type) -> BlockWriter:
+    """Writer equivalent to ``as_json_data`` methods with just ``id``, ``block``, ``args`` and ``action``."""
+    member, head, args_json = json_writer._member, json_writer._head, json_writer._args
+    block_id = constants.BLOCK_ID
+
+    def writer(block: Codeblock, write: typing.Callable[[str], typing.Any]) -> None:
+        write(head(block_id, block.block.value))
+        write(args_json(block.args))
+        write(member("action", block.action.value))
+        write("}")
+
+    return writer
+
+
+def _if_writer(json_writer: JSONWriter, block_type: type) -> BlockWriter:
+    """Writer equivalent to :meth:`IfBlock.as_json_data <py2df.codeblocks.ifs.IfBlock.as_json_data>`."""
+    member, head, args_json = json_writer._member, json_writer._head, json_writer._args
+    block_id = constants.BLOCK_ID
+
+    def writer(block: Codeblock, write: typing.Callable[[str], typing.Any]) -> None:
+        write(head(block_id, block.block.value))
+        write(args_json(block.args))
+        write(member("action", block.action.value))
+        if block.target:
+            write(member("target", block.target.value))
+
+        if block.invert:
+            write(member("inverted", "NOT"))
+
+        write("}")
+
+    return writer
+
+
+def _repeat_writer(json_writer: JSONWriter, block_type: type) -> BlockWriter:
+    """Writer equivalent to :meth:`Repeat.as_json_data <py2df.codeblocks.utilityblock.Repeat.as_json_data>`."""
+    member, head, args_json = json_writer._member, json_writer._head, json_writer._args
+    block_id = constants.BLOCK_ID
+
+    def writer(block: Codeblock, write: typing.Callable[[str], typing.Any]) -> None:
+        write(head(block_id, block.block.value))
+        write(args_json(block.args))
+        write(member("action", block.action.value))
+        if block.sub_action:
+            write(member("sub_action", _sub_action_str(block.sub_action)))
+
+        if block.invert:
+            write(member("inverted", "NOT"))
+
+        write("}")
+
+    return writer
+
+
+def _select_obj_writer(json_writer: JSONWriter, block_type: type) -> BlockWriter:
+    """Writer equivalent to :meth:`SelectObj.as_json_data <py2df.codeblocks.utilityblock.SelectObj.as_json_data>`."""
+    member, head, args_json = json_writer._member, json_writer._head, json_writer._args
+    block_id = constants.BLOCK_ID
+
+    def writer(block: Codeblock, write: typing.Callable[[str], typing.Any]) -> None:
+        write(head(block_id, block.block.value))
+        write(args_json(block.args))
+        write(member("action", block.action.value))
+        if block.sub_action:
+            write(member("subAction", _sub_action_str(block.sub_action)))
+
+        write("}")
+
+    return writer
+
+
+def _bracket_writer(json_writer: JSONWriter, block_type: type) -> BlockWriter:
+    """Writer equivalent to :meth:`Bracket.as_json_data <py2df.classes.dataclass.Bracket.as_json_data>`."""
+    encode = json_writer._encode
+    brackets: typing.Dict[typing.Tuple[typing.Any, typing.Any], str] = dict()  # there are only 4 kinds of bracket
+
+    def writer(block: Bracket, write: typing.Callable[[str], typing.Any]) -> None:
+        kind = (block.direction, block.bracket_type)
+        bracket_json = brackets.get(kind)
+        if bracket_json is None:
+            bracket_json = brackets[kind] = encode(block.as_json_data())
+
+        write(bracket_json)
+
+    return writer
+
+
+def _load_writer_factories() -> typing.Dict[typing.Callable, typing.Callable[[JSONWriter, type], BlockWriter]]:
+    """Obtains the writer factory of each known ``as_json_data`` method (imported on first use, as the codeblocks
+    depend on the reader)."""
+    global _writer_factories
+    if _writer_factories is None:
+        from ..codeblocks.actions import PlayerAction, EntityAction, GameAction, Control
+        from ..codeblocks.ifs import IfBlock
+        from ..codeblocks.utilityblock import Repeat, SetVar, SelectObj
+        from .event_decorators import PlayerEvent, EntityEvent
+
+        _writer_factories = {
+            Codeblock.as_json_data: _codeblock_writer,
+            PlayerAction.as_json_data: _action_writer(PlayerAction, has_target=True),
+            EntityAction.as_json_data: _action_writer(EntityAction, has_target=True),
+            GameAction.as_json_data: _action_writer(GameAction, has_target=False),
+            Control.as_json_data: _action_writer(Control, has_target=False),
+            PlayerEvent.as_json_data: _event_writer(PlayerEvent),
+            EntityEvent.as_json_data: _event_writer(EntityEvent),
+            IfBlock.as_json_data: _if_writer,
+            Repeat.as_json_data: _repeat_writer,
+            SetVar.as_json_data: _simple_writer,
+            SelectObj.as_json_data: _select_obj_writer,
+            Bracket.as_json_data: _bracket_writer,
+        }
+
+    return _writer_factories
+
+# endregion:writers
+
+
+remove_u200b_from_doc(JSONWriter)
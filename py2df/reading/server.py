@@ -0,0 +1,286 @@
+"""
+A long-running compile server, which keeps py2df and the plot modules imported (and their lines read) between
+compilations. (Its client, :func:`~py2df.client.compile_remote`, is in :mod:`py2df.client`.)
+"""
+import json
+import os
+import socketserver
+import stat
+import sys
+import threading
+import time
+import typing
+
+from .batch import CompileResult, CompileTarget, _target_name
+from .watcher import PlotWatcher
+from ..client import Address, parse_address, compile_remote
+from ..constants import PY2DF_VERSION, DEFAULT_AUTHOR, DEFAULT_COMPRESSION_LEVEL
+from ..enums import PlotSizes
+from ..utils import remove_u200b_from_doc
+
+__all__ = ("CompileServer", "compile_remote", "parse_address")
+
+_SETTINGS = ("plot_size", "auto_split", "author", "compact_json", "compression_level")  #: Settings of a request.
+
+
+def _request_settings(settings: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    """Validates the settings of a compile request."""
+    unknown = set(settings) - set(_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}.")
+
+    return dict(
+        plot_size=PlotSizes(settings.get("plot_size", PlotSizes.BASIC_PLOT.value)),
+        auto_split=bool(settings.get("auto_split", False)),
+        author=str(settings.get("author", DEFAULT_AUTHOR)),
+        compact_json=bool(settings.get("compact_json", False)),
+        compression_level=int(settings.get("compression_level", DEFAULT_COMPRESSION_LEVEL))
+    )
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles the requests of a connection: one JSON object per line, each answered by one JSON object per line."""
+
+    def handle(self):
+        compile_server: "CompileServer" = self.server.compile_server
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                response = compile_server.handle_request(json.loads(line))
+            except Exception as err:  # (invalid JSON or request)
+                response = dict(ok=False, error=f"{type(err).__name__}: {err}")
+
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if response.get("shutdown"):
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:  # (e.g. Windows)
+    _UnixServer = None
+
+
+class CompileServer:
+    """A compile server: keeps py2df and the compiled plot modules imported, so that each compilation only imports
+    (and reads) again what changed since the last one (see :class:`~.PlotWatcher`). Example usage::
+
+        with CompileServer("unix:/tmp/py2df.sock") as server:
+            server.serve_forever()
+
+        # in another process:
+        results = compile_remote(["plots.lobby"], "unix:/tmp/py2df.sock", plot_size=PlotSizes.LARGE_PLOT)
+
+    The protocol is line-based JSON: each request is a JSON object on its own line, and is answered by another.
+    Requests are ``{"op": "compile", "targets": [...], "settings": {...}, "paths": [...]}`` (settings as in
+    :func:`~.compile_module`, with the plot size as its width; paths are directories to import the targets from),
+    answered by ``{"ok": true, "results": [...]}``
+    (each result with the attributes of :class:`~.CompileResult`); ``{"op": "ping"}``; and ``{"op": "shutdown"}``.
+    Rejected requests are answered by ``{"ok": false, "error": "..."}``.
+
+    Compilations run one at a time (modules are imported in the server's process).
+
+    .. warning::
+
+        Anyone that can connect to the server can make it import (i.e., run) modules. Only bind it to a Unix socket
+        or to localhost.
+
+    Attributes
+    ----------\u200b
+    address : Union[:class:`str`, Tuple[:class:`str`, :class:`int`]]
+        The address the server is bound to (the actual port, if it was given as ``0``).
+
+    paths : List[:class:`str`]
+        More directories whose modules are watched for changes (see :class:`~.PlotWatcher`).
+    """
+    __slots__ = ("address", "paths", "_server", "_watchers", "_lock")
+
+    address: Address
+    paths: typing.List[str]
+
+    _server: socketserver.BaseServer
+    _watchers: typing.Dict[typing.Tuple[str, tuple], PlotWatcher]  #: A watcher per target and settings.
+    _lock: threading.Lock  #: Held while compiling.
+
+    def __init__(self, address: typing.Union[Address, int], *, paths: typing.Iterable[str] = ()):
+        """
+        Parameters
+        ----------
+        address : Union[:class:`str`, Tuple[:class:`str`, :class:`int`], :class:`int`]
+            The address to bind to (see :func:`parse_address`).
+
+        paths : Iterable[:class:`str`], optional
+            More directories whose modules are watched for changes. Defaults to ``()``.
+
+        Raises
+        ------
+        :exc:`ValueError`
+            If the address is invalid, or is a Unix socket on a platform without them.
+        """
+        if not isinstance(address, tuple):
+            address = parse_address(address)
+
+        if isinstance(address, str):
+            if _UnixServer is None:
+                raise ValueError("Unix sockets are not supported on this platform; use a TCP port.")
+
+            if os.path.exists(address) and stat.S_ISSOCK(os.stat(address).st_mode):  # (left by a previous server)
+                os.remove(address)
+
+            self._server = _UnixServer(address, _RequestHandler)
+        else:
+            self._server = _TCPServer(address, _RequestHandler)
+
+        self._server.compile_server = self
+        self.address = self._server.server_address
+        self.paths = [os.path.abspath(path) for path in paths]
+        self._watchers = dict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} address={self.address!r} watchers={len(self._watchers)}>"
+
+    def __enter__(self) -> "CompileServer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def serve_forever(self) -> None:
+        """Handles requests until :meth:`shutdown` is called (or a ``shutdown`` request is received).
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stops :meth:`serve_forever` (from another thread).
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        self._server.shutdown()
+
+    def close(self) -> None:
+        """Closes the server's socket (removing its file, if it is a Unix socket).
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        self._server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)  # (a socket file, created by this server)
+
+    def compile(
+        self, targets: typing.Iterable[CompileTarget], *, plot_size: PlotSizes = PlotSizes.BASIC_PLOT,
+        auto_split: bool = False, author: str = DEFAULT_AUTHOR, compact_json: bool = False,
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL
+    ) -> typing.List[CompileResult]:
+        """Compiles plot modules in this process, reusing what was already imported and read (see
+        :func:`~.compile_module` for the parameters). Used for each compile request.
+
+        Returns
+        -------
+        List[:class:`~.CompileResult`]
+            The result of each target (its timings are ``"compile"`` and ``"total"``; the errors are never raised).
+        """
+        settings = dict(
+            plot_size=PlotSizes(plot_size), auto_split=auto_split, author=author, compact_json=compact_json,
+            compression_level=compression_level
+        )
+        key = tuple(settings.items())
+        results = []
+        with self._lock:
+            for target in map(_target_name, targets):
+                start = time.perf_counter()
+                watcher = self._watchers.get((target, key))
+                if watcher is None:
+                    watcher = self._watchers[(target, key)] = PlotWatcher(
+                        [target], paths=self.paths, interval=0, **settings
+                    )
+
+                for _ in watcher.poll():  # (imports and reads only what changed)
+                    pass
+
+                compiled = time.perf_counter()
+                error = watcher.last_error(target)
+                if error is not None:
+                    results.append(CompileResult(target, timings=dict(total=compiled - start), error=error))
+                    continue
+
+                outputs = watcher.outputs(target)
+                results.append(CompileResult(
+                    target, [output.json for output in outputs], [output.encoded_str for output in outputs],
+                    [output.snbt(author) for output in outputs],
+                    timings=dict(compile=compiled - start, total=time.perf_counter() - start)
+                ))
+
+        return results
+
+    def handle_request(self, request: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+        """Handles a request of the protocol (see :class:`CompileServer`).
+
+        Parameters
+        ----------
+        request : Dict[:class:`str`, Any]
+            The parsed request.
+
+        Returns
+        -------
+        Dict[:class:`str`, Any]
+            The response.
+
+        Raises
+        ------
+        :exc:`ValueError`
+            If the request is invalid.
+        """
+        if not isinstance(request, dict):
+            raise ValueError("The request must be a JSON object.")
+
+        op = request.get("op", "compile")
+        if op == "ping":
+            return dict(ok=True, version=PY2DF_VERSION, pid=os.getpid())
+
+        if op == "shutdown":
+            return dict(ok=True, shutdown=True)
+
+        if op != "compile":
+            raise ValueError(f"Unknown operation: {op!r}.")
+
+        targets = request.get("targets")
+        if not isinstance(targets, list) or not all(isinstance(target, str) for target in targets):
+            raise ValueError("'targets' must be a list of strings.")
+
+        paths = request.get("paths") or []
+        if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+            raise ValueError("'paths' must be a list of strings.")
+
+        for path in paths:  # (directories to import the targets from)
+            if path not in sys.path:
+                sys.path.insert(0, path)
+
+        results = self.compile(targets, **_request_settings(request.get("settings") or dict()))
+        return dict(ok=True, results=[
+            {attr: getattr(result, attr) for attr in CompileResult.__slots__} for result in results
+        ])
+
+
+remove_u200b_from_doc(CompileServer)
@@ -0,0 +1,327 @@
+"""
+Splitting of code lines that do not fit in the plot into several Function lines (see :attr:`DFReader.auto_split`).
+"""
+import typing
+import zlib
+from collections import deque
+
+from .. import constants
+from ..classes import Block, BlockDeque, BracketedBlock, Codeblock
+from ..enums import BlockType, ControlType, PlotSizes
+from ..errors import LineTooLongError
+from ..utils import remove_u200b_from_doc
+
+__all__ = ("LineSplitter", "block_length", "line_length")
+
+SPLIT_FUNCTION_LENGTH = 2  #: Length of the Function block that starts each generated line.
+SPLIT_CALL_LENGTH = 2  #: Length of the Call Function block that jumps to a generated line.
+
+_LOOP_CONTROLS = (ControlType.SKIP, ControlType.STOP_REPEAT)
+
+
+def block_length(block: Block) -> int:
+    """Obtains the length of a block, in Minecraft blocks (including, for bracketed blocks, their brackets and
+    inner codeblocks).
+
+    Parameters
+    ----------
+    block : :class:`~py2df.classes.abc.Block`
+        The block.
+
+    Returns
+    -------
+    :class:`int`
+        The length.
+    """
+    return getattr(block, "total_length", block.length)
+
+
+def line_length(line: typing.Iterable[Block]) -> int:
+    """Obtains the length of a code line, in Minecraft blocks.
+
+    Parameters
+    ----------
+    line : Iterable[:class:`~py2df.classes.abc.Block`]
+        The code line (including the event/Function/Process block that starts it, if any).
+
+    Returns
+    -------
+    :class:`int`
+        The length.
+    """
+    if isinstance(line, BlockDeque):  # kept up to date
+        return line.total_length
+
+    return sum(map(block_length, line))
+
+
+def _is_block_type(block: Block, block_type: BlockType) -> bool:
+    """Checks if a block is a codeblock of the given type."""
+    return getattr(block, "block", None) == block_type
+
+
+def _can_offload(blocks: typing.Iterable[Block], in_repeat: bool = False) -> bool:
+    """Checks if the given blocks, from inside a bracket, can be moved to a Function (called from the bracket) without
+    changing their behavior: they must not Return (it would return to the bracket, instead of from the line) nor
+    Skip/Stop a Repeat that is not among them (it would not affect the Repeat).
+
+    Parameters
+    ----------
+    blocks : Iterable[:class:`~py2df.classes.abc.Block`]
+        The blocks.
+
+    in_repeat : :class:`bool`, optional
+        Whether or not the blocks are inside a Repeat that is also moved. Defaults to ``False``.
+
+    Returns
+    -------
+    :class:`bool`
+        Whether or not they can be moved.
+    """
+    for block in blocks:
+        if _is_block_type(block, BlockType.CONTROL):
+            action = getattr(block, "action", None)
+            if action == ControlType.RETURN or (action in _LOOP_CONTROLS and not in_repeat):
+                return False
+
+        elif isinstance(block, BracketedBlock) and not _can_offload(
+            block.codeblocks, in_repeat or _is_block_type(block, BlockType.REPEAT)
+        ):
+            return False
+
+    return True
+
+
+class LineSplitter:
+    """Splits a code line that does not fit in the plot into a chain of Function lines, each one calling the next with
+    a Call Function block as its last block. Example usage::
+
+        lines = LineSplitter(PlotSizes.BASIC_PLOT, "Join").split(line)
+
+    The line's top-level blocks are kept in order and never separated from the Else blocks that follow them. Since
+    every Call Function costs some runtime, each line is filled as much as possible before continuing in the next
+    one, which minimizes the amount of calls (for a chain of consecutive blocks, this greedy packing is optimal).
+    A block that does not fit in a line even by itself (e.g. a long If) has the code inside its brackets moved to a
+    new Function line (split recursively), leaving only a Call Function inside them, unless that code uses Control
+    blocks (Return, Skip, Stop Repeat) that would behave differently inside a Function.
+
+    Parameters
+    ----------\u200b
+    plot_size : :class:`~py2df.enums.parameters.PlotSizes`
+        The size of the plot; the maximum length of a line is its width.
+
+    base_name : :class:`str`
+        Name the generated Functions' names are based on (e.g. the name of the Function or event being split).
+
+    Attributes
+    ----------\u200b
+    limit : :class:`int`
+        The maximum length of a line, in blocks.
+
+    base_name : :class:`str`
+        Name the generated Functions' names are based on.
+
+    generated_count : :class:`int`
+        Amount of Function lines generated so far.
+    """
+    __slots__ = ("limit", "base_name", "generated_count")
+
+    limit: int
+    base_name: str
+    generated_count: int
+
+    def __init__(self, plot_size: PlotSizes, base_name: str):
+        self.limit = PlotSizes(plot_size).value
+        self.base_name = str(base_name)
+        self.generated_count = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} limit={self.limit} base_name={repr(self.base_name)}>"
+
+    def split(self, line: typing.Deque[Block]) -> typing.List[typing.Deque[Block]]:
+        """Splits a code line, if it is too long.
+
+        Parameters
+        ----------
+        line : Deque[:class:`~py2df.classes.abc.Block`]
+            The code line, starting with the event/Function/Process block that starts it (if any). Its bracketed blocks
+            may be modified (when their inner code is moved to another line).
+
+        Returns
+        -------
+        List[Deque[:class:`~py2df.classes.abc.Block`]]
+            The resulting lines: the original line's (shortened) beginning, followed by the generated Function lines.
+            If the line fits in the plot, this is just ``[line]``.
+
+        Raises
+        ------
+        :exc:`~py2df.errors.LineTooLongError`
+            If there is no way to split the line.
+        """
+        if line_length(line) <= self.limit:
+            return [line]
+
+        blocks = list(line)
+        header = blocks.pop(0) if blocks and _is_starting_block(blocks[0]) else None
+        extra_lines: typing.List[typing.Deque[Block]] = []
+        chain = self._chain(header, blocks, extra_lines)
+        return chain + extra_lines
+
+    def _new_name(self) -> str:
+        """Generates the name of a new Function line (at most 16 characters long)."""
+        self.generated_count += 1
+        suffix = f"#{self.generated_count}"
+        base = self.base_name
+        max_base_len = constants.MAX_FUNC_NAME_LEN - len(suffix)
+        if len(base) > max_base_len:  # shorten, but keep it unique
+            checksum = f"{zlib.crc32(base.encode('utf-8')):08x}"[:4]
+            base = base[:max_base_len - len(checksum)] + checksum
+
+        return base + suffix
+
+    def _chain(
+        self, header: typing.Optional[Block], blocks: typing.List[Block],
+        extra_lines: typing.List[typing.Deque[Block]]
+    ) -> typing.List[typing.Deque[Block]]:
+        """Packs blocks into a chain of lines (the first one starting with the given header, and the others with
+        generated Functions), each one calling the next.
+
+        Parameters
+        ----------
+        header : Optional[:class:`~py2df.classes.abc.Block`]
+            The block starting the first line, if any.
+
+        blocks : List[:class:`~py2df.classes.abc.Block`]
+            The blocks to pack.
+
+        extra_lines : List[Deque[:class:`~py2df.classes.abc.Block`]]
+            List where Function lines generated from the blocks' inner code are appended to.
+
+        Returns
+        -------
+        List[Deque[:class:`~py2df.classes.abc.Block`]]
+            The chain of lines.
+        """
+        from ..codeblocks import CallFunction
+        from .callable_decorators import Function
+
+        limit = self.limit
+        units = _group_units(blocks)
+        last = len(units) - 1
+        lengths = []
+        for i, unit in enumerate(units):  # make sure every unit fits in a line (by itself)
+            max_len = limit - SPLIT_FUNCTION_LENGTH - (0 if i == last else SPLIT_CALL_LENGTH)
+            lengths.append(self._shrink(unit, max_len, extra_lines))
+
+        remaining = sum(lengths)
+        curr = deque([header] if header is not None else [])
+        curr_len = block_length(header) if header is not None else 0
+        chain = [curr]
+        for unit, length in zip(units, lengths):
+            if curr_len + remaining > limit and curr_len + length + SPLIT_CALL_LENGTH > limit:  # continue in new line
+                name = self._new_name()
+                curr.append(CallFunction(name, append_to_reader=False))
+                curr = deque([Function(name, hidden=True)])
+                curr_len = SPLIT_FUNCTION_LENGTH
+                chain.append(curr)
+
+            curr.extend(unit)
+            curr_len += length
+            remaining -= length
+
+        return chain
+
+    def _shrink(
+        self, unit: typing.List[Block], max_len: int, extra_lines: typing.List[typing.Deque[Block]]
+    ) -> int:
+        """Moves the inner code of a unit's bracketed blocks to new Function lines (starting with the longest, and
+        only trying the bracketed blocks inside another one if its code cannot be moved) until the unit fits in the
+        given length.
+
+        Parameters
+        ----------
+        unit : List[:class:`~py2df.classes.abc.Block`]
+            The unit (a block, or an If followed by its Else).
+
+        max_len : :class:`int`
+            The maximum length of the unit.
+
+        extra_lines : List[Deque[:class:`~py2df.classes.abc.Block`]]
+            List where the generated Function lines are appended to.
+
+        Returns
+        -------
+        :class:`int`
+            The new length of the unit.
+
+        Raises
+        ------
+        :exc:`~py2df.errors.LineTooLongError`
+            If the unit cannot be shortened enough.
+        """
+        from ..codeblocks import CallFunction
+        from .callable_decorators import Function
+
+        length = line_length(unit)
+        if length <= max_len:
+            return length
+
+        candidates = deque(_bracketed_by_length(unit))
+        while candidates:
+            block = candidates.popleft()
+            codeblocks = block.codeblocks
+            inner = list(codeblocks)[1:-1]  # between the brackets
+            if line_length(inner) <= SPLIT_CALL_LENGTH:
+                continue
+
+            if not _can_offload(inner):  # (the bracket itself stays) => try the brackets inside it, later
+                candidates.extend(_bracketed_by_length(inner))
+                continue
+
+            name = self._new_name()
+            open_bracket, close_bracket = codeblocks[0], codeblocks[-1]
+            codeblocks.clear()
+            codeblocks.extend((open_bracket, CallFunction(name, append_to_reader=False), close_bracket))
+            extra_lines.extend(self._chain(Function(name, hidden=True), inner, extra_lines))
+
+            length = line_length(unit)
+            if length <= max_len:
+                return length
+
+        raise LineTooLongError(
+            f"Could not split code line: {_describe(unit[0])} needs {length} blocks, but at most {max_len} fit in a line, and \
+there is no more code inside its brackets that can be moved to a Function."
+        )
+
+
+def _is_starting_block(block: Block) -> bool:
+    """Checks if a block starts a code line (event, Function or Process)."""
+    return isinstance(block, Codeblock) and getattr(block, "block", None) in (
+        BlockType.PLAYER_EVENT, BlockType.ENTITY_EVENT, BlockType.FUNCTION, BlockType.PROCESS
+    )
+
+
+def _describe(block: Block) -> str:
+    """Describes a block briefly, for error messages (e.g. ``"IfGame (CommandEquals)"``)."""
+    action = getattr(getattr(block, "action", None), "value", None)
+    return type(block).__name__ + (f" ({action})" if action else "")
+
+
+def _bracketed_by_length(blocks: typing.Iterable[Block]) -> typing.List[BracketedBlock]:
+    """Obtains the bracketed blocks among the given blocks, from the longest to the shortest."""
+    return sorted((block for block in blocks if isinstance(block, BracketedBlock)), key=block_length, reverse=True)
+
+
+def _group_units(blocks: typing.Iterable[Block]) -> typing.List[typing.List[Block]]:
+    """Groups blocks into units that cannot be separated: each block, together with the Else blocks after it."""
+    units: typing.List[typing.List[Block]] = []
+    for block in blocks:
+        if units and _is_block_type(block, BlockType.ELSE):
+            units[-1].append(block)
+        else:
+            units.append([block])
+
+    return units
+
+
+remove_u200b_from_doc(LineSplitter)
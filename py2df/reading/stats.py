@@ -0,0 +1,262 @@
+"""
+Compilation statistics (phase timings and counters) collected by :class:`~py2df.reading.reader.DFReader`.
+"""
+import collections
+import time
+import typing
+
+from .pipeline import LineOutput, walk_blocks
+from ..classes import Block, FunctionHolder
+from ..utils import remove_u200b_from_doc, dumps_json
+
+__all__ = ("CompileStats",)
+
+#: The phases timed, in the order they happen. "run" is running the function holders' functions (which includes
+#: creating codeblocks and checking their arguments); "json_data" is only timed when the dicts are requested.
+PHASES = ("fingerprint", "cache", "run", "split", "json_data", "json", "compress", "encode", "snbt")
+
+
+def _holder_label(fn_holder: FunctionHolder) -> str:
+    """Describes a function holder briefly (e.g. ``"PlayerEvent Join"`` or ``"Function MyFunc"``)."""
+    name = getattr(fn_holder, "data", None) or getattr(getattr(fn_holder, "action", None), "value", None)
+    if name is None:
+        name = getattr(getattr(fn_holder, "function", None), "__qualname__", None)
+
+    return type(fn_holder).__name__ + (f" {name}" if name else "")
+
+
+class CompileStats:
+    """Timings and counters of the compilation of a plot. Give it to a :class:`~.DFReader` in order to collect
+    them (they are not collected otherwise, which costs nothing)::
+
+        reader = DFReader(stats=CompileStats())
+        reader.output_snbt()
+        print(reader.stats.as_json(indent=2))
+
+    Statistics accumulate over every read and output, until :meth:`reset` is called.
+
+    Attributes
+    ----------\u200b
+    phases : Dict[:class:`str`, :class:`float`]
+        The wall time spent in each phase (see :data:`PHASES`), in seconds. Parallel encoding (see
+        :meth:`~.DFReader.output_encoded`) is timed as a whole, under ``"encode"``.
+
+    holders : List[Dict[:class:`str`, Any]]
+        The wall time spent reading each function holder (``"holder"``, its description; ``"line"``, the index of its
+        first line; ``"time"``, in seconds; ``"reused"``, whether its lines were reused instead of read).
+
+    block_counts : Counter[:class:`str`]
+        The amount of codeblocks read, per block type (e.g. ``"player_action"``). Reused lines are not counted.
+
+    payloads : Dict[:class:`int`, Dict[:class:`str`, :class:`int`]]
+        The sizes, in bytes, of the latest outputs of each line (by index): ``"json"``, ``"compressed"`` and
+        ``"encoded"`` (see :attr:`~py2df.reading.pipeline.LineOutput.payload_sizes`).
+
+    p_check_calls : Counter[:class:`str`]
+        The amount of calls to :func:`~py2df.typings.p_check` while reading, per parameter type.
+    """
+    __slots__ = ("phases", "holders", "block_counts", "payloads", "p_check_calls")
+
+    phases: typing.Dict[str, float]
+    holders: typing.List[typing.Dict[str, typing.Any]]
+    block_counts: typing.Counter[str]
+    payloads: typing.Dict[int, typing.Dict[str, int]]
+    p_check_calls: typing.Counter[str]
+
+    def __init__(self):
+        self.reset()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} total_time={self.total_time:.6f} holders={len(self.holders)}>"
+
+    @property
+    def total_time(self) -> float:
+        """The total wall time of every phase, in seconds."""
+        return sum(self.phases.values())
+
+    def reset(self) -> None:
+        """Discards every statistic collected so far.
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.holders = []
+        self.block_counts = collections.Counter()
+        self.payloads = dict()
+        self.p_check_calls = collections.Counter()
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """Adds wall time to a phase.
+
+        Parameters
+        ----------
+        phase : :class:`str`
+            The phase (see :data:`PHASES`; others are added as needed).
+
+        seconds : :class:`float`
+            The time to add, in seconds.
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_holder(self, fn_holder: FunctionHolder, line: int, seconds: float, reused: bool = False) -> None:
+        """Records the time spent reading a function holder.
+
+        Parameters
+        ----------
+        fn_holder : :class:`~.FunctionHolder`
+            The function holder.
+
+        line : :class:`int`
+            The index of its (first) line.
+
+        seconds : :class:`float`
+            The time spent, in seconds.
+
+        reused : :class:`bool`, optional
+            Whether its lines were reused (from a previous read or a cache) instead of read. Defaults to ``False``.
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        self.holders.append(dict(holder=_holder_label(fn_holder), line=line, time=seconds, reused=reused))
+
+    def count_blocks(self, line: typing.Iterable[Block]) -> None:
+        """Counts the codeblocks of a read line (including those inside brackets), per block type.
+
+        Parameters
+        ----------
+        line : Iterable[:class:`~py2df.classes.abc.Block`]
+            The line.
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        self.block_counts.update(
+            str(getattr(block_type, "value", block_type)) for block_type in (
+                getattr(block, "block", None) for block in walk_blocks(line)
+            ) if block_type is not None  # (brackets have no block type)
+        )
+
+    def measure_output(
+        self, index: int, output: LineOutput, phases: typing.Iterable[str], author: typing.Optional[str] = None
+    ) -> None:
+        """Computes the given stages of a line's outputs, one at a time, timing each one, and records the line's
+        payload sizes. Stages already computed take no time.
+
+        Parameters
+        ----------
+        index : :class:`int`
+            The index of the line.
+
+        output : :class:`~py2df.reading.pipeline.LineOutput`
+            The line's outputs.
+
+        phases : Iterable[:class:`str`]
+            The stages to compute, in order: ``"json_data"``, ``"json"``, ``"compress"``, ``"encode"`` and/or
+            ``"snbt"``.
+
+        author : Optional[:class:`str`], optional
+            The author to build the SNBT with. Defaults to ``None`` (the default author).
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        phase_times = self.phases
+        for phase in phases:
+            start = time.perf_counter()
+            if phase == "json_data":
+                output.json_data
+            elif phase == "json":
+                output.json
+            elif phase == "compress":
+                output.compressed
+            elif phase == "encode":
+                output.encoded
+            elif phase == "snbt":
+                output.snbt(author) if author is not None else output.snbt()
+            else:
+                raise ValueError(f"Unknown output stage: {phase!r}.")
+
+            phase_times[phase] = phase_times.get(phase, 0.0) + (time.perf_counter() - start)
+
+        self.record_payload(index, output)
+
+    def record_payload(self, index: int, output: LineOutput) -> None:
+        """Records the payload sizes of a line's outputs (those computed so far).
+
+        Parameters
+        ----------
+        index : :class:`int`
+            The index of the line.
+
+        output : :class:`~py2df.reading.pipeline.LineOutput`
+            The line's outputs.
+
+        Returns
+        -------
+        ``None``
+            ``None``
+        """
+        sizes = output.payload_sizes
+        if sizes:
+            self.payloads.setdefault(index, dict()).update(sizes)
+
+    def as_dict(self) -> dict:
+        """Exports the statistics as a JSON serializable :class:`dict`, including totals.
+
+        Returns
+        -------
+        :class:`dict`
+            The statistics.
+        """
+        payload_totals = collections.Counter()
+        for sizes in self.payloads.values():
+            payload_totals.update(sizes)
+
+        json_size = payload_totals.get("json", 0)
+        return dict(
+            total_time=self.total_time,
+            phases=dict(self.phases),
+            holders=[dict(holder) for holder in self.holders],
+            block_counts=dict(self.block_counts.most_common()),
+            total_blocks=sum(self.block_counts.values()),
+            payloads=dict(
+                lines={str(index): dict(sizes) for index, sizes in sorted(self.payloads.items())},
+                **{f"total_{stage}": size for stage, size in payload_totals.items()},
+                compression_ratio=(payload_totals.get("compressed", 0) / json_size) if json_size else None
+            ),
+            p_check_calls=dict(self.p_check_calls.most_common()),
+            total_p_check_calls=sum(self.p_check_calls.values())
+        )
+
+    def as_json(self, **kwargs: typing.Any) -> str:
+        """Exports the statistics as a JSON string (see :meth:`as_dict`).
+
+        Parameters
+        ----------
+        kwargs : Any
+            Keyword args to pass to :func:`json.dumps` (e.g. ``indent``).
+
+        Returns
+        -------
+        :class:`str`
+            The JSON.
+        """
+        return dumps_json(self.as_dict(), **kwargs)
+
+
+remove_u200b_from_doc(CompileStats)
@@ -0,0 +1,402 @@
+"""
+Watch mode: polls plot modules for changes and recompiles only the changed ones (and, of those, only the changed
+lines).
+"""
+import hashlib
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+import traceback
+import typing
+
+from .reader import DFReader
+from .pipeline import LineOutput
+from .batch import CompileTarget, _target_name, _load_target
+from ..enums import PlotSizes
+from ..constants import DEFAULT_AUTHOR, DEFAULT_COMPRESSION_LEVEL
+from ..utils import remove_u200b_from_doc
+
+__all__ = ("TemplateChange", "PlotWatcher")
+
+_PY2DF_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # (its modules are never reloaded)
+
+
+class TemplateChange:
+    """A code line whose template changed (or was removed), or a compilation that failed, as emitted by
+    :class:`PlotWatcher`.
+
+    Attributes
+    ----------\u200b
+    target : :class:`str`
+        The target the line belongs to (see :func:`~.compile_module`).
+
+    index : Optional[:class:`int`]
+        The index of the line in the target's lines (``None`` if the compilation failed).
+
+    json : Optional[:class:`str`]
+        The line's JSON (``None`` if the line was removed, or the compilation failed).
+
+    encoded_str : Optional[:class:`str`]
+        The line's base64 code (``None`` if the line was removed, or the compilation failed).
+
+    snbt : Optional[:class:`str`]
+        The SNBT of the line's Paste item (``None`` if the line was removed, or the compilation failed).
+
+    error : Optional[:class:`str`]
+        The formatted traceback of the exception raised while compiling the target, if any (the target's previous
+        templates are kept).
+    """
+    __slots__ = ("target", "index", "json", "encoded_str", "snbt", "error")
+
+    target: str
+    index: typing.Optional[int]
+    json: typing.Optional[str]
+    encoded_str: typing.Optional[str]
+    snbt: typing.Optional[str]
+    error: typing.Optional[str]
+
+    def __init__(
+        self, target: str, index: typing.Optional[int] = None, json: typing.Optional[str] = None,
+        encoded_str: typing.Optional[str] = None, snbt: typing.Optional[str] = None,
+        error: typing.Optional[str] = None
+    ):
+        self.target = str(target)
+        self.index = index
+        self.json = json
+        self.encoded_str = encoded_str
+        self.snbt = snbt
+        self.error = error
+
+    @property
+    def removed(self) -> bool:
+        """Whether the line was removed (the target now has fewer lines)."""
+        return self.error is None and self.json is None
+
+    def __repr__(self):
+        state = "error" if self.error is not None else ("removed" if self.removed else "changed")
+        return f"<{self.__class__.__name__} target={repr(self.target)} index={self.index} {state}>"
+
+
+class _FileState:
+    """The last seen modification time, size and content hash of a module's file."""
+    __slots__ = ("path", "module", "stat", "digest")
+
+    path: str
+    module: str
+    stat: typing.Optional[typing.Tuple[int, int]]
+    digest: typing.Optional[bytes]
+
+    def __init__(self, path: str, module: str):
+        self.path = path
+        self.module = module
+        self.stat = None
+        self.digest = None
+        self.changed()
+
+    def changed(self) -> bool:
+        """Checks whether the file's contents changed since the last check. The file is only hashed if its
+        modification time or size changed (so that touching it, or saving it unchanged, is ignored)."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:  # (e.g. removed, or being replaced by an editor) => check again later
+            return False
+
+        stat = (stat.st_mtime_ns, stat.st_size)
+        if stat == self.stat:
+            return False
+
+        self.stat = stat
+        try:
+            with open(self.path, "rb") as file:
+                digest = hashlib.sha256(file.read()).digest()
+        except OSError:
+            return False
+
+        changed = self.digest is not None and digest != self.digest
+        self.digest = digest
+        return changed
+
+    def discard_bytecode(self) -> None:
+        """Removes the file's cached bytecode, which is only invalidated by the modification time in seconds (and the
+        size), so that a module saved twice within a second is not imported from the stale bytecode."""
+        try:
+            os.remove(importlib.util.cache_from_source(self.path))
+        except (OSError, NotImplementedError, ValueError):
+            pass
+
+
+class PlotWatcher:
+    """Watches plot modules, recompiling the ones that change. Example usage::
+
+        watcher = PlotWatcher(["plots.lobby", "plots.arena"], plot_size=PlotSizes.LARGE_PLOT)
+        for change in watcher.watch():  # runs until interrupted
+            if change.error is not None:
+                print(change.error)
+            elif not change.removed:
+                print(change.target, change.index, change.snbt)
+
+    Each target keeps its own incremental reader (see :attr:`DFReader.incremental`) in this process, so, when the
+    file of a target changes, only that module is imported again, and only the function holders that changed are
+    read and serialized again. When another module of the project (one imported from the same directories as the
+    targets) changes, it is imported again, followed by every target (of which, again, only the function holders
+    affected by the change are read again).
+
+    Only the lines whose templates actually changed are emitted, as :class:`TemplateChange` objects, as soon as each
+    one is ready.
+
+    Attributes
+    ----------\u200b
+    targets : List[:class:`str`]
+        The watched targets (see :func:`~.compile_module` for the accepted formats).
+
+    interval : :class:`float`
+        The time, in seconds, between checks for changes.
+
+    roots : List[:class:`str`]
+        The directories whose modules are watched (besides the targets' own files): the targets' directories and the
+        given paths.
+    """
+    __slots__ = ("targets", "interval", "roots", "_settings", "_readers", "_templates", "_errors", "_files")
+
+    targets: typing.List[str]
+    interval: float
+    roots: typing.List[str]
+
+    _settings: typing.Dict[str, typing.Any]  #: The settings of each target's reader.
+    _readers: typing.Dict[str, DFReader]  #: The (incremental) reader of each target.
+    _templates: typing.Dict[str, typing.List[typing.Tuple[LineOutput, str]]]  #: Output and base64 of each line.
+    _errors: typing.Dict[str, str]  #: The error of the last compilation of each target, if it failed.
+    _files: typing.Dict[str, _FileState]  #: The state of each watched file, by path.
+
+    def __init__(
+        self, targets: typing.Iterable[CompileTarget], *, paths: typing.Iterable[str] = (), interval: float = 0.2,
+        plot_size: PlotSizes = PlotSizes.BASIC_PLOT, auto_split: bool = False, author: str = DEFAULT_AUTHOR,
+        compact_json: bool = False, compression_level: int = DEFAULT_COMPRESSION_LEVEL
+    ):
+        """
+        Parameters
+        ----------
+        targets : Iterable[Union[:class:`str`, :class:`~types.ModuleType`]]
+            The modules to compile and watch (see :func:`~.compile_module` for the accepted formats).
+
+        paths : Iterable[:class:`str`], optional
+            More directories whose modules are watched (e.g. shared helpers). Defaults to ``()``.
+
+        interval : :class:`float`, optional
+            The time, in seconds, between checks for changes. Defaults to ``0.2``.
+
+        plot_size : :class:`~py2df.enums.parameters.PlotSizes`, optional
+            Size of the plot this code is being developed for. Default is
+            :attr:`~py2df.enums.parameters.PlotSizes.BASIC_PLOT` .
+
+        auto_split : :class:`bool`, optional
+            Whether or not to automatically split long code lines into multiple Functions. Defaults to ``False`` .
+
+        author : :class:`str`, optional
+            The author of this code, to be inserted in the NBT. Defaults to ``"Unknown"``.
+
+        compact_json : :class:`bool`, optional
+            Whether or not to write the JSON of each line with compact separators. Defaults to ``False`` .
+
+        compression_level : :class:`int`, optional
+            The gzip compression level, from 0 (no compression) to 9 (maximum compression). Defaults to ``9`` .
+
+        Raises
+        ------
+        :exc:`ValueError`
+            If the interval is negative.
+        """
+        self.targets = [_target_name(target) for target in targets]
+        self.interval = float(interval)
+        if self.interval < 0:
+            raise ValueError("The interval must not be negative.")
+
+        self.roots = [os.path.abspath(path) for path in paths]
+        self._settings = dict(
+            plot_size=plot_size, auto_split=auto_split, author=author, incremental=True, compact_json=compact_json,
+            compression_level=compression_level
+        )
+        self._readers = dict()
+        self._templates = dict()
+        self._errors = dict()
+        self._files = dict()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} targets={self.targets!r} files={len(self._files)}>"
+
+    def poll(self) -> typing.Iterator[TemplateChange]:
+        """Checks the watched files once, recompiling the targets affected by the changes (every target, the first
+        time), and emitting the templates that changed.
+
+        Yields
+        ------
+        :class:`TemplateChange`
+            Each line whose template changed (or that was removed), or each failed compilation, as soon as it is
+            known.
+        """
+        changed = [state.module for state in list(self._files.values()) if state.changed()]
+        for state in self._files.values():
+            if state.module in changed:
+                state.discard_bytecode()
+        target_modules = {target.partition(":")[0] for target in self.targets}
+        dirty = [  # not compiled yet, or not even imported (e.g. the module did not exist)
+            target for target in self.targets
+            if target not in self._templates or target.partition(":")[0] not in sys.modules
+        ]
+        helpers = [module for module in changed if module not in target_modules]
+        stale = set(changed)  # modules to import again (once), also for targets with an attribute
+        stale.update(target.partition(":")[0] for target in dirty)
+        if helpers:
+            for module in helpers:  # (before the targets that use them)
+                try:
+                    importlib.reload(sys.modules[module])
+                except Exception:
+                    yield TemplateChange(module, error=traceback.format_exc())
+
+            dirty = list(self.targets)
+            stale.update(target_modules)
+        else:
+            dirty.extend(
+                target for target in self.targets
+                if target.partition(":")[0] in changed and target not in dirty
+            )
+
+        for target in dirty:
+            module = target.partition(":")[0]
+            yield from self._compile(target, module in stale)
+            stale.discard(module)
+
+        if dirty:
+            self._track_modules()
+
+    def outputs(self, target: CompileTarget) -> typing.List[LineOutput]:
+        """Obtains the current outputs of each line of a target, as of the last :meth:`poll`.
+
+        Parameters
+        ----------
+        target : Union[:class:`str`, :class:`~types.ModuleType`]
+            One of the watched targets.
+
+        Returns
+        -------
+        List[:class:`~py2df.reading.pipeline.LineOutput`]
+            The outputs of each line (empty if the target was not compiled yet, or if its first compilation failed).
+
+        Raises
+        ------
+        :exc:`ValueError`
+            If the target is not watched.
+        """
+        target = _target_name(target)
+        if target not in self.targets:
+            raise ValueError(f"The target {target!r} is not watched.")
+
+        return [output for output, _ in self._templates.get(target, [])]
+
+    def last_error(self, target: CompileTarget) -> typing.Optional[str]:
+        """Obtains the error of the last compilation of a target, if it failed (its previous outputs are kept; see
+        :meth:`outputs`).
+
+        Parameters
+        ----------
+        target : Union[:class:`str`, :class:`~types.ModuleType`]
+            One of the watched targets.
+
+        Returns
+        -------
+        Optional[:class:`str`]
+            The formatted traceback of the error, or ``None`` if the last compilation succeeded.
+        """
+        return self._errors.get(_target_name(target))
+
+    def watch(self, stop: typing.Optional[threading.Event] = None) -> typing.Iterator[TemplateChange]:
+        """Compiles every target, then keeps polling for changes (see :meth:`poll`), until ``stop`` is set (or
+        forever).
+
+        Parameters
+        ----------
+        stop : Optional[:class:`threading.Event`], optional
+            An event that stops watching when set. Defaults to ``None`` (watch until the generator is closed).
+
+        Yields
+        ------
+        :class:`TemplateChange`
+            Each change, as soon as it is known.
+        """
+        while stop is None or not stop.is_set():
+            start = time.monotonic()
+            yield from self.poll()
+            remaining = self.interval - (time.monotonic() - start)
+            if stop is not None:
+                stop.wait(max(remaining, 0))
+            elif remaining > 0:
+                time.sleep(remaining)
+
+    def _compile(self, target: str, reload: bool) -> typing.Iterator[TemplateChange]:
+        """Imports a target (again, if ``reload`` or if it has no attribute) and reads it with its reader, emitting
+        its lines whose templates changed."""
+        reader = self._readers.get(target)
+        if reader is None:
+            reader = self._readers[target] = DFReader._new_reader(**self._settings)
+
+        previous = self._templates.get(target, [])
+        templates = []
+        try:
+            with reader.activated():
+                reader.functions = []  # (registered again by importing the module)
+                holders = _load_target(target, reload=reload)
+                if holders is not None:
+                    reader.functions = holders
+
+            for index in reader._iter_read():
+                output = reader._line_output(index)
+                old = previous[index] if index < len(previous) else None
+                if old is not None and old[0] is output:  # reused (its function holder did not change)
+                    templates.append(old)
+                    continue
+
+                encoded_str = output.encoded_str
+                templates.append((output, encoded_str))
+                if old is None or old[1] != encoded_str:
+                    yield TemplateChange(target, index, output.json, encoded_str, output.snbt(reader.author))
+
+        except Exception:
+            self._errors[target] = traceback.format_exc()
+            self._templates.setdefault(target, [])
+            yield TemplateChange(target, error=self._errors[target])
+            return
+
+        self._errors.pop(target, None)
+
+        for index in range(len(templates), len(previous)):
+            yield TemplateChange(target, index)
+
+        self._templates[target] = templates
+
+    def _track_modules(self) -> None:
+        """Starts watching the files of the targets' modules and of the other modules imported from the roots."""
+        roots = set(self.roots)
+        target_modules = {target.partition(":")[0] for target in self.targets}
+        for name in target_modules:
+            file = getattr(sys.modules.get(name), "__file__", None)
+            if file:
+                roots.add(os.path.dirname(os.path.abspath(file)))
+
+        roots = tuple(os.path.join(root, "") for root in roots)
+        for name, module in list(sys.modules.items()):
+            file = getattr(module, "__file__", None)
+            if not file or not file.endswith(".py"):
+                continue
+
+            path = os.path.abspath(file)
+            if path in self._files or path.startswith(os.path.join(_PY2DF_DIR, "")):
+                continue
+
+            if name in target_modules or path.startswith(roots):
+                self._files[path] = _FileState(path, name)
+
+
+remove_u200b_from_doc(TemplateChange, PlotWatcher)
@@ -1,16 +1,17 @@
 import collections
+import contextlib
+import contextvars
 import typing
 from enum import Enum
 
 from .enums import GVAL_TEXTABLE, GVAL_NUMERIC, GVAL_LOCATABLE, GVAL_LISTABLE, GVAL_ITEM, ParticleType, SoundType, \
-    Material
+    Material, GameValueType
 from .classes.abc import Itemable
 from .classes.mc_types import DFNumber, DFText, DFLocation, DFPotion, Item, DFCustomSpawnEgg, DFParticle, DFSound
 from .classes.variable import (
     DFVariable, DFGameValue, NumberVar, TextVar, ListVar, LocationVar, PotionVar, ParticleVar,
     SoundVar, ItemVar
 )
-from .utils import flatten
 
 
 class ParamTypes:
@@ -235,6 +236,208 @@ def convert_all(param: Param) -> Param:
     return convert_particle(convert_sound(convert_numeric(convert_text(convert_material(param)))))
 
 
+class _ParamChecker:
+    """A parameter type (:attr:`ParamTypes.Param` and the likes, or an Union of them) resolved, once, into the
+    runtime classes and Game Value types it accepts. Used by :func:`p_check` and :func:`p_bool_check`.
+
+    Attributes
+    ----------
+    typeof : Any
+        The parameter type this checker was built for.
+
+    name : Optional[:class:`str`]
+        The name of the parameter type, for error messages (e.g. ``"Numeric"``), or ``None`` if it has no name.
+
+    types : Tuple[:class:`type`, ...]
+        The runtime classes accepted by the parameter type (with any Unions flattened and forward refs resolved).
+
+    gvals : Optional[FrozenSet[:class:`~.GameValueType`]]
+        The Game Value types accepted by the parameter type, or ``None`` if Game Values are not checked for it.
+    """
+    __slots__ = ("typeof", "name", "types", "gvals", "_results")
+
+    typeof: typing.Any
+    name: typing.Optional[str]
+    types: typing.Tuple[type, ...]
+    gvals: typing.Optional[typing.FrozenSet[GameValueType]]
+    _results: typing.Dict[type, bool]  #: Cache of isinstance() results, per type of object checked.
+
+    def __init__(self, typeof: typing.Any, name: typing.Optional[str] = None):
+        self.typeof = typeof
+        self.name = name
+        self.types = _resolve_runtime_types(typeof)
+
+        gvals = GVAL_TYPES.get(typeof)
+        self.gvals = frozenset(gvals) if gvals else None
+        self._results = dict()
+
+    def matches(self, obj: typing.Any) -> bool:
+        """Checks if an object is an instance of any of the accepted runtime classes. The result is cached per
+        type of object.
+
+        Parameters
+        ----------
+        obj : Any
+            The object to check.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether or not the object's type is accepted.
+        """
+        obj_type = type(obj)
+        try:
+            return self._results[obj_type]
+        except KeyError:
+            result = self._results[obj_type] = isinstance(obj, self.types)
+            return result
+
+    def gval_matches(self, obj: typing.Any) -> bool:
+        """Checks if an object, in case it is a :class:`~.DFGameValue`, has a Game Value type accepted by this
+        parameter type. Objects that are not Game Values always match.
+
+        Parameters
+        ----------
+        obj : Any
+            The object to check.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether or not the Game Value type is accepted (or ``True`` if it is not a Game Value).
+        """
+        return self.gvals is None or not isinstance(obj, DFGameValue) or obj.gval_type in self.gvals
+
+    def type_error_msg(self, obj: typing.Any) -> str:
+        """The message of the :exc:`TypeError` raised when an object does not have a valid type."""
+        if self.name:
+            return f"Object must be a valid {repr(self.name)} parameter, not {repr(str(type(obj)))}."
+
+        return f"Object must correspond to the appropriate parameter type, and not be a {repr(str(type(obj)))}."
+
+    def gval_error_msg(self) -> str:
+        """The message of the :exc:`TypeError` raised when a Game Value has an invalid type."""
+        if self.name:
+            return f"The DFGameValue type specified does not evaluate to a valid {repr(self.name)} parameter. (Check \
+documentation to see valid 'GameValueType' attrs for this parameter type.)"
+
+        return "The DFGameValue type specified does not evaluate to a valid parameter of the required type. \
+(Check documentation to see valid 'GameValueType' attrs for this parameter type.)"
+
+
+def _resolve_runtime_types(typeof: typing.Any) -> typing.Tuple[type, ...]:
+    """Resolves a parameter type (resolving forward refs and flattening Unions) into a tuple of runtime classes.
+
+    Parameters
+    ----------
+    typeof : Any
+        The parameter type to resolve.
+
+    Returns
+    -------
+    Tuple[:class:`type`, ...]
+        The runtime classes, in order of appearance, without duplicates.
+    """
+    class _Check:  # kinda hacky solution, but...
+        _val: typeof
+
+    p_typeof = typing.get_type_hints(_Check, globalns=None, localns=None)['_val']  # resolve forward refs
+
+    types: typing.List[type] = []
+    stack = [p_typeof]
+    while stack:
+        type_ = stack.pop()
+        if getattr(type_, "__origin__", None) is typing.Union:  # this allows Union[Numeric, Locatable] and the likes
+            stack.extend(reversed(type_.__args__))
+            continue
+
+        if not isinstance(type_, type):
+            type_ = getattr(type_, "__origin__", type_)  # e.g. typing.Iterable[X] => collections.abc.Iterable
+
+        if isinstance(type_, type) and type_ not in types:
+            types.append(type_)
+
+    return tuple(types)
+
+
+_PARAM_NAMES = {
+    Param: "Param",
+    Numeric: "Numeric",
+    Textable: "Textable",
+    Listable: "Listable",
+    Locatable: "Locatable",
+    Potionable: "Potionable",
+    ItemParam: "ItemParam",
+    ParticleParam: "ParticleParam",
+    SoundParam: "SoundParam",
+    SpawnEggable: "SpawnEggable",
+
+    # a few common Unions
+    typing.Union[Numeric, Locatable]: "Union[Numeric, Locatable]",
+    typing.Union[Textable, ItemParam]: "Union[Textable, ItemParam]",
+    typing.Union[Locatable, Textable]: "Union[Locatable, Textable]",
+    typing.Union[Textable, Listable]: "Union[Textable, Listable]",
+}
+
+_PARAM_CHECKERS: typing.Dict[typing.Any, _ParamChecker] = {
+    typeof: _ParamChecker(typeof, name) for typeof, name in _PARAM_NAMES.items()
+}  # precompiled when importing; any other parameter type is compiled (and stored) on its first check.
+
+
+def _get_param_checker(typeof: typing.Any) -> _ParamChecker:
+    """Obtains the (cached) :class:`_ParamChecker` of a parameter type, compiling it if this is its first use.
+
+    Parameters
+    ----------
+    typeof : Any
+        The parameter type.
+
+    Returns
+    -------
+    :class:`_ParamChecker`
+        The corresponding checker.
+    """
+    try:
+        return _PARAM_CHECKERS[typeof]
+    except KeyError:
+        checker = _PARAM_CHECKERS[typeof] = _ParamChecker(typeof)
+        return checker
+    except TypeError:  # unhashable type annotation; can't be cached
+        return _ParamChecker(typeof)
+
+
+_p_check_calls: "contextvars.ContextVar[typing.Optional[typing.Counter[str]]]" = contextvars.ContextVar(
+    "py2df_p_check_calls", default=None
+)  #: Where p_check calls are counted in the current context (see count_p_check_calls), if anywhere.
+
+
+@contextlib.contextmanager
+def count_p_check_calls(counter: typing.Counter[str]) -> typing.Iterator[typing.Counter[str]]:
+    """Counts the calls to :func:`p_check` made in the current context (thread/task) while inside this context manager,
+    per parameter type. Used by :class:`~py2df.reading.stats.CompileStats`. Example usage::
+
+        with count_p_check_calls(collections.Counter()) as calls:
+            p_check(5, Numeric)
+
+        calls  # Counter({'Numeric': 1})
+
+    Parameters
+    ----------
+    counter : Counter[:class:`str`]
+        The counter to add the calls to (keyed by the name of the parameter type).
+
+    Yields
+    ------
+    Counter[:class:`str`]
+        The given counter.
+    """
+    token = _p_check_calls.set(counter)
+    try:
+        yield counter
+    finally:
+        _p_check_calls.reset(token)
+
+
 _P = typing.TypeVar(
     "_P",
     Param, Numeric, Textable, Listable, Locatable, Potionable, ItemParam, DFVariable, SpawnEggable
@@ -355,51 +558,21 @@ def p_check(
     --------
     :func:`p_bool_check`
     """
-    class _Check:  # kinda hacky solution, but...
-        _val: typeof
-
-    p_typeof = typing.get_type_hints(_Check, globalns=None, localns=None)['_val']
-    valid_types: typing.List[type] = flatten(
-        [getattr(type_, "__args__", type_) for type_ in getattr(p_typeof, "__args__", [p_typeof])]
-    )  # ^this allows Union[] to be specified as well, such that Union[Numeric, Locatable] works, for example.
-
-    valid_names = (
-        "Param", "Numeric", "Textable", "Locatable", "Potionable", "ItemParam", "ParticleParam", "SoundParam",
-        "SpawnEggable",
-        "Union[Numeric, Locatable]", "Union[Textable, ItemParam]", "Union[Locatable, Textable]"
-    )
-    corresponding_values = (
-        Param, Numeric, Textable, Locatable, Potionable, ItemParam, ParticleParam, SoundParam, SpawnEggable,
-        typing.Union[Numeric, Locatable], typing.Union[Textable, ItemParam], typing.Union[Locatable, Textable]
-    )
-    if not isinstance(obj, tuple(filter(lambda t: t is not None, valid_types))):  # remove 'None'
+    checker = _get_param_checker(typeof)
 
-        try:
-            corresp_class_ind = corresponding_values.index(typeof)
-            name = valid_names[corresp_class_ind]
-            msg = f"Object must be a valid {repr(name)} parameter, not {repr(str(type(obj)))}."
-
-        except (IndexError, ValueError):
-            msg = f"Object must correspond to the appropriate parameter type, and not be a {repr(str(type(obj)))}."
+    calls = _p_check_calls.get()
+    if calls is not None:  # (stats are being collected)
+        calls[checker.name or str(typeof)] += 1
 
+    if not checker.matches(obj):
         raise TypeError("{0}{1}".format(
-            msg,
+            checker.type_error_msg(obj),
             f" (Arg '{arg_name}')" if arg_name else ""
         ))
 
-    if GVAL_TYPES.get(typeof) and isinstance(obj, DFGameValue) and obj not in GVAL_TYPES[typeof]:
-        try:
-            corresp_class_ind = corresponding_values.index(typeof)
-            name = valid_names[corresp_class_ind]
-            msg = f"The DFGameValue type specified does not evaluate to a valid {repr(name)} parameter. (Check \
-documentation to see valid 'GameValueType' attrs for this parameter type.)"
-
-        except (IndexError, ValueError):
-            msg = f"The DFGameValue type specified does not evaluate to a valid parameter of the required type. \
-(Check documentation to see valid 'GameValueType' attrs for this parameter type.)"
-
+    if not checker.gval_matches(obj):
         raise TypeError("{0}{1}".format(
-            msg,
+            checker.gval_error_msg(),
             f" (Arg '{arg_name}')" if arg_name else ""
         ))
 
@@ -457,43 +630,15 @@ def p_bool_check(obj: _P, typeof: typing.Type[_P], gameval_check: bool = True, e
     >>> p_bool_check(5, Locatable)
     False
     """
-    class _Check:  # kinda hacky solution, but...
-        _val: typeof
-
-    p_typeof = typing.get_type_hints(_Check, globalns=None, localns=None)['_val']  # resolve forward refs
+    checker = _get_param_checker(typeof)
 
-    valid_types: typing.List[type] = flatten(
-        [getattr(type_, "__args__", type_) for type_ in getattr(p_typeof, "__args__", [p_typeof])]
-    )
-
-    if not isinstance(obj, tuple(valid_types)):
+    if not checker.matches(obj):
         return False
 
-    if gameval_check and GVAL_TYPES.get(typeof) and isinstance(obj, DFGameValue) and obj not in GVAL_TYPES[typeof]:
+    if gameval_check and not checker.gval_matches(obj):
         if error_on_gameval:
-            try:
-                valid_names = (
-                    "Param", "Numeric", "Textable", "Locatable", "Potionable", "ItemParam", "ParticleParam",
-                    "SoundParam", "SpawnEggable",
-                    "Union[Numeric, Locatable]", "Union[Textable, ItemParam]"
-                )
-                corresponding_values = (
-                    Param, Numeric, Textable, Locatable, Potionable, ItemParam, ParticleParam, SoundParam,
-                    SpawnEggable,
-                    typing.Union[Numeric, Locatable], typing.Union[Textable, ItemParam]
-                )
-                corresp_class_ind = corresponding_values.index(typeof)
-                name = valid_names[corresp_class_ind]
-                msg = f"The DFGameValue type specified does not evaluate to a valid {repr(name)} parameter. (Check \
-documentation to see valid 'GameValueType' attrs for this parameter type.)"
+            raise TypeError(checker.gval_error_msg())
 
-            except (IndexError, ValueError):
-                msg = f"The DFGameValue type specified does not evaluate to a valid parameter of the required type. \
-(Check documentation to see valid 'GameValueType' attrs for this parameter type.)"
-
-            raise TypeError(msg)
-
-        else:
-            return False
+        return False
 
     return True
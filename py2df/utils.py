@@ -1,45 +1,15 @@
 import json
 import typing
 import collections
+import collections.abc
 import nbtlib as nbt
 from array import array
 
+from ._doc_utils import Docable, IterOrSingleDocable, remove_u200b_from_doc
+
 if typing.TYPE_CHECKING:  # avoid cyclic import
     from .typings import Numeric
 
-Docable = typing.Union[typing.Callable, type]
-IterOrSingleDocable = typing.Union[Docable, typing.Iterable[Docable]]
-
-
-def remove_u200b_from_doc(obj: IterOrSingleDocable, *other_objs: IterOrSingleDocable) -> None:
-    """
-    Remove ``\\u200b`` from a class/method's docstring.
-
-    Parameters
-    ----------
-    obj : Union[Union[Callable, :class:`type`], Iterable[Union[Callable, :class:`type`]]]
-        Can be either a class/method or an iterable of classes/methods from whose documentation ``\\u200b`` will be
-        removed.
-
-    other_objs: Union[Union[Callable, :class:`type`], Iterable[Union[Callable, :class:`type`]]]
-        Any other objects (or iterables thereof) to follow the same procedure.
-
-    Returns
-    -------
-    None
-        None
-    """
-    if isinstance(obj, collections.Iterable) and not isinstance(obj, type):
-        for clz in obj:
-            remove_u200b_from_doc(clz)
-    else:
-        the_doc = obj.__doc__
-        if "\u200b" in the_doc:
-            obj.__doc__ = the_doc.replace("\u200b", "")
-
-    for o in other_objs:
-        remove_u200b_from_doc(o)
-
 
 class _DoNotFlatten:
     def __init__(self, val):
@@ -101,54 +71,77 @@ def flatten(
     Credits to NLTK authors for this function's original code.
     """
 
-    x = []
-    if except_iterables and allow_iterables:
-        allow_iterables = tuple()
+    return list(iter_flatten(
+        *args, allow_iterables=allow_iterables, except_iterables=except_iterables, max_depth=max_depth,
+        keep_iterables=keep_iterables, curr_depth=curr_depth
+    ))
 
-    for el in args:
-        is_iterable = isinstance(el, collections.Iterable)
 
-        do_keep = keep_iterables and isinstance(el, tuple(keep_iterables)) and curr_depth == 0  # prevent dupes
+def iter_flatten(
+    *args: typing.Any, allow_iterables: typing.Iterable[typing.Type[typing.Iterable]] = tuple(),
+    except_iterables: typing.Iterable[typing.Type[typing.Iterable]] = tuple(), max_depth: typing.Optional[int] = None,
+    keep_iterables: typing.Iterable[typing.Type[typing.Iterable]] = tuple(), curr_depth: int = 0
+) -> typing.Iterator:
+    """
+    Lazily flatten a list or iterable of arbitrary length. Same as :func:`flatten` (see it for the parameters), but
+    yields each element as soon as it is reached, instead of building a list.
+
+        >>> from py2df.utils import iter_flatten
+        >>> list(iter_flatten(1, 2, ['b', 'a' , ['c', 'd']], 3))
+        [1, 2, 'b', 'a', 'c', 'd', 3]
 
+    Yields
+    ------
+    Any
+        Each element of the resulting list.
+
+    Notes
+    -----
+    This walks the iterables with an explicit stack (so it is not limited by the recursion depth), and the given types
+    are converted to tuples only once, at the start. Non-iterable elements given along with ``except_iterables`` are
+    kept as they are.
+    """
+    except_types = tuple(except_iterables)
+    allow_types = () if except_types else (list, tuple, *allow_iterables)
+    keep_types = tuple(keep_iterables)
+    iterable_type = collections.abc.Iterable
+
+    def can_flatten(obj: typing.Any) -> bool:
+        if except_types:
+            return isinstance(obj, iterable_type) and not isinstance(obj, except_types)
+
+        return isinstance(obj, allow_types)
+
+    end = object()  # sentinel
+    for el in args:
+        do_keep = keep_types and curr_depth == 0 and isinstance(el, keep_types)
         if do_keep:  # if we should keep it in the list
-            x.append(el)
+            yield el
 
-        if (
-            (is_iterable and except_iterables and isinstance(el, tuple(except_iterables)))  # if iterable in "except",
-            or (not except_iterables and not isinstance(el, (list, tuple, *(allow_iterables or []))))  # !"accept"...
-        ):
-            el = [el]  # make it an one-element iterable for the for loop to work.
+        if not can_flatten(el):
+            if not do_keep:
+                yield el
 
-        for item in el:
-            if do_keep and item == el:
+            continue
+
+        stack = [iter(el)]
+        while stack:
+            item = next(stack[-1], end)
+            if item is end:
+                stack.pop()
                 continue
 
-            item_is_iter = isinstance(item, collections.Iterable)
-            if (  # if this is a valid iterable according to the given parameters, then flatten it
-                (curr_depth < max_depth if max_depth else True)  # do not flatten any further than max depth.
-                and (  # if this is a valid iterable (not in "except" or in "accept"), flatten it!
-                    (item_is_iter and except_iterables and not isinstance(item, tuple(except_iterables)))
-                    or (not except_iterables and isinstance(item, (list, tuple, *(allow_iterables or tuple()))))
-                )
-            ):
-                if keep_iterables and isinstance(item, tuple(keep_iterables)):
-                    x.append(item)
-
-                x.extend(
-                    flatten(  # flatten
-                        item,
-                        allow_iterables=allow_iterables, except_iterables=except_iterables,
-                        max_depth=max_depth, curr_depth=curr_depth + 1, keep_iterables=keep_iterables
-                    )
-                )
-            else:  # don't flatten
-                x.append(item)
+            if do_keep and item == el:
+                continue
 
-    # if keep_iterables and curr_depth == 0 and False:
-    #     # print(f"bruh moment {curr_depth=} {len(list(filter(lambda t: type(t) == _DoNotFlatten, x)))}")
-    #     return [el.val if type(el) == _DoNotFlatten else el for el in x]
+            depth = curr_depth + len(stack) - 1
+            if (not max_depth or depth < max_depth) and can_flatten(item):  # flatten it, up to max depth
+                if keep_types and isinstance(item, keep_types):
+                    yield item
 
-    return x
+                stack.append(iter(item))
+            else:  # don't flatten
+                yield item
 
 
 AnyNumber = typing.Union[int, float]
@@ -352,59 +345,84 @@ def nbt_to_python(obj: nbt.tag.Base, convert_items: bool = True) -> typing.Union
     Union[:class:`str`, :class:`dict`, :class:`list`, :class:`~array.array`, :class:`int`, :class:`float`]
         The resulting raw type.
 
+    Objects of any other type are returned unchanged.
+
     Warnings
     --------
     Types that convert to a list or dict have each of their values converted as well. To disable this behavior,
     specify ``convert_items=False`` .
     """
-    relation_nbt = (
-        nbt.String,
-
-        nbt.Int, nbt.Long, nbt.Short, nbt.Byte,
-
-        nbt.Float, nbt.Double,
-
-        nbt.Compound,
-
-        nbt.List,
-
-        nbt.ByteArray, nbt.IntArray, nbt.LongArray
-    )
-
-    if obj not in relation_nbt:
+    python_type = _nbt_python_type(type(obj))
+    if python_type is None:  # not NBT
         return obj
 
-    relation_types = (
-        str,
-
-        int, int, int, int,
-
-        float, float,
-
-        dict,
-
-        list,
-
-        array, array, array
-    )
-
-    new_obj = None
-
-    if isinstance(obj, nbt.Compound) and convert_items:
-        new_obj = {k: nbt_to_python(v) for k, v in obj.items()}  # convert everything inside
-    else:
-        for nbt_, type_ in zip(relation_nbt, relation_types):
-            if isinstance(obj, nbt_):
-                if type_ in (list, array) and convert_items:
-                    new_obj = type_(map(lambda v: nbt_to_python(v), obj))
-                elif type_ == str:
-                    new_obj = type_(obj)
-                    new_obj = new_obj.strip(new_obj[0]) if new_obj[0] in ("\"", "'") else new_obj
-                else:
-                    new_obj = type_(obj)
-                break
-
-    return new_obj
+    if python_type is array:
+        return _nbt_array_to_python(obj)
+
+    if python_type is dict or python_type is list:
+        if not convert_items:
+            return python_type(obj)
+
+        new_obj = python_type()
+        stack = [(obj, new_obj)]  # (containers still to convert; iterative, as compounds may be deeply nested)
+        while stack:
+            source, target = stack.pop()
+            if type(target) is dict:
+                for key, value in source.items():
+                    value_type = _NBT_PYTHON_TYPES.get(type(value)) or _nbt_python_type(type(value))
+                    if value_type is dict or value_type is list:
+                        target[key] = value_type()
+                        stack.append((value, target[key]))
+                    elif value_type is array:
+                        target[key] = _nbt_array_to_python(value)
+                    else:
+                        target[key] = value if value_type is None else value_type(value)
+            else:
+                for value in source:
+                    value_type = _NBT_PYTHON_TYPES.get(type(value)) or _nbt_python_type(type(value))
+                    if value_type is dict or value_type is list:
+                        target.append(value_type())
+                        stack.append((value, target[-1]))
+                    elif value_type is array:
+                        target.append(_nbt_array_to_python(value))
+                    else:
+                        target.append(value if value_type is None else value_type(value))
+
+        return new_obj
+
+    return python_type(obj)
+
+
+#: The raw Python type of each NBT type (see :func:`nbt_to_python`); subclasses (e.g. schemas, or ``List[String]``)
+#: are added as they are found. ``None`` marks types which are not NBT.
+_NBT_PYTHON_TYPES: typing.Dict[type, typing.Optional[type]] = {
+    nbt.String: str,
+    nbt.Int: int, nbt.Long: int, nbt.Short: int, nbt.Byte: int,
+    nbt.Float: float, nbt.Double: float,
+    nbt.Compound: dict,
+    nbt.List: list,
+    nbt.ByteArray: array, nbt.IntArray: array, nbt.LongArray: array,
+}
+
+#: The :class:`~array.array` typecode of each integer size, in bytes.
+_ARRAY_TYPECODES: typing.Dict[int, str] = {array(code).itemsize: code for code in "bhliq"}
+
+
+def _nbt_python_type(type_: type) -> typing.Optional[type]:
+    """The raw Python type of the given NBT type (``None`` if it is not NBT)."""
+    try:
+        return _NBT_PYTHON_TYPES[type_]
+    except KeyError:
+        python_type = next((_NBT_PYTHON_TYPES[base] for base in type_.__mro__ if base in _NBT_PYTHON_TYPES), None)
+        _NBT_PYTHON_TYPES[type_] = python_type
+        return python_type
+
+
+def _nbt_array_to_python(obj: typing.Union[nbt.ByteArray, nbt.IntArray, nbt.LongArray]) -> array:
+    """Copies a NBT array (big-endian) into an :class:`~array.array` of the same integer size, as a whole buffer."""
+    converted = array(_ARRAY_TYPECODES[obj.dtype.itemsize])
+    converted.frombytes(obj.astype(obj.dtype.newbyteorder("=")).tobytes())
+    return converted
 
 
 def snake_to_capitalized_words(snake_case: str) -> str:
@@ -436,6 +454,33 @@ def serialize_tag(tag, *, indent=None, compact=False, quote=None):
     return serializer.serialize(tag)
 
 
+def snbt_string(string: str) -> str:
+    """Quotes and escapes a string as a SNBT string literal, exactly like :func:`serialize_tag` does with a
+    :class:`nbtlib.String` (but without creating one).
+
+    Parameters
+    ----------
+    string : :class:`str`
+        The string to quote.
+
+    Returns
+    -------
+    :class:`str`
+        The SNBT literal: the string between double quotes (or between single quotes, if a double quote comes first
+        in it), with backslashes and the quotes used escaped.
+    """
+    double = string.find('"')
+    single = string.find("'")
+    quote = "'" if double != -1 and (single == -1 or double < single) else '"'
+    if "\\" in string:
+        string = string.replace("\\", "\\\\")
+
+    if quote in string:
+        string = string.replace(quote, "\\" + quote)
+
+    return quote + string + quote
+
+
 _TT = typing.TypeVar("_TT")
 
 
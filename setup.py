@@ -1,13 +1,18 @@
 #!/usr/bin/env python
 
+import re
+
 import setuptools
 
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
+with open("py2df/constants/str_consts.py", "r") as fh:  # (py2df itself can't be imported before installing it)
+    version = re.search(r'^PY2DF_VERSION = "([^"]+)"', fh.read(), re.MULTILINE).group(1)
+
 setuptools.setup(
     name="Py2DF", # Replace with your own username
-    version="0.0.1",
+    version=version,
     author="PgBiel, Skezza",
     author_email="author@example.com",
     description="A tool to convert python scripts to DF code templates.",
@@ -20,5 +25,10 @@ setuptools.setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
+    entry_points={
+        "console_scripts": [
+            "py2df = py2df:main",
+        ],
+    },
 )
@@ -0,0 +1,43 @@
+"""
+Shared fixtures: plot modules written to temporary directories.
+"""
+import os
+import re
+import sys
+
+import pytest
+
+PLOT_SOURCE = """\
+from py2df import *
+p = Player(PlayerTarget.DEFAULT)
+
+@PlayerEvent.join
+def on_join():
+    p.send_message("v1")
+
+@PlayerEvent.quit
+def on_quit():
+    p.send_message("same")
+
+GROUP = [on_join, on_quit]
+"""
+
+
+@pytest.fixture
+def plot_module(tmp_path, request):
+    """Writes a plot module to a temporary directory, returning its name and a function that edits it."""
+    name = "plot_" + re.sub(r"\W", "_", request.node.name)
+    path = tmp_path / f"{name}.py"
+    path.write_text(PLOT_SOURCE)
+    sys.path.insert(0, str(tmp_path))
+
+    def edit(old: str, new: str) -> None:
+        path.write_text(path.read_text().replace(old, new))
+        stat = os.stat(path)  # (a different modification time, even within the file system's resolution)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5 * 10 ** 9))
+
+    yield name, edit
+
+    sys.path.remove(str(tmp_path))
+    sys.modules.pop(name, None)
+
@@ -0,0 +1,62 @@
+"""
+Persistent template cache: entries are only reused while the code they were compiled from (including the helper
+modules it calls) is unchanged, and entries replaced are not counted twice towards its size.
+"""
+import collections
+import os
+import subprocess
+import sys
+
+from py2df import CallFunction
+from py2df.reading import LineOutput, TemplateCache
+
+HELPERS_SOURCE = """\
+from py2df import *
+
+def build():
+    Player(PlayerTarget.DEFAULT).send_message("hello")
+"""
+
+PLOT_SOURCE = """\
+from py2df import *
+import {helpers}
+
+@PlayerEvent.join
+def on_join():
+    {helpers}.build()
+"""
+
+_COMPILE = """\
+import sys
+from py2df.reading import compile_module, TemplateCache
+print(compile_module(sys.argv[1], cache=TemplateCache(sys.argv[2])).json[0])
+"""
+
+
+def compile_in_new_process(target: str, cache_dir: str, path: str) -> str:
+    """Compiles a target with a cache, in a new interpreter (as a new shell or CI run would). Returns its JSON."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([path] + [entry for entry in sys.path if entry]))
+    process = subprocess.run(
+        [sys.executable, "-c", _COMPILE, target, cache_dir], check=True, capture_output=True, text=True, env=env
+    )
+    return process.stdout
+
+
+def test_cache_misses_after_helper_module_changes(tmp_path):
+    helpers = "cache_test_helpers"
+    (tmp_path / f"{helpers}.py").write_text(HELPERS_SOURCE)
+    (tmp_path / "cache_test_plot.py").write_text(PLOT_SOURCE.format(helpers=helpers))
+    cache_dir = str(tmp_path / "cache")
+
+    assert '"hello"' in compile_in_new_process("cache_test_plot", cache_dir, str(tmp_path))
+
+    (tmp_path / f"{helpers}.py").write_text(HELPERS_SOURCE.replace('"hello"', '"changed"'))
+    assert '"changed"' in compile_in_new_process("cache_test_plot", cache_dir, str(tmp_path))
+
+
+def test_cache_size_counts_replaced_entries_once(tmp_path):
+    cache = TemplateCache(str(tmp_path), max_size=10 ** 9)
+    cache.put("a", [LineOutput(collections.deque([CallFunction("first")]))])
+    for name in ("second", "third", "a longer name"):
+        cache.put("b", [LineOutput(collections.deque([CallFunction(name)]))])
+        assert cache._size == cache.size()
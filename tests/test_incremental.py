@@ -0,0 +1,49 @@
+"""
+Incremental reads: the lines of a function holder are reused only while neither it nor what it uses (including
+functions of helper modules) changed.
+"""
+import importlib
+import sys
+
+from py2df.reading import DFReader
+
+HELPERS_SOURCE = """\
+from py2df import *
+
+def build():
+    Player(PlayerTarget.DEFAULT).send_message("hello")
+"""
+
+PLOT_SOURCE = """\
+from py2df import *
+import incremental_test_helpers
+
+@PlayerEvent.join
+def on_join():
+    incremental_test_helpers.build()
+
+@PlayerEvent.quit
+def on_quit():
+    Player(PlayerTarget.DEFAULT).send_message("bye")
+"""
+
+
+def test_incremental_reader_follows_reloaded_helper_module(tmp_path):
+    helpers_path = tmp_path / "incremental_test_helpers.py"
+    helpers_path.write_text(HELPERS_SOURCE)
+    (tmp_path / "incremental_test_plot.py").write_text(PLOT_SOURCE)
+    sys.path.insert(0, str(tmp_path))
+    try:
+        with DFReader.session(incremental=True) as reader:
+            importlib.import_module("incremental_test_plot")
+            before = reader.output_json()
+            assert '"hello"' in before[0]
+
+            helpers_path.write_text(HELPERS_SOURCE.replace('"hello"', '"changed"'))
+            importlib.reload(sys.modules["incremental_test_helpers"])
+            after = reader.output_json()
+            assert '"changed"' in after[0] and after[1] == before[1]
+    finally:
+        sys.path.remove(str(tmp_path))
+        for name in ("incremental_test_plot", "incremental_test_helpers"):
+            sys.modules.pop(name, None)
@@ -0,0 +1,19 @@
+"""
+Direct JSON writing: the JSON of code lines must not depend on what the writer has cached, and its cache of dict members
+(which depend on the code, e.g. function names) must stay within its maximum size.
+"""
+import collections
+
+from py2df import CallFunction, JSONWriter, dumps_json
+from py2df.reading.pipeline import line_json_data
+
+
+def test_member_cache_is_bounded():
+    writer = JSONWriter(max_members=8)
+    for start in range(0, 100, 10):
+        line = collections.deque(CallFunction(f"function_{i}") for i in range(start, start + 10))
+        assert writer.dumps_line(line) == dumps_json(line_json_data(line))
+        assert len(writer._values) <= 8
+
+    line = collections.deque(CallFunction(f"function_{i % 3}") for i in range(10))  # (dropped, then cached again)
+    assert writer.dumps_line(line) == writer.dumps_line(line) == dumps_json(line_json_data(line))
@@ -0,0 +1,45 @@
+"""
+Compile server: a warm server compiles targets again after their modules change, including targets given as
+``"module:attribute"``.
+"""
+import contextlib
+import threading
+
+import pytest
+
+from py2df.reading import CompileServer, compile_remote
+
+
+@contextlib.contextmanager
+def running_server():
+    """Runs a compile server on a local port, in a thread, yielding its address."""
+    server = CompileServer(("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.address
+    finally:
+        server.shutdown()
+        server.close()
+
+
+@pytest.mark.parametrize("attribute", ["", ":GROUP"])
+def test_server_compiles_changed_target(plot_module, attribute):
+    name, edit = plot_module
+    target = name + attribute
+    with running_server() as address:
+        before, = compile_remote([target], address, timeout=30)
+        assert before.error is None and '"v1"' in before.json[0]
+
+        edit('"v1"', '"v2"')
+        after, = compile_remote([target], address, timeout=30)
+        assert after.error is None and '"v2"' in after.json[0] and after.json[1] == before.json[1]
+
+
+def test_server_compiles_new_attribute_target_of_changed_module(plot_module):
+    name, edit = plot_module
+    with running_server() as address:
+        compile_remote([name], address, timeout=30)
+        edit('"v1"', '"v2"')
+        result, = compile_remote([name + ":GROUP"], address, timeout=30)  # (its module was imported before the edit)
+        assert result.error is None and '"v2"' in result.json[0]
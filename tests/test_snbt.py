@@ -0,0 +1,61 @@
+"""
+SNBT equivalence: the SNBT Items write directly must be the one nbtlib serializes from their NBT, and must be read back
+(directly) as the same Items. (See ``benchmarks/snbt_equivalence.py`` for the same check on random Items.)
+"""
+import nbtlib as nbt
+import pytest
+
+from py2df import Item, Material, Enchantment, Enchantments, HideFlags, serialize_tag
+
+ITEMS = {
+    "plain": lambda: Item(Material.STONE),
+    "quotes": lambda: Item(Material.DIAMOND_SWORD, name="\"Sword\" of 'doom'", lore=["it's \"sharp\"", "'", '"']),
+    "backslashes": lambda: Item(Material.PAPER, name="C:\\plots\\", lore=["\\", "\\\"", "\\'"]),
+    "non-ASCII": lambda: Item(Material.BOOK, 3, name="§6日本語 é\u200b", lore=["ñ\tñ", "line\nbreak"]),
+    "empty lore": lambda: Item(Material.APPLE, name="", lore=[]),
+    "empty lore lines": lambda: Item(Material.APPLE, lore=["", ""]),
+    "everything": lambda: Item(
+        Material.LEATHER_CHESTPLATE, 64, name="a", lore=["b"], enchantments=[Enchantment(Enchantments.SHARPNESS, 5)],
+        damage=10, unbreakable=True, hide_flags=HideFlags(127), leather_armor_color=0xFF00FF,
+    ),
+    "entity tag": lambda: Item(Material.ARMOR_STAND, entity_tag='{NoAI: 1b, CustomName: "\\"x\\""}'),
+    "extra tags": lambda: Item(Material.STICK, extra_tags=nbt.Compound(
+        CustomModelData=nbt.Int(7), Pos=nbt.IntArray([1, -2, 3]), Weights=nbt.List[nbt.Double]([nbt.Double(0.5)]),
+    )),
+    "overridden extra tags": lambda: Item(
+        Material.IRON_PICKAXE, damage=3, unbreakable=True,
+        extra_tags=nbt.Compound(Damage=nbt.Int(7), Unbreakable=nbt.Byte(1), RepairCost=nbt.Int(2)),
+    ),
+    "overridden to default": lambda: Item(
+        Material.IRON_PICKAXE, unbreakable=True, extra_tags=nbt.Compound(Unbreakable=nbt.Byte(0)),
+    ),
+}
+
+#: Items whose SNBT is read back as an equivalent Item that writes it differently.
+NORMALIZED = {"overridden to default"}  # (Unbreakable: 0b is read as the default, which is not written)
+
+#: Attributes compared between the Items read from SNBT.
+ATTRIBUTES = (
+    "material", "amount", "name", "lore", "enchantments", "damage", "unbreakable", "hide_flags", "leather_armor_color",
+    "entity_tag", "extra_tags",
+)
+
+
+@pytest.mark.parametrize("key", ITEMS.keys())
+def test_as_snbt_matches_nbtlib(key):
+    item = ITEMS[key]()
+    snbt = item.as_snbt()
+    assert snbt == serialize_tag(item.as_nbt())
+    assert serialize_tag(nbt.parse_nbt(snbt)) == snbt
+
+
+@pytest.mark.parametrize("key", ITEMS.keys())
+def test_from_snbt_round_trip(key):
+    snbt = ITEMS[key]().as_snbt()
+    read = Item.from_snbt(snbt)
+    expected = Item.from_nbt(nbt.parse_nbt(snbt))
+    assert all(getattr(read, attr) == getattr(expected, attr) for attr in ATTRIBUTES)
+    assert read.as_snbt() == expected.as_snbt()
+    if key not in NORMALIZED:
+        assert read.as_snbt() == snbt
+    assert [other.as_snbt() for other in Item.from_snbt_many([snbt, snbt])] == [read.as_snbt()] * 2
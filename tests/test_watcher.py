@@ -0,0 +1,51 @@
+"""
+Watch mode: targets are compiled again after their modules change, including targets given as ``"module:attribute"``.
+"""
+import os
+import sys
+
+import pytest
+
+from py2df.reading import PlotWatcher
+
+
+@pytest.mark.parametrize("attribute", ["", ":GROUP"])
+def test_watcher_recompiles_changed_target(plot_module, attribute):
+    name, edit = plot_module
+    target = name + attribute
+    watcher = PlotWatcher([target], interval=0)
+    first = list(watcher.poll())
+    assert [change.index for change in first] == [0, 1] and all(change.error is None for change in first)
+    assert list(watcher.poll()) == []
+
+    edit('"v1"', '"v2"')
+    changes = list(watcher.poll())
+    assert [(change.target, change.index) for change in changes] == [(target, 0)]
+    assert changes[0].error is None and '"v2"' in changes[0].json
+    assert '"v2"' in watcher.outputs(target)[0].json
+
+
+def test_watcher_recompiles_after_helper_changes(tmp_path):
+    helpers_path = tmp_path / "watcher_test_helpers.py"
+    helpers_path.write_text(
+        'from py2df import *\n\ndef build():\n    Player(PlayerTarget.DEFAULT).send_message("hello")\n'
+    )
+    (tmp_path / "watcher_test_plot.py").write_text(
+        "from py2df import *\nimport watcher_test_helpers\n\n@PlayerEvent.join\ndef on_join():\n"
+        "    watcher_test_helpers.build()\n\n@PlayerEvent.quit\ndef on_quit():\n"
+        '    Player(PlayerTarget.DEFAULT).send_message("bye")\n'
+    )
+    sys.path.insert(0, str(tmp_path))
+    try:
+        watcher = PlotWatcher(["watcher_test_plot"], interval=0)
+        assert len(list(watcher.poll())) == 2
+
+        helpers_path.write_text(helpers_path.read_text().replace('"hello"', '"changed"'))
+        stat = os.stat(helpers_path)
+        os.utime(helpers_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5 * 10 ** 9))
+        changes = list(watcher.poll())
+        assert [change.index for change in changes] == [0] and '"changed"' in changes[0].json
+    finally:
+        sys.path.remove(str(tmp_path))
+        for name in ("watcher_test_plot", "watcher_test_helpers"):
+            sys.modules.pop(name, None)